@@ -4,13 +4,24 @@ GEO Comparison PDF Report Generator
 Generates a professional, client-facing PDF comparing Wix vs Next.js GEO scores.
 
 Usage:
-    python3 generate_geo_comparison_pdf.py [output_file.pdf]
+    python3 generate_geo_comparison_pdf.py [output_file.pdf] [--cache-dir DIR]
+    python3 generate_geo_comparison_pdf.py --batch manifest.jsonl --output-dir reports/ [--jobs N]
+    Add --deterministic --build-date YYYY-MM-DD for byte-identical output,
+    --trace DIR for a per-section timing trace of each report (geo_trace.py),
+    --profile DIR for its pstats and collapsed flamegraph stacks (geo_profile.py).
 """
 
+import argparse
+import csv
+import functools
+import json
+import multiprocessing
 import sys
 import os
 import math
-from datetime import datetime
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
 
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
@@ -18,13 +29,25 @@ from reportlab.lib.colors import HexColor, white, lightgrey, black, Color
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    Paragraph, Spacer, Table, TableStyle,
     PageBreak, HRFlowable, KeepTogether, CondPageBreak,
 )
 from reportlab.graphics.shapes import Drawing, Rect, String, Circle, Line, Group, Polygon
 from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.graphics import renderPDF
 
+from geo_appendix_table import AppendixTable
+from geo_build_cache import BuildCache, input_key, module_digest, project_digest, source_digest
+from geo_deterministic import apply_pdf_invariance, resolve_build_date
+from geo_drawing_cache import form_cached
+from geo_history import AuditHistory, pace
+from geo_streaming import StreamingDocTemplate
+from geo_robots import access_matrix, compile_robots
+from geo_scoring import CASE_STUDY_CATEGORIES, score_comparison, score_label
+from geo_table_rules import apply_rules, delta_rule, text_color_rule
+from geo_profile import PROFILE_ENV, profile_document
+from geo_trace import TRACE_ENV, section_mark, trace_document
+
 # ============================================================
 # COLOR PALETTE
 # ============================================================
@@ -54,6 +77,21 @@ PAGE_W = letter[0]
 PAGE_H = letter[1]
 USABLE_W = PAGE_W - 100  # 50pt margins each side
 
+BUILD_DATE = date.today()
+DETERMINISTIC = False
+
+
+def configure_build(build_date=None, deterministic=False):
+    """Pin the "Generated" footer date (default: today) and, in deterministic
+    mode, fix the PDF metadata so rebuilds are byte-identical.
+    Must run in each worker process before rendering."""
+    global BUILD_DATE, DETERMINISTIC
+    if build_date is not None:
+        BUILD_DATE = build_date
+    if deterministic:
+        apply_pdf_invariance(BUILD_DATE)
+    DETERMINISTIC = deterministic
+
 
 def score_color(score):
     if score >= 80: return SUCCESS
@@ -61,13 +99,6 @@ def score_color(score):
     if score >= 40: return WARNING
     return DANGER
 
-def score_label(score):
-    if score >= 90: return "Excellent"
-    if score >= 75: return "Good"
-    if score >= 60: return "Fair"
-    if score >= 40: return "Poor"
-    return "Critical"
-
 def score_bg(score):
     if score >= 80: return SUCCESS_LIGHT
     if score >= 60: return INFO_LIGHT
@@ -78,6 +109,9 @@ def score_bg(score):
 # ============================================================
 # VISUAL ELEMENTS
 # ============================================================
+# Score rings and arrows are Groups placed inside other drawings; the whole
+# drawings built from them are @form_cached, so each unique drawing is emitted
+# once per PDF as a form XObject and referenced wherever it repeats.
 
 def create_score_ring(score, label, color, x_center, y_center, radius=38):
     """Create a score ring with number in center."""
@@ -120,6 +154,7 @@ def create_delta_arrow(delta, x_center, y_center):
     return g
 
 
+@form_cached
 def create_cover_visual(wix_score, nextjs_score, delta):
     """Create the cover page hero visual with two score rings and delta."""
     d = Drawing(USABLE_W, 160)
@@ -134,7 +169,7 @@ def create_cover_visual(wix_score, nextjs_score, delta):
     d.add(njs_g)
     # Percentage label under arrow
     pct = round((delta / wix_score) * 100) if wix_score > 0 else 0
-    d.add(String(USABLE_W / 2, 38, f"+{pct}% improvement",
+    d.add(String(USABLE_W / 2, 38, f"{pct:+d}% {change_word(delta)}",
                  fontSize=11, fontName='Helvetica-Bold', fillColor=DELTA_COLOR, textAnchor='middle'))
     return d
 
@@ -226,6 +261,7 @@ def create_horizontal_comparison_bars(items, wix_vals, nextjs_vals, width=480, h
     return d
 
 
+@form_cached
 def create_score_scale(wix_score, nextjs_score, width=480, height=50):
     """Create a horizontal scale showing both scores on a 0-100 range."""
     d = Drawing(width, height)
@@ -270,8 +306,20 @@ def create_score_scale(wix_score, nextjs_score, width=480, height=50):
     return d
 
 
-def create_roadmap_visual(width=480, height=110):
-    """Create a timeline visualization for the roadmap."""
+# Roadmap milestones: (position on the timeline, label, projected gain over
+# today's composite as a (low, high) range, color)
+ROADMAP_PLAN = [
+    (0.17, "30 days", (6, 8), HexColor("#2ecc71")),
+    (0.33, "60 days", (9, 12), HexColor("#27ae60")),
+    (0.50, "90 days", (13, 16), SUCCESS),
+    (1.0, "180 days", (18, 21), HexColor("#00a878")),
+]
+
+
+def create_roadmap_visual(current, pace=None, audits=0, width=480, height=110):
+    """Create a timeline visualization for the roadmap: today's composite
+    and the plan's projected ranges from it, plus the observed pace when
+    the audit history has one."""
     d = Drawing(width, height)
     y = 55
     bar_x = 40
@@ -281,13 +329,9 @@ def create_roadmap_visual(width=480, height=110):
     d.add(Rect(bar_x, y, bar_w, 6, fillColor=MEDIUM_BG, strokeColor=None))
 
     # Milestones
-    milestones = [
-        (0, "Today", "67", INFO),
-        (0.17, "30 days", "73-75", HexColor("#2ecc71")),
-        (0.33, "60 days", "76-79", HexColor("#27ae60")),
-        (0.50, "90 days", "80-83", SUCCESS),
-        (1.0, "180 days", "85-88", HexColor("#00a878")),
-    ]
+    milestones = [(0, "Today", str(current), INFO)]
+    for pct, label, (low, high), color in ROADMAP_PLAN:
+        milestones.append((pct, label, f"{min(current + low, 100)}-{min(current + high, 100)}", color))
 
     for pct, label, score, color in milestones:
         x = bar_x + pct * bar_w
@@ -310,9 +354,45 @@ def create_roadmap_visual(width=480, height=110):
     d.add(Polygon([end_x, y, end_x, y + 6, end_x + 10, y + 3],
                    fillColor=MEDIUM_BG, strokeColor=None))
 
+    if pace is not None:
+        d.add(String(bar_x, y - 38, f"Observed pace: {pace:+.1f} points / 30 days over {audits} audits",
+                     fontSize=7, fontName='Helvetica', fillColor=TEXT_SECONDARY, textAnchor='start'))
+
     return d
 
 
+def create_trend_visual(points, width=480, height=110):
+    """Line chart of the composite across past audits, [(date, score), ...]."""
+    d = Drawing(width, height)
+    plot_x, plot_y = 40, 18
+    plot_w, plot_h = width - 80, height - 36
+
+    # Band lines at the score label floors
+    for v in (40, 60, 75, 90):
+        gy = plot_y + v / 100 * plot_h
+        d.add(Line(plot_x, gy, plot_x + plot_w, gy, strokeColor=MEDIUM_BG, strokeWidth=0.5))
+        d.add(String(plot_x - 4, gy - 2, str(v), fontSize=6, fontName='Helvetica',
+                     fillColor=TEXT_LIGHT, textAnchor='end'))
+
+    days = [date.fromisoformat(day).toordinal() for day, _ in points]
+    span = max(days[-1] - days[0], 1)
+    coords = [(plot_x + (x - days[0]) / span * plot_w, plot_y + score / 100 * plot_h)
+              for x, (_, score) in zip(days, points)]
+    for (x1, y1), (x2, y2) in zip(coords, coords[1:]):
+        d.add(Line(x1, y1, x2, y2, strokeColor=NEXTJS_COLOR, strokeWidth=1.5))
+    for x, y in coords:
+        d.add(Circle(x, y, 2, fillColor=NEXTJS_COLOR, strokeColor=None))
+
+    # First and latest audit
+    for (day, score), (x, y), anchor in ((points[0], coords[0], 'start'), (points[-1], coords[-1], 'end')):
+        d.add(String(x, plot_y - 12, day, fontSize=7, fontName='Helvetica',
+                     fillColor=TEXT_SECONDARY, textAnchor=anchor))
+        d.add(String(x, y + 6, str(score), fontSize=8, fontName='Helvetica-Bold',
+                     fillColor=NEXTJS_COLOR, textAnchor=anchor))
+    return d
+
+
+@form_cached
 def create_category_mini_gauge(wix_score, nextjs_score, cat_name, width=230, height=60):
     """Small inline comparison visual for a category."""
     d = Drawing(width, height)
@@ -435,6 +515,7 @@ def color_delta_cell(ts, col, row, delta):
 
 def section_header(elements, styles, num, title):
     """Add a section header with number badge."""
+    section_mark(title)
     elements.append(Paragraph(f"Section {num}", styles['SectionNum']))
     elements.append(Paragraph(title, styles['SectionHeader']))
     elements.append(HRFlowable(width="100%", thickness=1.5, color=ACCENT, spaceAfter=10))
@@ -444,67 +525,181 @@ def section_header(elements, styles, num, title):
 # HEADER / FOOTER
 # ============================================================
 
-def header_footer(canvas, doc):
-    canvas.saveState()
-    # Header line
-    canvas.setStrokeColor(ACCENT)
-    canvas.setLineWidth(2)
-    canvas.line(50, PAGE_H - 40, PAGE_W - 50, PAGE_H - 40)
-    # Header text
-    canvas.setFont('Helvetica', 7)
-    canvas.setFillColor(TEXT_SECONDARY)
-    canvas.drawString(50, PAGE_H - 35, "GEO Scoring Comparison: Wix vs. Next.js  |  Paragon Pool & Spa")
-    canvas.drawRightString(PAGE_W - 50, PAGE_H - 35, "Confidential")
-    # Footer
-    canvas.setStrokeColor(lightgrey)
-    canvas.setLineWidth(0.5)
-    canvas.line(50, 40, PAGE_W - 50, 40)
-    canvas.drawString(50, 28, f"Generated {datetime.now().strftime('%B %d, %Y')}")
-    canvas.drawRightString(PAGE_W - 50, 28, f"Page {doc.page}")
-    canvas.drawCentredString(PAGE_W / 2, 28, "Paragon Pool and Patio, Inc.")
-    canvas.restoreState()
-
-
-def cover_page(canvas, doc):
-    """Custom first page with no standard header."""
-    canvas.saveState()
-    # Top accent bar
-    canvas.setFillColor(ACCENT)
-    canvas.rect(0, PAGE_H - 8, PAGE_W, 8, fill=1, stroke=0)
-    # Bottom accent bar
-    canvas.rect(0, 0, PAGE_W, 8, fill=1, stroke=0)
-    # Confidential watermark
-    canvas.setFont('Helvetica', 7)
-    canvas.setFillColor(TEXT_LIGHT)
-    canvas.drawCentredString(PAGE_W / 2, 18, "Confidential  |  Prepared for Paragon Pool and Patio, Inc.")
-    canvas.restoreState()
+def make_header_footer(client, short_name):
+    def header_footer(canvas, doc):
+        canvas.saveState()
+        # Header line
+        canvas.setStrokeColor(ACCENT)
+        canvas.setLineWidth(2)
+        canvas.line(50, PAGE_H - 40, PAGE_W - 50, PAGE_H - 40)
+        # Header text
+        canvas.setFont('Helvetica', 7)
+        canvas.setFillColor(TEXT_SECONDARY)
+        canvas.drawString(50, PAGE_H - 35, f"GEO Scoring Comparison: Wix vs. Next.js  |  {short_name}")
+        canvas.drawRightString(PAGE_W - 50, PAGE_H - 35, "Confidential")
+        # Footer
+        canvas.setStrokeColor(lightgrey)
+        canvas.setLineWidth(0.5)
+        canvas.line(50, 40, PAGE_W - 50, 40)
+        canvas.drawString(50, 28, f"Generated {BUILD_DATE.strftime('%B %d, %Y')}")
+        canvas.drawRightString(PAGE_W - 50, 28, f"Page {doc.page}")
+        canvas.drawCentredString(PAGE_W / 2, 28, client)
+        canvas.restoreState()
+    return header_footer
+
+
+def make_cover_page(client):
+    def cover_page(canvas, doc):
+        """Custom first page with no standard header."""
+        canvas.saveState()
+        # Top accent bar
+        canvas.setFillColor(ACCENT)
+        canvas.rect(0, PAGE_H - 8, PAGE_W, 8, fill=1, stroke=0)
+        # Bottom accent bar
+        canvas.rect(0, 0, PAGE_W, 8, fill=1, stroke=0)
+        # Confidential watermark
+        canvas.setFont('Helvetica', 7)
+        canvas.setFillColor(TEXT_LIGHT)
+        canvas.drawCentredString(PAGE_W / 2, 18, f"Confidential  |  Prepared for {client}")
+        canvas.restoreState()
+    return cover_page
 
 
 # ============================================================
 # DATA
 # ============================================================
 
-CATEGORIES = [
-    ("AI Citability", 38, 77, 25),
-    ("Brand Authority", 42, 42, 20),
-    ("Content E-E-A-T", 45, 74, 20),
-    ("Technical GEO", 18, 90, 15),
-    ("Schema & Structured Data", 12, 65, 10),
-    ("Platform Optimization", 42, 42, 10),
+# (category, wix, nextjs, weight); composites, deltas and percentages are
+# computed from these by geo_scoring
+CATEGORIES = CASE_STUDY_CATEGORIES
+
+# Manifest column keys for each category, in CATEGORIES order (CSV manifests)
+CATEGORY_KEYS = ["citability", "brand", "eeat", "technical", "schema", "platform"]
+
+CATEGORY_SHORT_NAMES = {
+    "AI Citability": "Citability",
+    "Brand Authority": "Brand Auth.",
+    "Content E-E-A-T": "E-E-A-T",
+    "Technical GEO": "Technical",
+    "Schema & Structured Data": "Schema",
+    "Platform Optimization": "Platform",
+}
+
+# Categories scored on signals outside the website (reviews, profiles, listings),
+# which a rebuild doesn't move
+OFF_SITE_CATEGORIES = ("Brand Authority", "Platform Optimization")
+
+# Appendix A: crawler, platform, Wix access, Next.js access. Audits that carry
+# "wix_robots_txt" / "nextjs_robots_txt" get these statuses computed instead.
+CRAWLER_ACCESS = [
+    ["GPTBot", "ChatGPT (OpenAI)", "Wildcard only", "Explicitly whitelisted"],
+    ["ChatGPT-User", "ChatGPT browse", "Wildcard only", "Explicitly whitelisted"],
+    ["Google-Extended", "Gemini (Google)", "Wildcard only", "Explicitly whitelisted"],
+    ["PerplexityBot", "Perplexity AI", "Wildcard only", "Explicitly whitelisted"],
+    ["anthropic-ai", "Claude (Anthropic)", "Wildcard only", "Explicitly whitelisted"],
+    ["Claude-Web", "Claude web search", "Wildcard only", "Explicitly whitelisted"],
+    ["Applebot-Extended", "Siri / Apple Intelligence", "Wildcard only", "Explicitly whitelisted"],
+    ["CCBot", "Common Crawl", "Wildcard only", "Explicitly whitelisted"],
+    ["cohere-ai", "Cohere AI models", "Wildcard only", "Explicitly whitelisted"],
+    ["Bytespider", "TikTok / ByteDance", "Wildcard only", "Wildcard only"],
+    ["Meta-ExternalAgent", "Meta AI", "Wildcard only", "Wildcard only"],
+    ["Amazonbot", "Alexa / Amazon", "Wildcard only", "Wildcard only"],
 ]
 
-WIX_COMPOSITE = 35
-NEXTJS_COMPOSITE = 67
-DELTA = 32
-PCT_IMPROVEMENT = 91
+PARAGON_AUDIT = {
+    "client": "Paragon Pool and Patio, Inc.",
+    "short_name": "Paragon Pool & Spa",
+    "analysis_date": "February 2026",
+    "categories": CATEGORIES,
+}
+
+
+def crawler_access_rows(audit):
+    """Appendix A rows: compiled from the audit's two robots.txt files
+    (checked against its "crawl_urls", default the homepage) when it has
+    them, the case-study statuses otherwise."""
+    if "wix_robots_txt" not in audit or "nextjs_robots_txt" not in audit:
+        return CRAWLER_ACCESS
+    crawlers = [(token, platform, None) for token, platform, _, _ in CRAWLER_ACCESS]
+    urls = audit.get("crawl_urls") or ["/"]
+    before = access_matrix(compile_robots(audit["wix_robots_txt"]), urls, crawlers)
+    after = access_matrix(compile_robots(audit["nextjs_robots_txt"]), urls, crawlers)
+    return [[token, platform, before[token]["status"], after[token]["status"]]
+            for token, platform, _ in crawlers]
+
+
+def change_word(delta):
+    """How a net score change reads in prose: improvement, decline or change."""
+    return "improvement" if delta > 0 else "decline" if delta < 0 else "change"
+
+
+def categories_phrase(n, kind=""):
+    """ "four categories", "one website-controlled category", ... for
+    sentences built from a count."""
+    words = ["no", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+    return f"{words[n] if n < len(words) else n} {kind + ' ' if kind else ''}{plural(n)}"
+
+
+def plural(n, one="category", many="categories"):
+    return one if n == 1 else many
+
+
+def category_heading(num, name, wix, njs):
+    """Deep-dive subheading, e.g. "4.1  AI Citability — 38 → 77 (+39)"."""
+    delta = njs - wix
+    change = "No Change" if delta == 0 else (f"+{delta}" if delta > 0 else str(delta))
+    return f"{num}  {name} — {wix} → {njs} ({change})"
+
+
+def score_card_table(categories, scores):
+    """Section 3 master table: every category's raw and weighted scores and
+    deltas, plus the composite row (scores: geo_scoring.score_comparison)."""
+    master_data = [["#", "Category", "Weight", "Wix", "Wix Wtd", "Next.js", "NJS Wtd", "Delta", "Wtd Delta"]]
+    for i, row in enumerate(scores["rows"], 1):
+        delta, wtd_delta = row["delta"], row["weighted_delta"]
+        d_str = f"+{delta}" if delta > 0 else str(delta) if delta < 0 else "0"
+        wd_str = f"+{wtd_delta}" if wtd_delta > 0 else str(wtd_delta) if wtd_delta != 0 else "0.0"
+        master_data.append([str(i), row["name"], f"{row['weight']}%", str(row["before"]),
+                            str(row["before_weighted"]), str(row["after"]), str(row["after_weighted"]),
+                            d_str, wd_str])
+    master_data.append(["", "Composite", "100%", str(scores["before_composite"]), f"{scores['before_total']:.2f}",
+                        str(scores["after_composite"]), f"{scores['after_total']:.2f}", f"{scores['delta']:+d}",
+                        f"{scores['pct_improvement']:+d}%"])
+
+    mt = Table(master_data, colWidths=[20, 120, 40, 38, 45, 45, 45, 40, 55])
+    mt_style = make_table_style()
+    mt_style.add('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold')
+    mt_style.add('BACKGROUND', (0, -1), (-1, -1), MEDIUM_BG)
+    mt_style.add('ALIGN', (2, 0), (-1, -1), 'CENTER')
+    # Color scores, and both delta columns for gains
+    apply_rules(mt_style, [
+        text_color_rule(3, [wix for _, wix, _, _ in categories], score_color),
+        text_color_rule(5, [njs for _, _, njs, _ in categories], score_color),
+        delta_rule((7, 8), [njs - wix for _, wix, njs, _ in categories], positive=DELTA_COLOR),
+    ])
+    # Last row
+    mt_style.add('TEXTCOLOR', (7, -1), (8, -1), DELTA_COLOR)
+    mt.setStyle(mt_style)
+    return mt
 
 
 # ============================================================
 # BUILD THE REPORT
 # ============================================================
 
-def generate_report(output_path):
-    doc = SimpleDocTemplate(
+def generate_report(output_path, audit=None):
+    """Build the comparison PDF for one before/after audit (default: Paragon)."""
+    audit = audit or PARAGON_AUDIT
+    client = audit["client"]
+    categories = [tuple(c) for c in audit["categories"]]
+    scores = score_comparison(categories)
+    wix_composite = scores["before_composite"]
+    nextjs_composite = scores["after_composite"]
+    delta_total = scores["delta"]
+    pct_improvement = scores["pct_improvement"]
+    by_name = {c[0]: c for c in categories}
+
+    doc = StreamingDocTemplate(
         output_path, pagesize=letter,
         topMargin=55, bottomMargin=55, leftMargin=50, rightMargin=50,
     )
@@ -521,11 +716,11 @@ def generate_report(output_path):
     el.append(HRFlowable(width="100%", thickness=2, color=ACCENT, spaceAfter=16))
 
     cover_details = [
-        ["Client", "Paragon Pool and Patio, Inc."],
-        ["Analysis Date", "February 2026"],
-        ["Wix Site Score", f"{WIX_COMPOSITE}/100 — {score_label(WIX_COMPOSITE)}"],
-        ["Next.js Site Score", f"{NEXTJS_COMPOSITE}/100 — {score_label(NEXTJS_COMPOSITE)}"],
-        ["Net Improvement", f"+{DELTA} points (+{PCT_IMPROVEMENT}%)"],
+        ["Client", client],
+        ["Analysis Date", audit.get("analysis_date") or BUILD_DATE.strftime("%B %Y")],
+        ["Wix Site Score", f"{wix_composite}/100 — {score_label(wix_composite)}"],
+        ["Next.js Site Score", f"{nextjs_composite}/100 — {score_label(nextjs_composite)}"],
+        [f"Net {change_word(delta_total).title()}", f"{delta_total:+d} points ({pct_improvement:+d}%)"],
     ]
     ct = Table(cover_details, colWidths=[130, 340])
     ct.setStyle(TableStyle([
@@ -544,12 +739,12 @@ def generate_report(output_path):
     el.append(Spacer(1, 24))
 
     # Cover visual — two score rings with delta arrow
-    el.append(create_cover_visual(WIX_COMPOSITE, NEXTJS_COMPOSITE, DELTA))
+    el.append(create_cover_visual(wix_composite, nextjs_composite, delta_total))
 
     el.append(Spacer(1, 16))
 
     # Score scale
-    el.append(create_score_scale(WIX_COMPOSITE, NEXTJS_COMPOSITE))
+    el.append(create_score_scale(wix_composite, nextjs_composite))
 
     el.append(PageBreak())
 
@@ -559,15 +754,15 @@ def generate_report(output_path):
     section_header(el, styles, 1, "Executive Summary")
 
     el.append(Paragraph(
-        f"Your old Wix website scored <b>{WIX_COMPOSITE} out of 100</b> on our Generative Engine Optimization "
-        f"(GEO) audit — a \"{score_label(WIX_COMPOSITE)}\" rating that means AI assistants like ChatGPT, "
+        f"Your old Wix website scored <b>{wix_composite} out of 100</b> on our Generative Engine Optimization "
+        f"(GEO) audit — a \"{score_label(wix_composite)}\" rating that means AI assistants like ChatGPT, "
         f"Google AI Overview, Perplexity, and Siri were largely unable to find, understand, or recommend "
         f"your business.",
         styles['BodyCustom']
     ))
     el.append(Paragraph(
-        f"Your new custom-built website scores <b>{NEXTJS_COMPOSITE} out of 100</b> — a \"{score_label(NEXTJS_COMPOSITE)}\" "
-        f"rating representing a <font color=\"{DELTA_COLOR.hexval()}\"><b>+{DELTA}-point improvement (+{PCT_IMPROVEMENT}%)</b></font>. "
+        f"Your new custom-built website scores <b>{nextjs_composite} out of 100</b> — a \"{score_label(nextjs_composite)}\" "
+        f"rating representing a <font color=\"{DELTA_COLOR.hexval()}\"><b>{delta_total:+d}-point {change_word(delta_total)} ({pct_improvement:+d}%)</b></font>. "
         f"AI systems can now read your site, extract your business data, and cite you when someone asks "
         f"\"Who builds pools near Stillwater, MN?\"",
         styles['BodyCustom']
@@ -577,34 +772,26 @@ def generate_report(output_path):
 
     # Summary scorecard table
     summary_data = [["Category", "Wix", "Next.js", "Change", "Impact"]]
-    for name, wix, njs, weight in CATEGORIES:
-        delta = njs - wix
+    for row in scores["rows"]:
+        delta, w_delta = row["delta"], row["impact"]
         delta_str = f"+{delta}" if delta > 0 else str(delta) if delta < 0 else "—"
-        w_delta = round((delta * weight / 100), 1)
         impact_str = f"+{w_delta}" if w_delta > 0 else str(w_delta) if w_delta != 0 else "—"
-        summary_data.append([name, f"{wix}", f"{njs}", delta_str, f"{impact_str} pts"])
-    summary_data.append(["Composite GEO Score", str(WIX_COMPOSITE), str(NEXTJS_COMPOSITE),
-                          f"+{DELTA}", f"+{PCT_IMPROVEMENT}%"])
+        summary_data.append([row["name"], f"{row['before']}", f"{row['after']}", delta_str, f"{impact_str} pts"])
+    summary_data.append(["Composite GEO Score", str(wix_composite), str(nextjs_composite),
+                          f"{delta_total:+d}", f"{pct_improvement:+d}%"])
 
     st = Table(summary_data, colWidths=[155, 55, 60, 55, 65])
     st_style = make_table_style()
     # Bold last row
     st_style.add('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold')
     st_style.add('BACKGROUND', (0, -1), (-1, -1), MEDIUM_BG)
-    # Color delta column
-    for i in range(1, len(summary_data)):
-        delta_val = summary_data[i][3]
-        if delta_val.startswith("+"):
-            st_style.add('TEXTCOLOR', (3, i), (3, i), DELTA_COLOR)
-            st_style.add('FONTNAME', (3, i), (3, i), 'Helvetica-Bold')
-        elif delta_val == "—":
-            st_style.add('TEXTCOLOR', (3, i), (3, i), TEXT_SECONDARY)
-    # Color score columns
-    for i in range(1, len(summary_data) - 1):
-        wix_v = int(summary_data[i][1])
-        njs_v = int(summary_data[i][2])
-        st_style.add('TEXTCOLOR', (1, i), (1, i), score_color(wix_v))
-        st_style.add('TEXTCOLOR', (2, i), (2, i), score_color(njs_v))
+    # Color delta column (composite row included) and score columns
+    apply_rules(st_style, [
+        delta_rule(3, [njs - wix for _, wix, njs, _ in categories] + [delta_total],
+                   positive=DELTA_COLOR, zero=TEXT_SECONDARY, bold_positive=True),
+        text_color_rule(1, [wix for _, wix, _, _ in categories], score_color),
+        text_color_rule(2, [njs for _, _, njs, _ in categories], score_color),
+    ])
     st.setStyle(st_style)
     el.append(st)
 
@@ -615,7 +802,7 @@ def generate_report(output_path):
     bullets = [
         "<b>Before:</b> When someone asked ChatGPT \"Who builds inground pools near Stillwater, MN?\", your business was invisible. AI couldn't read your Wix site, couldn't find structured data to extract, and had almost nothing quotable to work with.",
         "<b>After:</b> AI systems can now read every page, extract your business details (owner, locations, hours, packages, pricing), and cite specific facts like \"$51,995 for a complete 18x36 package\" or \"BBB A+ rated since 1998.\"",
-        "<b>What's left:</b> The remaining 33 points to reach 100 are primarily off-site work — getting more customer reviews, claiming your Yelp and Google profiles, and building third-party authority. The website itself is doing its job.",
+        f"<b>What's left:</b> The remaining {100 - nextjs_composite} points to reach 100 are primarily off-site work — getting more customer reviews, claiming your Yelp and Google profiles, and building third-party authority. The website itself is doing its job.",
     ]
     for b in bullets:
         el.append(Paragraph(f"&#8226; {b}", styles['BulletCustom']))
@@ -683,8 +870,8 @@ def generate_report(output_path):
     bt.setStyle(bt_style)
     el.append(bt)
     el.append(Paragraph(
-        f"<i>Your Wix site (35) fell in the \"template with minimal SEO\" range. "
-        f"Your new site (67) places you in the \"active GEO\" range — ahead of virtually all competitors.</i>",
+        f"<i>Your Wix site ({wix_composite}) fell in the \"template with minimal SEO\" range. "
+        f"Your new site ({nextjs_composite}) places you in the \"active GEO\" range — ahead of virtually all competitors.</i>",
         styles['SmallText']
     ))
 
@@ -696,57 +883,31 @@ def generate_report(output_path):
     section_header(el, styles, 3, "Score Card — Full Comparison")
 
     # Master comparison table
-    master_data = [["#", "Category", "Weight", "Wix", "Wix Wtd", "Next.js", "NJS Wtd", "Delta", "Wtd Delta"]]
-    for i, (name, wix, njs, weight) in enumerate(CATEGORIES, 1):
-        delta = njs - wix
-        wix_wtd = round(wix * weight / 100, 1)
-        njs_wtd = round(njs * weight / 100, 1)
-        wtd_delta = round(njs_wtd - wix_wtd, 1)
-        d_str = f"+{delta}" if delta > 0 else str(delta) if delta < 0 else "0"
-        wd_str = f"+{wtd_delta}" if wtd_delta > 0 else str(wtd_delta) if wtd_delta != 0 else "0.0"
-        master_data.append([str(i), name, f"{weight}%", str(wix), str(wix_wtd),
-                            str(njs), str(njs_wtd), d_str, wd_str])
-    master_data.append(["", "Composite", "100%", str(WIX_COMPOSITE), "35.00",
-                         str(NEXTJS_COMPOSITE), "66.65", f"+{DELTA}", f"+{PCT_IMPROVEMENT}%"])
-
-    mt = Table(master_data, colWidths=[20, 120, 40, 38, 45, 45, 45, 40, 55])
-    mt_style = make_table_style()
-    mt_style.add('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold')
-    mt_style.add('BACKGROUND', (0, -1), (-1, -1), MEDIUM_BG)
-    mt_style.add('ALIGN', (2, 0), (-1, -1), 'CENTER')
-    # Color scores and deltas
-    for i in range(1, len(master_data) - 1):
-        wix_v = int(master_data[i][3])
-        njs_v = int(master_data[i][5])
-        mt_style.add('TEXTCOLOR', (3, i), (3, i), score_color(wix_v))
-        mt_style.add('TEXTCOLOR', (5, i), (5, i), score_color(njs_v))
-        if master_data[i][7].startswith("+"):
-            mt_style.add('TEXTCOLOR', (7, i), (7, i), DELTA_COLOR)
-            mt_style.add('TEXTCOLOR', (8, i), (8, i), DELTA_COLOR)
-    # Last row
-    mt_style.add('TEXTCOLOR', (7, -1), (8, -1), DELTA_COLOR)
-    mt.setStyle(mt_style)
-    el.append(mt)
+    el.append(score_card_table(categories, scores))
 
     el.append(Spacer(1, 12))
 
     # Grouped bar chart
-    cat_names = [c[0].replace("& Structured Data", "\n& Struct. Data") for c in CATEGORIES]
-    short_names = ["Citability", "Brand Auth.", "E-E-A-T", "Technical", "Schema", "Platform"]
-    wix_scores = [c[1] for c in CATEGORIES]
-    njs_scores = [c[2] for c in CATEGORIES]
+    short_names = [CATEGORY_SHORT_NAMES.get(c[0], c[0]) for c in categories]
+    wix_scores = [c[1] for c in categories]
+    njs_scores = [c[2] for c in categories]
     el.append(create_comparison_bar_chart(short_names, wix_scores, njs_scores))
 
     el.append(Spacer(1, 8))
 
-    # Note about identical scores
-    el.append(Paragraph(
-        "<b>Why two categories are identical:</b> Brand Authority (42) and Platform Optimization (42) "
-        "measure <i>off-site</i> signals — reviews on Google/Yelp, social media accounts, directory listings. "
-        "Rebuilding the website doesn't change these. They require separate business actions (claiming profiles, "
-        "requesting reviews).",
-        styles['CalloutText']
-    ))
+    # Note about identical scores, when only off-site categories are unchanged
+    unchanged = [c for c in categories if c[1] == c[2]]
+    if unchanged and all(c[0] in OFF_SITE_CATEGORIES for c in unchanged):
+        many = len(unchanged) > 1
+        count = {1: "one category is", 2: "two categories are"}.get(len(unchanged), f"{len(unchanged)} categories are")
+        el.append(Paragraph(
+            f"<b>Why {count} identical:</b> {' and '.join(f'{c[0]} ({c[1]})' for c in unchanged)} "
+            f"{'measure' if many else 'measures'} <i>off-site</i> signals — reviews on Google/Yelp, "
+            "social media accounts, directory listings. "
+            "Rebuilding the website doesn't change these. They require separate business actions (claiming profiles, "
+            "requesting reviews).",
+            styles['CalloutText']
+        ))
 
     el.append(PageBreak())
 
@@ -756,7 +917,7 @@ def generate_report(output_path):
     section_header(el, styles, 4, "Category Deep Dives")
 
     # --- 4.1 AI Citability ---
-    el.append(Paragraph("4.1  AI Citability — 38 → 77 (+39)", styles['SubHeader']))
+    el.append(Paragraph(category_heading("4.1", *by_name["AI Citability"][:3]), styles['SubHeader']))
     el.append(Paragraph(
         "<b>What this measures:</b> How easily AI systems can extract specific, quotable facts — "
         "prices, specs, timelines, locations, and direct answers to customer questions.",
@@ -788,7 +949,7 @@ def generate_report(output_path):
     el.append(Spacer(1, 10))
 
     # --- 4.2 Brand Authority ---
-    el.append(Paragraph("4.2  Brand Authority — 42 → 42 (No Change)", styles['SubHeader']))
+    el.append(Paragraph(category_heading("4.2", *by_name["Brand Authority"][:3]), styles['SubHeader']))
     el.append(Paragraph(
         "<b>What this measures:</b> Third-party evidence that your business is real, reputable, and active — "
         "reviews, directory listings, social media presence, and external mentions.",
@@ -816,7 +977,7 @@ def generate_report(output_path):
     el.append(CondPageBreak(3.5 * inch))
 
     # --- 4.3 Content E-E-A-T ---
-    el.append(Paragraph("4.3  Content E-E-A-T — 45 → 74 (+29)", styles['SubHeader']))
+    el.append(Paragraph(category_heading("4.3", *by_name["Content E-E-A-T"][:3]), styles['SubHeader']))
     el.append(Paragraph(
         "<b>What this measures:</b> Whether your content demonstrates real Experience, Expertise, "
         "Authoritativeness, and Trustworthiness — the four signals AI uses to decide which source to cite.",
@@ -849,7 +1010,7 @@ def generate_report(output_path):
     el.append(CondPageBreak(4 * inch))
 
     # --- 4.4 Technical GEO ---
-    el.append(Paragraph("4.4  Technical GEO — 18 → 90 (+72)", styles['SubHeader']))
+    el.append(Paragraph(category_heading("4.4", *by_name["Technical GEO"][:3]), styles['SubHeader']))
     el.append(Paragraph(
         "<b>What this measures:</b> Whether AI crawlers can physically access, read, and understand "
         "your website. This is the <b>largest single improvement</b> (+72 points).",
@@ -884,7 +1045,7 @@ def generate_report(output_path):
     el.append(CondPageBreak(3.5 * inch))
 
     # --- 4.5 Schema & Structured Data ---
-    el.append(Paragraph("4.5  Schema & Structured Data — 12 → 65 (+53)", styles['SubHeader']))
+    el.append(Paragraph(category_heading("4.5", *by_name["Schema & Structured Data"][:3]), styles['SubHeader']))
     el.append(Paragraph(
         "<b>What this measures:</b> Machine-readable labels that tell AI exactly what each piece of content "
         "represents. Think of schema as name tags — without them, AI has to guess.",
@@ -918,7 +1079,7 @@ def generate_report(output_path):
     el.append(CondPageBreak(2.5 * inch))
 
     # --- 4.6 Platform Optimization ---
-    el.append(Paragraph("4.6  Platform Optimization — 42 → 42 (No Change)", styles['SubHeader']))
+    el.append(Paragraph(category_heading("4.6", *by_name["Platform Optimization"][:3]), styles['SubHeader']))
     el.append(Paragraph(
         "<b>What this measures:</b> How well your business is represented on platforms AI uses as "
         "reference sources — Google, Yelp, social media, and industry directories.",
@@ -950,32 +1111,34 @@ def generate_report(output_path):
     section_header(el, styles, 5, "What Changed vs. What Stayed the Same")
 
     # Horizontal comparison bars
-    cat_labels = [c[0] for c in CATEGORIES]
-    wix_vals = [c[1] for c in CATEGORIES]
-    njs_vals = [c[2] for c in CATEGORIES]
+    cat_labels = [c[0] for c in categories]
+    wix_vals = [c[1] for c in categories]
+    njs_vals = [c[2] for c in categories]
     el.append(create_horizontal_comparison_bars(cat_labels, wix_vals, njs_vals))
 
     el.append(Spacer(1, 10))
 
-    # Two-column summary
-    changed_data = [
-        ["Website Improvements (4 categories)", "Score Change"],
-        ["Technical GEO", "+72 pts (18 → 90)"],
-        ["Schema & Structured Data", "+53 pts (12 → 65)"],
-        ["AI Citability", "+39 pts (38 → 77)"],
-        ["Content E-E-A-T", "+29 pts (45 → 74)"],
-    ]
-    unchanged_data = [
-        ["Business Presence (2 categories)", "Score"],
-        ["Brand Authority", "42 (unchanged)"],
-        ["Platform Optimization", "42 (unchanged)"],
-    ]
-
-    ch_t = Table(changed_data, colWidths=[220, 130])
-    ch_style = make_table_style(header_color=DELTA_COLOR)
-    for i in range(1, len(changed_data)):
-        ch_style.add('TEXTCOLOR', (1, i), (1, i), DELTA_COLOR)
-    ch_t.setStyle(ch_style)
+    # Two-column summary: gains (and any losses) beside the unchanged categories
+    gains = sorted((c for c in categories if c[2] > c[1]), key=lambda c: c[2] - c[1], reverse=True)
+    losses = sorted((c for c in categories if c[2] < c[1]), key=lambda c: c[2] - c[1])
+    unchanged = [c for c in categories if c[2] == c[1]]
+    unchanged_data = [[f"Business Presence ({len(unchanged)} {plural(len(unchanged))})", "Score"]]
+    for name, wix, _, _ in unchanged:
+        unchanged_data.append([name, f"{wix} (unchanged)"])
+    avg_gain = round(sum(c[2] - c[1] for c in gains) / len(gains)) if gains else 0
+    avg_loss = round(sum(c[1] - c[2] for c in losses) / len(losses)) if losses else 0
+
+    change_tables = []
+    for title, rows, color in (("Website Improvements", gains, DELTA_COLOR), ("Website Declines", losses, DANGER)):
+        if not rows and (change_tables or losses):
+            continue  # only the side(s) that happened; an empty improvements table if nothing did
+        data = [[f"{title} ({len(rows)} {plural(len(rows))})", "Score Change"]] + [[name, f"{njs - wix:+d} pts ({wix} → {njs})"]
+                                            for name, wix, njs, _ in rows]
+        ch_style = make_table_style(header_color=color)
+        for i in range(1, len(data)):
+            ch_style.add('TEXTCOLOR', (1, i), (1, i), color)
+        change_tables.append(Table(data, colWidths=[220, 130], style=ch_style))
+    ch_t = change_tables[0] if len(change_tables) == 1 else [change_tables[0], Spacer(1, 8), change_tables[1]]
 
     unch_t = Table(unchanged_data, colWidths=[200, 130])
     unch_style = make_table_style(header_color=TEXT_SECONDARY)
@@ -993,13 +1156,22 @@ def generate_report(output_path):
     el.append(wrapper)
 
     el.append(Spacer(1, 10))
-    el.append(Paragraph(
-        "<b>Key insight:</b> The website rebuild captured <b>all available on-site gains</b>. "
-        "The four website-controlled categories jumped by an average of 48 points. The remaining 33 points "
-        "to 100 require <b>off-site business work</b> — reviews, profiles, social media. "
-        "The foundation is built; now the business presence needs to catch up.",
-        styles['CalloutText']
-    ))
+    if gains and not losses:
+        insight = ("The website rebuild captured <b>all available on-site gains</b>. "
+                   f"The {categories_phrase(len(gains), 'website-controlled')} jumped by an average of "
+                   f"{avg_gain} points. "
+                   f"The remaining {100 - nextjs_composite} points "
+                   "to 100 require <b>off-site business work</b> — reviews, profiles, social media. "
+                   "The foundation is built; now the business presence needs to catch up.")
+    elif gains or losses:
+        insight = (f"{categories_phrase(len(gains)).capitalize()} improved"
+                   + (f" (by {avg_gain} points on average)" if gains else "")
+                   + f" and {categories_phrase(len(losses))} declined (by {avg_loss} points on average). "
+                   f"The new site is {100 - nextjs_composite} points short of 100.")
+    else:
+        insight = (f"No category changed score between the two sites. "
+                   f"Both are {100 - nextjs_composite} points short of 100.")
+    el.append(Paragraph(f"<b>Key insight:</b> {insight}", styles['CalloutText']))
 
     el.append(PageBreak())
 
@@ -1008,13 +1180,14 @@ def generate_report(output_path):
     # ────────────────────────────────────────────
     section_header(el, styles, 6, "Business Impact")
 
-    el.append(Paragraph("<b>What a 32-point GEO improvement means for lead generation:</b>", styles['BodyCustom']))
+    el.append(Paragraph(f"<b>What a {abs(delta_total)}-point GEO {change_word(delta_total)} means for lead generation:</b>",
+                        styles['BodyCustom']))
     el.append(Spacer(1, 6))
 
     # Before/After query examples
     el.append(Paragraph("Example Query: \"Who builds inground pools near Stillwater, MN?\"", styles['SubSubHeader']))
     q1_data = [
-        ["", "Wix (GEO 35)", "Next.js (GEO 67)"],
+        ["", f"Wix (GEO {wix_composite})", f"Next.js (GEO {nextjs_composite})"],
         ["AI can read the site?", "Unreliable (JavaScript rendering)", "Yes — complete HTML instantly"],
         ["Structured business data?", "None or minimal", "3 locations, hours, GPS, 14 service area cities"],
         ["Quotable facts?", "1 price ($51,995), limited context", "$51,995 + cost breakdown + FAQs + specs"],
@@ -1058,7 +1231,7 @@ def generate_report(output_path):
     el.append(Paragraph(
         "Your competitors in the Twin Cities pool builder market are almost certainly running standard "
         "template websites without AI crawler whitelisting, llms.txt endpoints, rich schema markup, or "
-        "structured FAQ content. A GEO score of 67 likely puts you <b>ahead of every competitor</b> for "
+        f"structured FAQ content. A GEO score of {nextjs_composite} likely puts you <b>ahead of every competitor</b> for "
         "AI visibility. When a customer asks ChatGPT or Perplexity for pool builder recommendations in "
         "your area, you're structured to be cited first.",
         styles['BodyCustom']
@@ -1072,13 +1245,18 @@ def generate_report(output_path):
     section_header(el, styles, 7, "Roadmap to 80+")
 
     el.append(Paragraph(
-        "The current score of 67 can reach 80+ within 6 months through three tiers of work.",
+        f"The current score of {nextjs_composite} can reach 80+ within 6 months through three tiers of work.",
         styles['BodyCustom']
     ))
     el.append(Spacer(1, 4))
 
-    # Timeline visual
-    el.append(create_roadmap_visual())
+    # Score history (from the audit history store) and timeline visual
+    history = [tuple(p) for p in audit.get("history") or []]
+    if len(history) >= 2:
+        el.append(Paragraph(f"Composite score across the last {len(history)} audits:", styles['BodyCustom']))
+        el.append(create_trend_visual(history))
+        el.append(Spacer(1, 4))
+    el.append(create_roadmap_visual(nextjs_composite, pace(history), len(history)))
     el.append(Spacer(1, 8))
 
     # Tier 1
@@ -1190,11 +1368,14 @@ def generate_report(output_path):
     # Integrity notes
     el.append(Paragraph("<b>Notes on Scoring Integrity</b>", styles['SubSubHeader']))
     integrity_notes = [
-        "Off-site scores (Brand Authority, Platform Optimization) are intentionally identical for both sites — these measure signals outside the website.",
         "Wix schema score (12) gives benefit of the doubt for possible auto-injected LocalBusiness markup.",
         "The Wix site had a Gallery page with project photos. The new site does not yet have this — acknowledged as a gap.",
         "All Next.js scores match GEO-AUDIT-REPORT.md exactly — no rounding or adjustment.",
     ]
+    off_site = [c for c in categories if c[0] in OFF_SITE_CATEGORIES]
+    if off_site and all(c[1] == c[2] for c in off_site):
+        integrity_notes.insert(0, f"Off-site scores ({', '.join(c[0] for c in off_site)}) are intentionally "
+                                  "identical for both sites — these measure signals outside the website.")
     for note in integrity_notes:
         el.append(Paragraph(f"&#8226; {note}", styles['BulletCustom']))
 
@@ -1207,21 +1388,7 @@ def generate_report(output_path):
 
     # --- Appendix A: AI Crawler Access Matrix ---
     el.append(Paragraph("Appendix A: AI Crawler Access Matrix", styles['SubHeader']))
-    crawlers_data = [
-        ["AI Crawler", "Platform", "Wix", "Next.js"],
-        ["GPTBot", "ChatGPT (OpenAI)", "Wildcard only", "Explicitly whitelisted"],
-        ["ChatGPT-User", "ChatGPT browse", "Wildcard only", "Explicitly whitelisted"],
-        ["Google-Extended", "Gemini (Google)", "Wildcard only", "Explicitly whitelisted"],
-        ["PerplexityBot", "Perplexity AI", "Wildcard only", "Explicitly whitelisted"],
-        ["anthropic-ai", "Claude (Anthropic)", "Wildcard only", "Explicitly whitelisted"],
-        ["Claude-Web", "Claude web search", "Wildcard only", "Explicitly whitelisted"],
-        ["Applebot-Extended", "Siri / Apple Intelligence", "Wildcard only", "Explicitly whitelisted"],
-        ["CCBot", "Common Crawl", "Wildcard only", "Explicitly whitelisted"],
-        ["cohere-ai", "Cohere AI models", "Wildcard only", "Explicitly whitelisted"],
-        ["Bytespider", "TikTok / ByteDance", "Wildcard only", "Wildcard only"],
-        ["Meta-ExternalAgent", "Meta AI", "Wildcard only", "Wildcard only"],
-        ["Amazonbot", "Alexa / Amazon", "Wildcard only", "Wildcard only"],
-    ]
+    crawlers_data = [["AI Crawler", "Platform", "Wix", "Next.js"]] + crawler_access_rows(audit)
     crt = Table(crawlers_data, colWidths=[100, 120, 95, 110])
     cr_style = make_table_style()
     for i in range(1, len(crawlers_data)):
@@ -1229,10 +1396,14 @@ def generate_report(output_path):
         njs_status = crawlers_data[i][3]
         if "Wildcard" in wix_status:
             cr_style.add('TEXTCOLOR', (2, i), (2, i), WARNING)
+        elif "blocked" in wix_status.lower():
+            cr_style.add('TEXTCOLOR', (2, i), (2, i), DANGER)
         if "Explicitly" in njs_status:
             cr_style.add('TEXTCOLOR', (3, i), (3, i), SUCCESS)
         elif "Wildcard" in njs_status:
             cr_style.add('TEXTCOLOR', (3, i), (3, i), WARNING)
+        elif "blocked" in njs_status.lower():
+            cr_style.add('TEXTCOLOR', (3, i), (3, i), DANGER)
     crt.setStyle(cr_style)
     el.append(crt)
 
@@ -1313,9 +1484,8 @@ def generate_report(output_path):
         ["robots.txt", "—", "9 AI crawlers whitelisted"],
         ["llms.txt", "—", "Full AI-readable business summary"],
     ]
-    njpt = Table(njs_pages, colWidths=[80, 150, 210])
-    njpt.setStyle(make_table_style(header_color=NEXTJS_COLOR))
-    el.append(njpt)
+    el.append(AppendixTable(njs_pages[0], njs_pages[1:], colWidths=[80, 150, 210],
+                            style=functools.partial(make_table_style, header_color=NEXTJS_COLOR)))
 
     el.append(CondPageBreak(3 * inch))
 
@@ -1346,9 +1516,17 @@ def generate_report(output_path):
 
     # Final footer
     el.append(HRFlowable(width="100%", thickness=0.5, color=lightgrey, spaceAfter=8))
+    snapshot = audit.get("wix_snapshot")
+    if snapshot:
+        scraped = (f"All Wix data verified against archived crawl snapshot {snapshot['digest'][:12]} "
+                   f"({len(snapshot['pages'])} responses, "
+                   f"{time.strftime('%B %d, %Y', time.gmtime(snapshot['fetched_at']))}), "
+                   f"replayable offline with geo_crawler.py --replay. ")
+    else:
+        scraped = "All Wix data verified against Playwright headless browser scrape (February 26, 2026). "
     el.append(Paragraph(
         "This report was generated using a structured 6-category GEO scoring methodology. "
-        "All Wix data verified against Playwright headless browser scrape (February 26, 2026). "
+        + scraped +
         "All Next.js data verified against the live codebase. Off-site signals verified via live platform searches.",
         styles['SmallText']
     ))
@@ -1361,12 +1539,279 @@ def generate_report(output_path):
     # ────────────────────────────────────────────
     # BUILD
     # ────────────────────────────────────────────
-    doc.build(el, onFirstPage=cover_page, onLaterPages=header_footer)
+    doc.build(el, onFirstPage=make_cover_page(client),
+              onLaterPages=make_header_footer(client, audit.get("short_name", client)))
     return output_path
 
 
+# ============================================================
+# BATCH MODE
+# ============================================================
+
+def report_key(audit):
+    """Build-cache key for one report: generate_report's source, the shared
+    helpers and palette, every project module they import, the styles, the
+    audit data and the footer date."""
+    module = sys.modules[generate_report.__module__]
+    batch_code = [generate_report, report_key, _slugify, _audit_from_csv_row, load_manifest,
+                  attach_history, _check_audit, _init_worker, _render_row, generate_batch, main]
+    return input_key(
+        generator=source_digest(generate_report),
+        shared=module_digest(module, exclude=batch_code),
+        modules=project_digest(module),
+        styles=build_styles(),
+        data=audit,
+        date=BUILD_DATE.isoformat(),
+        deterministic=DETERMINISTIC,
+    )
+
+
+def _slugify(text):
+    return "-".join("".join(ch.lower() if ch.isalnum() else " " for ch in text).split())
+
+
+def _audit_from_csv_row(row):
+    """Turn a flat CSV row (<key>_wix / <key>_nextjs columns) into an audit dict."""
+    categories = []
+    for key, (name, _, _, weight) in zip(CATEGORY_KEYS, CATEGORIES):
+        categories.append((name, int(row[f"{key}_wix"]), int(row[f"{key}_nextjs"]), weight))
+    audit = {k: v for k, v in row.items() if v not in (None, "") and "_wix" not in k and "_nextjs" not in k}
+    audit["categories"] = categories
+    for key in ("wix_composite", "nextjs_composite"):
+        if key in audit:
+            audit[key] = int(audit[key])
+    return audit
+
+
+def load_manifest(path):
+    """Yield (audit, error) from a JSONL or CSV manifest, one per client row.
+
+    A row that can't be parsed yields (None, "<error>") instead of ending the
+    manifest, so the batch can record it as that row's failure.
+
+    Each audit needs "client", "categories" (JSONL: [name, wix, nextjs, weight]
+    rows; CSV: citability_wix, citability_nextjs, ... columns). "slug",
+    "short_name" and "analysis_date" are optional, as are "wix_robots_txt" /
+    "nextjs_robots_txt" (and "crawl_urls") for a computed crawler access
+    matrix, and "site" (looked up in --history) or "history" ([date,
+    composite] rows) for the score trend, and "wix_snapshot" (geo_archive.py
+    snapshot output) to cite an archived crawl in the footer. Composites are computed from the
+    categories; "wix_composite" / "nextjs_composite", if given, are only
+    checked against them.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            rows = ((_audit_from_csv_row, row) for row in csv.DictReader(f))
+        else:
+            rows = ((json.loads, line) for line in f if line.strip())
+        for parse, row in rows:
+            try:
+                audit = parse(row)
+                if not isinstance(audit, dict):
+                    raise ValueError(f"expected an object, got {type(audit).__name__}")
+            except (KeyError, TypeError, ValueError) as exc:  # ValueError covers JSONDecodeError
+                yield None, f"{type(exc).__name__}: {exc}"
+            else:
+                yield audit, None
+
+
+def attach_history(audit, history):
+    """The audit with its "history" series filled in from an AuditHistory
+    (audits without a "site", or that bring their own history, as they are)."""
+    if history is None or "site" not in audit or "history" in audit:
+        return audit
+    return dict(audit, history=[list(point) for point in history.series(audit["site"])])
+
+
+def _check_audit(audit):
+    missing = [k for k in ("client", "categories") if k not in audit]
+    if missing:
+        raise ValueError(f"missing field(s): {', '.join(missing)}")
+    if any(not isinstance(c, (list, tuple)) or len(c) != 4 for c in audit["categories"]):
+        raise ValueError("each category must be [name, wix, nextjs, weight]")
+    names = [c[0] for c in audit["categories"]]
+    if sorted(names) != sorted(c[0] for c in CATEGORIES):
+        raise ValueError(f"categories must be exactly: {', '.join(c[0] for c in CATEGORIES)}")
+    weights = {name: weight for name, _, _, weight in CATEGORIES}
+    for name, wix, nextjs, weight in audit["categories"]:
+        if weight != weights[name]:
+            raise ValueError(f"{name}: weight is {weight!r}, the scoring model's is {weights[name]}")
+        for score in (wix, nextjs):
+            if isinstance(score, bool) or not isinstance(score, int) or not 0 <= score <= 100:
+                raise ValueError(f"{name}: scores must be integers from 0 to 100, got {score!r}")
+    scores = score_comparison([tuple(c) for c in audit["categories"]])
+    for key, computed in (("wix_composite", scores["before_composite"]),
+                          ("nextjs_composite", scores["after_composite"])):
+        if key in audit and int(audit[key]) != computed:
+            raise ValueError(f"{key} is {audit[key]} but the categories give {computed}")
+
+
+def _init_worker(max_memory_mb, build_date, deterministic):
+    """Pool initializer: apply the build settings and cap each worker's address
+    space so one bad row can't take the host down."""
+    configure_build(build_date, deterministic)
+    if max_memory_mb:
+        import resource
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _render_row(audit, output_path):
+    """Worker entry point: render one audit, reporting failures instead of raising."""
+    try:
+        _check_audit(audit)
+        name = os.path.splitext(os.path.basename(output_path))[0]
+        with trace_document(name), profile_document(name):
+            generate_report(output_path, audit)
+        return output_path, None
+    except Exception as exc:  # noqa: BLE001 - one bad row must not abort the batch
+        return output_path, f"{type(exc).__name__}: {exc}"
+
+
+def generate_batch(manifest_path, output_dir, jobs=None, max_tasks_per_child=None, max_memory_mb=None,
+                   cache=None, history=None):
+    """Render one comparison PDF per manifest row across a worker pool.
+
+    At most 2 x jobs rows are in flight at once, so the manifest is streamed
+    rather than loaded up front. Workers are recycled after max_tasks_per_child
+    reports and capped at max_memory_mb of address space. With a BuildCache,
+    rows whose inputs are unchanged are copied from the cache instead of being
+    submitted. With an AuditHistory, rows naming a "site" get its score
+    history. Rows whose slug is already taken get the row number appended,
+    so every row has its own PDF, trace and profile. Returns a summary dict.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    pool_kwargs = {"max_workers": jobs, "initializer": _init_worker,
+                   "initargs": (max_memory_mb, BUILD_DATE, DETERMINISTIC)}
+    if max_tasks_per_child:
+        # Worker recycling is not supported with the fork start method
+        pool_kwargs["mp_context"] = multiprocessing.get_context("spawn")
+        pool_kwargs["max_tasks_per_child"] = max_tasks_per_child
+
+    start = time.perf_counter()
+    ok, failures, pending = [], [], {}
+    cached = 0
+    slugs = set()
+
+    def collect(done):
+        for fut in done:
+            row_num, client, key = pending.pop(fut)
+            try:
+                path, error = fut.result()
+            except Exception as exc:  # worker died (e.g. killed at the memory cap)
+                path, error = None, f"{type(exc).__name__}: {exc}"
+            if error:
+                failures.append((row_num, client, error))
+            else:
+                ok.append(path)
+                if cache is not None:
+                    cache.store(key, path)
+
+    with ProcessPoolExecutor(**pool_kwargs) as pool:
+        for row_num, (audit, error) in enumerate(load_manifest(manifest_path), 1):
+            if error:
+                failures.append((row_num, "?", error))
+                continue
+            audit = attach_history(audit, history)
+            client = audit.get("client", "?")
+            slug = str(audit.get("slug") or _slugify(client) or f"report-{row_num:04d}")
+            if slug in slugs:  # same client twice: don't overwrite the earlier row's PDF
+                slug = f"{slug}-{row_num:04d}"
+            slugs.add(slug)
+            output_path = os.path.join(output_dir, f"{slug}.pdf")
+            key = None
+            if cache is not None:
+                key = report_key(audit)
+                if cache.fetch(key, output_dir, name=f"{slug}.pdf"):
+                    ok.append(output_path)
+                    cached += 1
+                    continue
+            pending[pool.submit(_render_row, audit, output_path)] = (row_num, client, key)
+            if len(pending) >= 2 * jobs:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(wait(pending).done)
+    if cache is not None:
+        cache.save()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rendered": ok,
+        "cached": cached,
+        "failures": sorted(failures),
+        "seconds": elapsed,
+        "reports_per_sec": len(ok) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the GEO comparison PDF report.")
+    parser.add_argument("output", nargs="?", default="docs/audit/GEO-Comparison-Wix-vs-NextJS.pdf",
+                        help="output PDF (single-report mode)")
+    parser.add_argument("--batch", metavar="MANIFEST",
+                        help="JSONL or CSV manifest of before/after audits; renders one PDF per row")
+    parser.add_argument("--output-dir", default="reports", help="batch output directory")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="batch worker processes (default: number of cores)")
+    parser.add_argument("--max-tasks-per-child", type=int,
+                        help="recycle each batch worker after this many reports")
+    parser.add_argument("--max-memory-mb", type=int, help="address-space cap per batch worker")
+    parser.add_argument("--cache-dir",
+                        help="incremental build cache; reports whose inputs are unchanged are not re-rendered")
+    parser.add_argument("--build-date", metavar="YYYY-MM-DD",
+                        help="date stamped in the footer (default: SOURCE_DATE_EPOCH, else today)")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="byte-identical output: pinned build date, fixed document IDs and metadata dates")
+    parser.add_argument("--history", metavar="DB",
+                        help="audit history database (geo_history.py) for the score trend and roadmap")
+    parser.add_argument("--site", help="site URL of the single report in --history")
+    parser.add_argument("--trace", metavar="DIR",
+                        help="write a per-section / per-flowable timing trace of each report rendered to DIR")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="profile each report rendered: DIR/<name>.pstats plus collapsed flamegraph stacks")
+    args = parser.parse_args()
+    if args.trace:
+        os.environ[TRACE_ENV] = os.path.abspath(args.trace)
+    if args.profile:
+        os.environ[PROFILE_ENV] = os.path.abspath(args.profile)
+    try:
+        configure_build(resolve_build_date(args.build_date, args.deterministic), args.deterministic)
+    except ValueError as exc:
+        parser.error(str(exc))
+    cache = BuildCache(args.cache_dir) if args.cache_dir else None
+    history = AuditHistory(args.history) if args.history else None
+
+    if not args.batch:
+        result = args.output
+        audit = PARAGON_AUDIT if not args.site else dict(PARAGON_AUDIT, site=args.site)
+        audit = attach_history(audit, history)
+        key = report_key(audit) if cache is not None else None
+        out_dir = os.path.dirname(result) or "."
+        if cache is None or not cache.fetch(key, out_dir, name=os.path.basename(result)):
+            name = os.path.splitext(os.path.basename(result))[0]
+            with trace_document(name), profile_document(name):
+                generate_report(result, audit)
+            if cache is not None:
+                cache.store(key, result)
+                cache.save()
+        file_size = os.path.getsize(result)
+        print(f"PDF generated: {result} ({file_size:,} bytes / {file_size/1024:.0f} KB)")
+        return
+
+    summary = generate_batch(args.batch, args.output_dir, jobs=args.jobs,
+                             max_tasks_per_child=args.max_tasks_per_child,
+                             max_memory_mb=args.max_memory_mb, cache=cache, history=history)
+    total = len(summary["rendered"]) + len(summary["failures"])
+    print(f"Rendered {len(summary['rendered'])}/{total} reports to {args.output_dir}/ "
+          f"in {summary['seconds']:.1f}s ({summary['reports_per_sec']:.1f} reports/sec)")
+    if cache is not None:
+        print(f"  {summary['cached']} served from cache ({args.cache_dir})")
+    for row_num, client, error in summary["failures"]:
+        print(f"  FAILED row {row_num} ({client}): {error}")
+    if summary["failures"]:
+        sys.exit(1)
+
+
 if __name__ == "__main__":
-    output = sys.argv[1] if len(sys.argv) > 1 else "docs/audit/GEO-Comparison-Wix-vs-NextJS.pdf"
-    result = generate_report(output)
-    file_size = os.path.getsize(result)
-    print(f"PDF generated: {result} ({file_size:,} bytes / {file_size/1024:.0f} KB)")
+    main()
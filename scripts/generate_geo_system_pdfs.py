@@ -4,7 +4,9 @@ GEO System PDF Suite Generator
 Generates 4 professional PDFs documenting the complete GEO system.
 
 Usage:
-    python3 generate_geo_system_pdfs.py [output_dir]
+    python3 generate_geo_system_pdfs.py [output_dir] [--jobs N] [--cache-dir DIR]
+                                        [--deterministic --build-date YYYY-MM-DD] [--chapters]
+                                        [--trace DIR] [--profile DIR]
 
 Outputs:
     1. GEO-System-Overview.pdf       (8-10 pages)
@@ -13,8 +15,14 @@ Outputs:
     4. GEO-Technical-Reference.pdf   (20-25 pages)
 """
 
-import sys
+import argparse
+import itertools
 import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 from reportlab.lib.pagesizes import letter
@@ -23,7 +31,7 @@ from reportlab.lib.colors import HexColor, white, lightgrey, black, Color
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    Paragraph, Spacer, Table, TableStyle,
     PageBreak, HRFlowable, KeepTogether, CondPageBreak,
 )
 from reportlab.graphics.shapes import (
@@ -31,6 +39,17 @@ from reportlab.graphics.shapes import (
 )
 from reportlab.graphics.charts.barcharts import VerticalBarChart
 
+from geo_appendix_table import AppendixTable
+from geo_build_cache import BuildCache, input_key, module_digest, project_digest, source_digest
+from geo_chapters import chapter_start_pages, chapter_title, join_chapters, merge_chapters
+from geo_deterministic import apply_pdf_invariance, resolve_build_date
+from geo_drawing_cache import form_cached
+from geo_scoring import CASE_STUDY_CATEGORIES, CATEGORY_WEIGHTS, formula_text, score_comparison
+from geo_streaming import StreamingDocTemplate
+from geo_toc import MAX_PASSES, build_with_toc, record_headings, toc_map_path
+from geo_profile import PROFILE_ENV, profile_document
+from geo_trace import TRACE_ENV, section_mark, trace_document
+
 # ============================================================
 # COLOR PALETTE
 # ============================================================
@@ -58,6 +77,22 @@ USABLE_W = PAGE_W - 100
 
 DATE_STR = datetime.now().strftime("%B %Y")
 YEAR = datetime.now().strftime("%Y")
+DETERMINISTIC = False
+BUILD_SETTINGS = (None, False)  # last configure_build() arguments, forwarded to chapter workers
+
+
+def configure_build(build_date=None, deterministic=False):
+    """Pin the date stamped on covers and footers (default: today) and, in
+    deterministic mode, fix the PDF metadata so rebuilds are byte-identical.
+    Must run in each worker process before rendering."""
+    global DATE_STR, YEAR, DETERMINISTIC, BUILD_SETTINGS
+    BUILD_SETTINGS = (build_date, deterministic)
+    if build_date is not None:
+        DATE_STR = build_date.strftime("%B %Y")
+        YEAR = build_date.strftime("%Y")
+    if deterministic:
+        apply_pdf_invariance(build_date)
+    DETERMINISTIC = deterministic
 
 
 def score_color(score):
@@ -67,14 +102,6 @@ def score_color(score):
     return DANGER
 
 
-def score_label(score):
-    if score >= 90: return "Excellent"
-    if score >= 75: return "Good"
-    if score >= 60: return "Fair"
-    if score >= 40: return "Poor"
-    return "Critical"
-
-
 # ============================================================
 # SHARED STYLES
 # ============================================================
@@ -139,6 +166,10 @@ def build_styles():
             'CoverMeta', fontName='Helvetica', fontSize=10,
             textColor=TEXT_SECONDARY, spaceBefore=2, spaceAfter=2,
         ),
+        'TocPage': ParagraphStyle(
+            'TocPage', fontName='Helvetica', fontSize=10,
+            textColor=TEXT_PRIMARY, leading=14, alignment=TA_RIGHT,
+        ),
     }
 
 
@@ -259,10 +290,28 @@ def create_big_stat_row(stats, width=460):
     return d
 
 
+@form_cached
+def create_before_after_visual(before, after, improvement_label):
+    """Two score rings joined by an arrow, as used in the sales-deck case study."""
+    d = Drawing(USABLE_W, 130)
+    # Before ring
+    d.add(create_score_ring(before, "BEFORE", DANGER, 100, 75, r=42))
+    # Arrow
+    ax = USABLE_W / 2
+    d.add(Rect(ax - 30, 68, 60, 12, fillColor=SUCCESS, strokeColor=None))
+    d.add(Polygon([ax + 30, 55, ax + 30, 93, ax + 55, 74],
+                   fillColor=SUCCESS, strokeColor=None))
+    d.add(String(ax, 48, improvement_label, fontSize=10,
+                 fontName='Helvetica-Bold', fillColor=SUCCESS, textAnchor='middle'))
+    # After ring
+    d.add(create_score_ring(after, "AFTER (Phase 1)", INFO, USABLE_W - 100, 75, r=42))
+    return d
+
+
 # ============================================================
 # HEADER / FOOTER FACTORY
 # ============================================================
-def make_header_footer(doc_title):
+def make_header_footer(doc_title, page_numbers=True):
     def header_footer(canvas, doc):
         canvas.saveState()
         canvas.setStrokeColor(ACCENT)
@@ -277,18 +326,25 @@ def make_header_footer(doc_title):
         canvas.setFont('Helvetica', 8)
         canvas.setFillColor(TEXT_SECONDARY)
         canvas.drawString(50, 28, DATE_STR)
-        canvas.drawRightString(PAGE_W - 50, 28, f"Page {doc.page}")
+        if page_numbers:
+            draw_page_number(canvas, doc.page)
         canvas.drawCentredString(PAGE_W / 2, 28, "Confidential")
         canvas.restoreState()
     return header_footer
 
 
-def build_doc(filename, doc_title):
-    doc = SimpleDocTemplate(
+def draw_page_number(canvas, page):
+    canvas.setFont('Helvetica', 8)
+    canvas.setFillColor(TEXT_SECONDARY)
+    canvas.drawRightString(PAGE_W - 50, 28, f"Page {page}")
+
+
+def build_doc(filename, doc_title, page_numbers=True):
+    doc = StreamingDocTemplate(
         filename, pagesize=letter,
         topMargin=55, bottomMargin=55, leftMargin=50, rightMargin=50,
     )
-    return doc, make_header_footer(doc_title)
+    return doc, make_header_footer(doc_title, page_numbers)
 
 
 # ============================================================
@@ -307,6 +363,7 @@ def build_cover(elements, styles, title, subtitle, meta_lines=None):
 
 
 def section(elements, styles, title):
+    section_mark(title)
     elements.append(Paragraph(title, styles['SectionHead']))
     elements.append(HRFlowable(width="100%", thickness=1, color=ACCENT, spaceAfter=12))
 
@@ -343,6 +400,95 @@ def page_break(elements):
     elements.append(PageBreak())
 
 
+def contents(elements, styles, entries):
+    """Contents list: plain section titles, or (title, page) pairs once the
+    page numbers are known (chapter-parallel builds)."""
+    if not entries or isinstance(entries[0], str):
+        for item in entries:
+            body(elements, styles, item)
+        return
+    rows = [[Paragraph(title, styles['Body']), Paragraph(str(page), styles['TocPage'])]
+            for title, page in entries]
+    t = Table(rows, colWidths=[USABLE_W - 60, 60])
+    t.setStyle(TableStyle([
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LINEBELOW', (0, 0), (-1, -1), 0.5, MEDIUM_BG),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+    ]))
+    elements.append(t)
+
+
+# ============================================================
+# STORY BUILDS (SERIAL OR CHAPTER-PARALLEL)
+# ============================================================
+def build_story_pdf(fname, doc_title, chapters_fn, pool=None):
+    """Render chapters_fn(styles) to fname with a paginated Contents page, in
+    one pass when the previous build's page map still holds. Given a process
+    pool, lay out each chapter in a worker and merge the results."""
+    if pool is not None:
+        return build_chaptered_pdf(fname, doc_title, chapters_fn, pool)
+
+    def render(contents_entries):
+        doc, hf = build_doc(fname, doc_title)
+        headings = record_headings(doc)
+        story = join_chapters(chapters_fn(build_styles(), contents_entries))
+        doc.build(story, onFirstPage=hf, onLaterPages=hf)
+        return headings
+
+    build_with_toc(render, toc_map_path(fname))
+    return fname
+
+
+def _render_chapter(chapters_fn, doc_title, index, part_path, contents_entries=None, settings=None):
+    """Lay out chapter `index` of chapters_fn on its own (footer without page
+    numbers) and return its page count. Runs in a pool worker; its trace
+    and profile are <document>/chapter-NN. Later chapters are never built."""
+    if settings is not None:
+        configure_build(*settings)
+    name = f"{CHAPTERED_NAMES[chapters_fn]}/chapter-{index:02d}"
+    with trace_document(name), profile_document(name):
+        flowables = next(itertools.islice(chapters_fn(build_styles(), contents_entries), index, None))
+        doc, hf = build_doc(part_path, doc_title, page_numbers=False)
+        doc.build(flowables, onFirstPage=hf, onLaterPages=hf)
+    return doc.page
+
+
+def build_chaptered_pdf(fname, doc_title, chapters_fn, pool):
+    """Chapter-parallel build of one long document.
+
+    Every chapter except Contents is laid out concurrently. Contents is then
+    rendered with real page numbers (re-rendered if its own length changes
+    the offsets, at most geo_toc.MAX_PASSES times), the chapters are merged
+    and "Page N" is stamped in the footer with the final numbering.
+    """
+    titles = [chapter_title(flowables) for flowables in chapters_fn(build_styles())]
+    toc_index = titles.index("Contents")
+    work_dir = tempfile.mkdtemp(prefix=".chapters-", dir=os.path.dirname(fname) or ".")
+    parts = [os.path.join(work_dir, f"chapter-{i:03d}.pdf") for i in range(len(titles))]
+    try:
+        futures = {i: pool.submit(_render_chapter, chapters_fn, doc_title, i, parts[i], None, BUILD_SETTINGS)
+                   for i in range(len(titles)) if i != toc_index}
+        section_mark("(chapter workers)")  # in a trace, the wait is not the last section's story time
+        pages = {i: f.result() for i, f in futures.items()}
+
+        pages[toc_index] = 1
+        for _ in range(MAX_PASSES):
+            starts = chapter_start_pages([pages[i] for i in range(len(titles))])
+            entries = [(titles[i], starts[i]) for i in range(toc_index + 1, len(titles))]
+            toc_pages = _render_chapter(chapters_fn, doc_title, toc_index, parts[toc_index], entries)
+            if toc_pages == pages[toc_index]:
+                break
+            pages[toc_index] = toc_pages
+        else:
+            raise RuntimeError(f"contents page count did not settle after {MAX_PASSES} passes")
+
+        merge_chapters(parts, fname, stamp=draw_page_number)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return fname
+
+
 # ============================================================
 # PDF 1: GEO SYSTEM OVERVIEW
 # ============================================================
@@ -417,15 +563,16 @@ def generate_overview(output_dir):
         "producing a composite score from 0-100:")
     spacer(el)
 
-    dims_data = [
-        ["Dimension", "Weight", "What It Measures"],
-        ["AI Citability", "25%", "How quotable and extractable content is for AI systems"],
-        ["Brand Authority", "20%", "Third-party mentions, entity recognition, review signals"],
-        ["Content E-E-A-T", "20%", "Experience, Expertise, Authoritativeness, Trustworthiness"],
-        ["Technical GEO", "15%", "AI crawler access, rendering, speed, llms.txt"],
-        ["Schema & Structured Data", "10%", "JSON-LD markup quality and completeness"],
-        ["Platform Optimization", "10%", "Presence on platforms AI models cite from"],
+    measures = [
+        "How quotable and extractable content is for AI systems",
+        "Third-party mentions, entity recognition, review signals",
+        "Experience, Expertise, Authoritativeness, Trustworthiness",
+        "AI crawler access, rendering, speed, llms.txt",
+        "JSON-LD markup quality and completeness",
+        "Presence on platforms AI models cite from",
     ]
+    dims_data = [["Dimension", "Weight", "What It Measures"]]
+    dims_data += [[name, f"{weight}%", text] for (name, weight, _), text in zip(CATEGORY_WEIGHTS, measures)]
     t = Table(dims_data, colWidths=[130, 50, 280])
     t.setStyle(make_table_style(ACCENT))
     el.append(t)
@@ -578,10 +725,7 @@ def generate_sales_deck(output_dir):
         "signals that AI platforms use to select sources.")
     spacer(el)
 
-    dims = [
-        ("AI Citability", 25), ("Brand Authority", 20), ("Content E-E-A-T", 20),
-        ("Technical GEO", 15), ("Schema", 10), ("Platform Optimization", 10),
-    ]
+    dims = [(name.replace(" & Structured Data", ""), weight) for name, weight, _ in CATEGORY_WEIGHTS]
     el.append(create_horizontal_bars([(d[0], d[1] * 4) for d in dims]))
     spacer(el)
     body(el, styles,
@@ -597,24 +741,14 @@ def generate_sales_deck(output_dir):
     spacer(el)
 
     # Before/After visual
-    d = Drawing(USABLE_W, 130)
-    # Before ring
-    d.add(create_score_ring(35, "BEFORE", DANGER, 100, 75, r=42))
-    # Arrow
-    ax = USABLE_W / 2
-    d.add(Rect(ax - 30, 68, 60, 12, fillColor=SUCCESS, strokeColor=None))
-    d.add(Polygon([ax + 30, 55, ax + 30, 93, ax + 55, 74],
-                   fillColor=SUCCESS, strokeColor=None))
-    d.add(String(ax, 48, "+91% improvement", fontSize=10,
-                 fontName='Helvetica-Bold', fillColor=SUCCESS, textAnchor='middle'))
-    # After ring
-    d.add(create_score_ring(67, "AFTER (Phase 1)", INFO, USABLE_W - 100, 75, r=42))
-    el.append(d)
+    case = score_comparison(CASE_STUDY_CATEGORIES)
+    before, after = case["before_composite"], case["after_composite"]
+    el.append(create_before_after_visual(before, after, f"+{case['pct_improvement']}% improvement"))
     spacer(el)
 
     case_data = [
         ["Metric", "Before (Wix)", "After (GEO)", "Change"],
-        ["GEO Composite Score", "35/100", "67/100", "+91%"],
+        ["GEO Composite Score", f"{before}/100", f"{after}/100", f"+{case['pct_improvement']}%"],
         ["Schema Types", "0", "7", "+7 types"],
         ["AI Crawler Access", "0 of 9", "9 of 9", "Full access"],
         ["Blog/Educational Content", "None", "3 articles", "New"],
@@ -703,10 +837,8 @@ def generate_sales_deck(output_dir):
 # ============================================================
 # PDF 3: GEO METHODOLOGY GUIDE
 # ============================================================
-def generate_methodology(output_dir):
-    fname = os.path.join(output_dir, "GEO-Methodology-Guide.pdf")
-    doc, hf = build_doc(fname, "GEO Methodology Guide")
-    styles = build_styles()
+def methodology_chapters(styles, contents_entries=None):
+    """The Methodology Guide, yielded one chapter's flowables at a time."""
     el = []
 
     # Cover
@@ -715,7 +847,8 @@ def generate_methodology(output_dir):
         f"Version 1.0  |  {DATE_STR}",
         "For clients, partners, and technical practitioners",
     ])
-    page_break(el)
+    yield el
+    el = []
 
     # TOC
     section(el, styles, "Contents")
@@ -732,9 +865,9 @@ def generate_methodology(output_dir):
         "10. Content Strategy for Citations",
         "11. Measurement & Tools",
     ]
-    for item in toc:
-        body(el, styles, item)
-    page_break(el)
+    contents(el, styles, contents_entries or toc)
+    yield el
+    el = []
 
     # 1. Audit Workflow
     section(el, styles, "1. Audit Workflow Overview")
@@ -773,10 +906,9 @@ def generate_methodology(output_dir):
     body(el, styles,
         "The composite GEO score is computed as a weighted average:")
     spacer(el)
-    callout(el, styles,
-        "<b>GEO Score</b> = (Citability x 0.25) + (Brand x 0.20) + (E-E-A-T x 0.20) "
-        "+ (Technical x 0.15) + (Schema x 0.10) + (Platform x 0.10)")
-    page_break(el)
+    callout(el, styles, formula_text())
+    yield el
+    el = []
 
     # 2. AI Citability
     section(el, styles, "2. AI Citability Analysis (25%)")
@@ -800,7 +932,8 @@ def generate_methodology(output_dir):
     bullet(el, styles, "Include TL;DR statements so sections stand alone as answers")
     bullet(el, styles, "Use precise statistics: \"15%\" beats \"about 15%\"")
     bullet(el, styles, "Original/proprietary data is the <b>#1 citation magnet</b>")
-    page_break(el)
+    yield el
+    el = []
 
     # 3. Brand Authority
     section(el, styles, "3. Brand Authority Assessment (20%)")
@@ -824,7 +957,8 @@ def generate_methodology(output_dir):
         "AI engines favor <b>earned media</b> (third-party coverage, reviews, industry mentions) "
         "over brand-owned content. A mention in a Reddit thread or YouTube review carries more "
         "citation weight than a page on your own website.")
-    page_break(el)
+    yield el
+    el = []
 
     # 4. Content E-E-A-T
     section(el, styles, "4. Content E-E-A-T Evaluation (20%)")
@@ -850,7 +984,8 @@ def generate_methodology(output_dir):
         "Named experts with structured author bios and Person schema are significantly "
         "more likely to be cited. Anonymous content underperforms. Every piece of "
         "educational content should have a named, credentialed author.")
-    page_break(el)
+    yield el
+    el = []
 
     # 5. Technical GEO
     section(el, styles, "5. Technical GEO Infrastructure (15%)")
@@ -889,7 +1024,8 @@ def generate_methodology(output_dir):
     bullet(el, styles, "Sub-3-second page load time")
     bullet(el, styles, "Valid canonical URLs and no duplicate content")
     bullet(el, styles, "IndexNow protocol for Bing/Copilot indexing speed")
-    page_break(el)
+    yield el
+    el = []
 
     # 6. Schema
     section(el, styles, "6. Schema & Structured Data (10%)")
@@ -921,7 +1057,8 @@ def generate_methodology(output_dir):
         "Schema contributes approximately <b>10% of Perplexity's ranking factors</b> (Qwairy). "
         "While the direct weight is moderate, schema enables AI systems to understand "
         "entity relationships that influence all other dimensions.")
-    page_break(el)
+    yield el
+    el = []
 
     # 7. Platform Optimization
     section(el, styles, "7. Platform Optimization (10%)")
@@ -940,7 +1077,8 @@ def generate_methodology(output_dir):
     for name, desc in platforms:
         sub2(el, styles, name)
         body(el, styles, desc)
-    page_break(el)
+    yield el
+    el = []
 
     # 8. Platform-Specific Strategies
     section(el, styles, "8. Platform-Specific Strategies")
@@ -964,7 +1102,8 @@ def generate_methodology(output_dir):
     bullet(el, styles, "Balanced mix of social and professional signals")
     bullet(el, styles, "YouTube is #2 cited source (18.8% of top 10)")
     bullet(el, styles, "Schema markup directly influences content understanding")
-    page_break(el)
+    yield el
+    el = []
 
     # 9. E-E-A-T Revolution
     section(el, styles, "9. The E-E-A-T Revolution")
@@ -991,7 +1130,8 @@ def generate_methodology(output_dir):
         "<b>Critical insight:</b> Pages ranking #6-10 with strong E-E-A-T get cited "
         "<b>2.3x more often</b> than #1 pages with weak authority. You do not need to "
         "outrank the competition; you need to out-trust them.")
-    page_break(el)
+    yield el
+    el = []
 
     # 10. Content Strategy
     section(el, styles, "10. Content Strategy for AI Citations")
@@ -1016,7 +1156,8 @@ def generate_methodology(output_dir):
     bullet(el, styles, "Include FAQ sections on every page")
     bullet(el, styles, "\"Last updated\" timestamps for freshness signals")
     bullet(el, styles, "Topic clusters with interlinking (30% higher citation rates)")
-    page_break(el)
+    yield el
+    el = []
 
     # 11. Measurement
     section(el, styles, "11. Measurement & Tools")
@@ -1046,17 +1187,19 @@ def generate_methodology(output_dir):
     bullet(el, styles, "<b>AI-referred traffic:</b> Sessions from AI platforms (track in GA4)")
     bullet(el, styles, "<b>Entity recognition:</b> Whether AI correctly identifies your brand and attributes")
 
-    doc.build(el, onFirstPage=hf, onLaterPages=hf)
-    return fname
+    yield el
+
+
+def generate_methodology(output_dir, pool=None):
+    fname = os.path.join(output_dir, "GEO-Methodology-Guide.pdf")
+    return build_story_pdf(fname, "GEO Methodology Guide", methodology_chapters, pool)
 
 
 # ============================================================
 # PDF 4: GEO TECHNICAL REFERENCE
 # ============================================================
-def generate_technical_reference(output_dir):
-    fname = os.path.join(output_dir, "GEO-Technical-Reference.pdf")
-    doc, hf = build_doc(fname, "GEO Technical Reference")
-    styles = build_styles()
+def technical_reference_chapters(styles, contents_entries=None):
+    """The Technical Reference, yielded one chapter's flowables at a time."""
     el = []
 
     # Cover
@@ -1066,7 +1209,8 @@ def generate_technical_reference(output_dir):
         "Internal technical documentation",
         "Based on 14 primary research sources",
     ])
-    page_break(el)
+    yield el
+    el = []
 
     # TOC
     section(el, styles, "Contents")
@@ -1084,9 +1228,9 @@ def generate_technical_reference(output_dir):
         "11. Investment Benchmarks",
         "12. Research Sources",
     ]
-    for item in toc:
-        body(el, styles, item)
-    page_break(el)
+    contents(el, styles, contents_entries or toc)
+    yield el
+    el = []
 
     # 1. System Architecture
     section(el, styles, "1. System Architecture")
@@ -1117,27 +1261,27 @@ def generate_technical_reference(output_dir):
         "4. Orchestrator computes weighted composite score<br/>"
         "5. Issues classified by severity (Critical/High/Medium/Low)<br/>"
         "6. Report generated with scores, findings, and prioritized action plan")
-    page_break(el)
+    yield el
+    el = []
 
     # 2. Scoring Formulas
     section(el, styles, "2. Scoring Formulas & Weights")
 
     subsection(el, styles, "Composite Score Formula")
-    callout(el, styles,
-        "<b>GEO_Score</b> = (Citability x 0.25) + (Brand x 0.20) + (EEAT x 0.20) "
-        "+ (Technical x 0.15) + (Schema x 0.10) + (Platform x 0.10)")
+    callout(el, styles, formula_text("GEO_Score"))
     spacer(el)
 
     subsection(el, styles, "Weight Rationale")
-    weight_data = [
-        ["Dimension", "Weight", "Rationale"],
-        ["AI Citability", "25%", "Citation is the fundamental output. Content that cannot be cited fails at GEO regardless of other signals."],
-        ["Brand Authority", "20%", "Entity recognition determines whether AI trusts a source enough to cite. High-E-E-A-T at #6-10 beats weak #1 (2.3x)."],
-        ["Content E-E-A-T", "20%", "Quality signals (author credentials, verifiable claims, depth) are the gatekeeper for citation selection."],
-        ["Technical GEO", "15%", "Crawler access is a prerequisite. If AI cannot crawl, nothing else matters. But once accessible, diminishing returns."],
-        ["Schema", "10%", "Schema contributes ~10% of Perplexity ranking. Critical but enables understanding rather than directly driving citations."],
-        ["Platform", "10%", "Off-site presence matters (48% of citations from community platforms) but is slower to influence."],
+    rationale = [
+        ("AI Citability", "Citation is the fundamental output. Content that cannot be cited fails at GEO regardless of other signals."),
+        ("Brand Authority", "Entity recognition determines whether AI trusts a source enough to cite. High-E-E-A-T at #6-10 beats weak #1 (2.3x)."),
+        ("Content E-E-A-T", "Quality signals (author credentials, verifiable claims, depth) are the gatekeeper for citation selection."),
+        ("Technical GEO", "Crawler access is a prerequisite. If AI cannot crawl, nothing else matters. But once accessible, diminishing returns."),
+        ("Schema", "Schema contributes ~10% of Perplexity ranking. Critical but enables understanding rather than directly driving citations."),
+        ("Platform", "Off-site presence matters (48% of citations from community platforms) but is slower to influence."),
     ]
+    weight_data = [["Dimension", "Weight", "Rationale"]]
+    weight_data += [[label, f"{weight}%", text] for (label, text), (_, weight, _) in zip(rationale, CATEGORY_WEIGHTS)]
     t = Table(weight_data, colWidths=[90, 45, 325])
     t.setStyle(make_table_style(ACCENT))
     el.append(t)
@@ -1161,7 +1305,8 @@ def generate_technical_reference(output_dir):
     ts.add('TEXTCOLOR', (1, 5), (1, 5), DANGER)
     t.setStyle(ts)
     el.append(t)
-    page_break(el)
+    yield el
+    el = []
 
     # 3. Audit Module Specs
     section(el, styles, "3. Audit Module Specifications")
@@ -1219,7 +1364,8 @@ def generate_technical_reference(output_dir):
         for item in items:
             bullet(el, styles, item)
         spacer(el)
-    page_break(el)
+    yield el
+    el = []
 
     # 4. Issue Severity
     section(el, styles, "4. Issue Severity Classification")
@@ -1243,7 +1389,8 @@ def generate_technical_reference(output_dir):
     ts.add('FONTNAME', (0, 4), (0, 4), 'Helvetica-Bold')
     t.setStyle(ts)
     el.append(t)
-    page_break(el)
+    yield el
+    el = []
 
     # 5. Business Type Detection
     section(el, styles, "5. Business Type Detection")
@@ -1263,7 +1410,8 @@ def generate_technical_reference(output_dir):
     t = Table(btype_data, colWidths=[65, 130, 130, 135])
     t.setStyle(make_table_style())
     el.append(t)
-    page_break(el)
+    yield el
+    el = []
 
     # 6. Citation Statistics
     section(el, styles, "6. Citation Statistics Database")
@@ -1296,10 +1444,9 @@ def generate_technical_reference(output_dir):
         ["Consumers using review-responsive biz", "88%", "HubSpot", "Medium"],
         ["Brands without GEO strategy", "47%", "Foundation Inc", "Medium"],
     ]
-    t = Table(stats, colWidths=[200, 60, 100, 70])
-    t.setStyle(make_table_style())
-    el.append(t)
-    page_break(el)
+    el.append(AppendixTable(stats[0], stats[1:], colWidths=[200, 60, 100, 70], style=make_table_style))
+    yield el
+    el = []
 
     # 7. Platform Citation Behavior
     section(el, styles, "7. Platform Citation Behavior (Detailed)")
@@ -1347,7 +1494,8 @@ def generate_technical_reference(output_dir):
     t = Table(gaio_data, colWidths=[150, 310])
     t.setStyle(make_accent_table_style())
     el.append(t)
-    page_break(el)
+    yield el
+    el = []
 
     # 8. Schema Implementation
     section(el, styles, "8. Schema Implementation Guide")
@@ -1375,7 +1523,8 @@ def generate_technical_reference(output_dir):
     t = Table(schema_ref, colWidths=[100, 200, 160])
     t.setStyle(make_table_style())
     el.append(t)
-    page_break(el)
+    yield el
+    el = []
 
     # 9. Local Business Playbook
     section(el, styles, "9. Local Business GEO Playbook")
@@ -1408,7 +1557,8 @@ def generate_technical_reference(output_dir):
         "<b>Timeline expectations:</b> Initial traction in 4-8 weeks. Foundation work (schema, "
         "content) in 4-8 weeks. Authority building (cross-platform) in 3-6 months. "
         "Measurable citation improvements within 90 days.")
-    page_break(el)
+    yield el
+    el = []
 
     # 10. Strategic Shifts
     section(el, styles, "10. Strategic Shifts: SEO to GEO")
@@ -1428,7 +1578,8 @@ def generate_technical_reference(output_dir):
     t = Table(shifts_data, colWidths=[110, 130, 220])
     t.setStyle(make_accent_table_style())
     el.append(t)
-    page_break(el)
+    yield el
+    el = []
 
     # 11. Investment Benchmarks
     section(el, styles, "11. Investment Benchmarks")
@@ -1448,7 +1599,8 @@ def generate_technical_reference(output_dir):
     body(el, styles,
         "<i>47% of brands still lack a deliberate GEO strategy, creating a significant "
         "first-mover advantage for organizations that invest now.</i>")
-    page_break(el)
+    yield el
+    el = []
 
     # 12. Sources
     section(el, styles, "12. Research Sources")
@@ -1485,38 +1637,156 @@ def generate_technical_reference(output_dir):
         "research, and verified data sources. Statistics should be revalidated periodically "
         "as the AI search landscape evolves rapidly.</i>")
 
-    doc.build(el, onFirstPage=hf, onLaterPages=hf)
-    return fname
+    yield el
+
+
+def generate_technical_reference(output_dir, pool=None):
+    fname = os.path.join(output_dir, "GEO-Technical-Reference.pdf")
+    return build_story_pdf(fname, "GEO Technical Reference", technical_reference_chapters, pool)
 
 
 # ============================================================
 # MAIN
 # ============================================================
-def main():
-    output_dir = sys.argv[1] if len(sys.argv) > 1 else "."
-    os.makedirs(output_dir, exist_ok=True)
+SUITE = [
+    generate_overview,
+    generate_sales_deck,
+    generate_methodology,
+    generate_technical_reference,
+]
+
+# Long documents that can be laid out chapter-parallel, and their stories
+CHAPTERED = {
+    generate_methodology: methodology_chapters,
+    generate_technical_reference: technical_reference_chapters,
+}
+CHAPTERED_NAMES = {chapters_fn: g.__name__ for g, chapters_fn in CHAPTERED.items()}  # trace/profile names
+
+
+def _timed_build(generator, output_dir, build_date=None, deterministic=False):
+    """Run one suite generator and return (filename, seconds)."""
+    configure_build(build_date, deterministic)
+    start = time.perf_counter()
+    name = generator.__name__
+    with trace_document(name), profile_document(name):
+        fname = generator(output_dir)
+    return fname, time.perf_counter() - start
+
+
+def suite_key(generator, chapters=False):
+    """Build-cache key for one suite document: its generator (and story), the
+    shared helpers and palette, every project module they import, the style
+    definitions, the date stamped on every page and the build mode."""
+    module = sys.modules[generator.__module__]
+    story = [CHAPTERED[generator]] if generator in CHAPTERED else []
+    orchestration = [main, build_suite, suite_key, _timed_build]
+    return input_key(
+        generator=source_digest(generator, *story),
+        shared=module_digest(module, exclude=SUITE + list(CHAPTERED.values()) + orchestration),
+        modules=project_digest(module),
+        styles=build_styles(),
+        date=DATE_STR,
+        deterministic=DETERMINISTIC,
+        chapters=chapters and generator in CHAPTERED,
+    )
 
-    print(f"Generating GEO System PDF Suite to: {output_dir}/")
-    print()
 
-    f1 = generate_overview(output_dir)
-    size1 = os.path.getsize(f1) / 1024
-    print(f"  1. {os.path.basename(f1):40s} {size1:6.0f} KB")
+def build_suite(output_dir, jobs=1, cache=None, build_date=None, deterministic=False, chapters=False):
+    """Render every PDF in SUITE, in suite order.
+
+    The generators share no state, so with jobs > 1 each one is rendered in
+    its own worker process. With chapters=True the long documents are instead
+    laid out chapter by chapter on the same pool (see build_chaptered_pdf).
+    With a BuildCache, documents whose inputs are unchanged are copied from
+    the cache and only the rest are rendered. build_date/deterministic are
+    forwarded to configure_build() in every worker.
+    Returns a list of (filename, seconds) tuples; seconds is None for cache hits.
+    """
+    configure_build(build_date, deterministic)
+    results = [None] * len(SUITE)
+    keys = {}
+    for i, g in enumerate(SUITE):
+        if cache is not None:
+            keys[i] = suite_key(g, chapters)
+            cached = cache.fetch(keys[i], output_dir)
+            if cached:
+                results[i] = (cached, None)
+    todo = [i for i, r in enumerate(results) if r is None]
+
+    chaptered = [i for i in todo if chapters and jobs > 1 and SUITE[i] in CHAPTERED]
+    if jobs <= 1 or (len(todo) <= 1 and not chaptered):
+        for i in todo:
+            results[i] = _timed_build(SUITE[i], output_dir, build_date, deterministic)
+    else:
+        workers = jobs if chaptered else min(jobs, len(todo))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {i: pool.submit(_timed_build, SUITE[i], output_dir, build_date, deterministic)
+                       for i in todo if i not in chaptered}
+            for i in chaptered:
+                start = time.perf_counter()
+                name = SUITE[i].__name__  # the workers' chapters go under name/
+                with trace_document(name), profile_document(name):
+                    fname = SUITE[i](output_dir, pool=pool)
+                results[i] = (fname, time.perf_counter() - start)
+            for i, f in futures.items():
+                results[i] = f.result()
+
+    if cache is not None and todo:
+        for i in todo:
+            cache.store(keys[i], results[i][0])
+        cache.save()
+    return results
 
-    f2 = generate_sales_deck(output_dir)
-    size2 = os.path.getsize(f2) / 1024
-    print(f"  2. {os.path.basename(f2):40s} {size2:6.0f} KB")
 
-    f3 = generate_methodology(output_dir)
-    size3 = os.path.getsize(f3) / 1024
-    print(f"  3. {os.path.basename(f3):40s} {size3:6.0f} KB")
+def main():
+    parser = argparse.ArgumentParser(description="Generate the GEO System PDF suite.")
+    parser.add_argument("output_dir", nargs="?", default=".")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="worker processes to render with (default: number of cores)")
+    parser.add_argument("--cache-dir",
+                        help="incremental build cache; only documents whose inputs changed are re-rendered")
+    parser.add_argument("--build-date", metavar="YYYY-MM-DD",
+                        help="date stamped on covers and footers (default: SOURCE_DATE_EPOCH, else today)")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="byte-identical output: pinned build date, fixed document IDs and metadata dates")
+    parser.add_argument("--chapters", action="store_true",
+                        help="lay out the long documents chapter-parallel (needs pypdf and --jobs > 1)")
+    parser.add_argument("--trace", metavar="DIR",
+                        help="write a per-section / per-flowable timing trace of each document rendered to DIR")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="profile each document rendered: DIR/<name>.pstats plus collapsed flamegraph stacks")
+    args = parser.parse_args()
+    if args.trace:
+        os.environ[TRACE_ENV] = os.path.abspath(args.trace)
+    if args.profile:
+        os.environ[PROFILE_ENV] = os.path.abspath(args.profile)
+    try:
+        build_date = resolve_build_date(args.build_date, args.deterministic)
+    except ValueError as exc:
+        parser.error(str(exc))
+    output_dir = args.output_dir
+    os.makedirs(output_dir, exist_ok=True)
 
-    f4 = generate_technical_reference(output_dir)
-    size4 = os.path.getsize(f4) / 1024
-    print(f"  4. {os.path.basename(f4):40s} {size4:6.0f} KB")
+    print(f"Generating GEO System PDF Suite to: {output_dir}/")
+    print()
 
-    total = size1 + size2 + size3 + size4
-    print(f"\n  Total: {total:.0f} KB across 4 PDFs")
+    start = time.perf_counter()
+    cache = BuildCache(args.cache_dir) if args.cache_dir else None
+    results = build_suite(output_dir, jobs=args.jobs, cache=cache,
+                          build_date=build_date, deterministic=args.deterministic,
+                          chapters=args.chapters)
+    wall = time.perf_counter() - start
+
+    total = 0
+    for i, (fname, seconds) in enumerate(results, 1):
+        size = os.path.getsize(fname) / 1024
+        total += size
+        timing = "cached" if seconds is None else f"{seconds:6.2f}s"
+        print(f"  {i}. {os.path.basename(fname):40s} {size:6.0f} KB  {timing}")
+
+    print(f"\n  Total: {total:.0f} KB across {len(results)} PDFs in {wall:.2f}s (jobs={args.jobs})")
+    if cache is not None:
+        print(f"  Cache: {cache.hits} reused, {cache.misses} rendered ({args.cache_dir})")
     print("\nDone.")
 
 
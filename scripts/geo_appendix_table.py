@@ -0,0 +1,107 @@
+"""
+Streamed Appendix Tables for very long listings (page inventories, URL
+audits, statistics databases).
+
+A plain Table needs every row up front and measures all of them before it
+can split. AppendixTable pulls rows lazily from any iterable, measures them
+in small batches, and only ever holds the rows for the page being laid out
+plus one batch of lookahead. Each page gets its own Table chunk with the
+header row repeated, styled by the same make_table_style() factory (and
+optional geo_table_rules rules) as the rest of the report.
+
+Pair it with StreamingDocTemplate (geo_streaming) so the finished pages
+are flushed to disk as well.
+"""
+
+from itertools import islice
+
+from reportlab.platypus import Flowable, Table, TableStyle
+
+from geo_table_rules import apply_rules
+
+BATCH_ROWS = 64
+
+
+class AppendixTable(Flowable):
+    """Flowable table over an iterator of rows, split page by page.
+
+    style: zero-argument factory returning a fresh TableStyle, e.g.
+        make_table_style or functools.partial(make_table_style, header_color=...)
+    rules: optional rules(rows) -> [ColumnRule, ...] for the body rows of one
+        chunk (row numbers start at 1, below the header)
+    """
+
+    def __init__(self, header, rows, colWidths, style=None, rules=None, batch=BATCH_ROWS):
+        Flowable.__init__(self)
+        self.header = header
+        self.colWidths = colWidths
+        self.style = style
+        self.rules = rules
+        self.batch = batch
+        self.hAlign = 'CENTER'  # as Table
+        self._rows = iter(rows)
+        self._buffer = []       # rows pulled but not yet placed on a page
+        self._heights = []      # their measured heights
+        self._header_h = None
+        self._exhausted = False
+        self._final = None
+
+    def _table(self, rows):
+        t = Table([self.header] + rows, colWidths=self.colWidths, repeatRows=1)
+        ts = self.style() if self.style else TableStyle([])
+        if self.rules:
+            apply_rules(ts, self.rules(rows))
+        t.setStyle(ts)
+        return t
+
+    def _measure(self, availWidth, availHeight):
+        """Buffer rows until they overflow availHeight or run out, and return
+        how many of the buffered rows fit under a header."""
+        used = (self._header_h or 0) + sum(self._heights)
+        while not self._exhausted and (self._header_h is None or used <= availHeight):
+            batch = list(islice(self._rows, self.batch))
+            if not batch:
+                self._exhausted = True
+                break
+            t = self._table(batch)
+            t.wrap(availWidth, availHeight)
+            if self._header_h is None:
+                self._header_h = t._rowHeights[0]
+                used += self._header_h
+            self._heights.extend(t._rowHeights[1:])
+            self._buffer.extend(batch)
+            used += sum(t._rowHeights[1:])
+
+        fit, used = 0, self._header_h or 0
+        for h in self._heights:
+            if used + h > availHeight:
+                break
+            used += h
+            fit += 1
+        return fit
+
+    def wrap(self, availWidth, availHeight):
+        width = sum(self.colWidths)
+        fit = self._measure(availWidth, availHeight)
+        if self._exhausted and fit == len(self._buffer):
+            self._final = self._table(self._buffer)
+            return self._final.wrap(availWidth, availHeight)
+        self._final = None
+        return width, availHeight + 1  # more rows than fit: ask to be split
+
+    def split(self, availWidth, availHeight):
+        fit = self._measure(availWidth, availHeight)
+        if fit == 0:
+            return []
+        head = self._table(self._buffer[:fit])
+        if self._exhausted and fit == len(self._buffer):
+            return [head]
+        rest = AppendixTable(self.header, self._rows, self.colWidths, self.style, self.rules, self.batch)
+        rest._buffer = self._buffer[fit:]
+        rest._heights = self._heights[fit:]
+        rest._header_h = self._header_h
+        rest._exhausted = self._exhausted
+        return [head, rest]
+
+    def draw(self):
+        self._final.drawOn(self.canv, 0, 0)
@@ -0,0 +1,474 @@
+#!/home/claude-runner/.claude/skills/geo/venv/bin/python3
+"""
+GEO Page Archive — compressed, content-addressed storage of crawled bodies.
+
+Every response body a crawl receives (pages, robots.txt, sitemaps,
+llms.txt) is stored once under the SHA-256 of its bytes, so a page that
+has not changed between weekly crawls, or a template shared by many
+sites, costs one object. Each fetch adds a small reference row (site,
+URL, time, status, content type, digest), so any past crawl can be
+replayed offline: geo_crawler --replay serves every request from the
+archive instead of the network, through the same crawl code.
+
+Bodies are compressed with zstandard when it is installed (pip install
+zstandard) and with zlib otherwise. Pages of one site share most of their
+markup, so once a site has TRAIN_SAMPLES bodies a dictionary is trained
+from them (zstd's trainer; for zlib, the lines most of the samples share,
+as a 32 KB preset dictionary) and used for all of that site's later
+objects, the samples included. The archive keeps under a disk budget by
+evicting least recently used objects (a read or re-store counts as a use)
+down to LOW_WATER of the budget.
+
+Layout:
+    <archive_dir>/index.db                  SQLite (WAL): objects, refs, dictionaries
+    <archive_dir>/objects/ab/abcdef....     compressed bodies
+    <archive_dir>/objects/ab/abcdef....d3   compressed with dictionary 3
+
+Usage:
+    python3 geo_archive.py DIR stats
+    python3 geo_archive.py DIR get URL [--at YYYY-MM-DD] [-o body.html]
+    python3 geo_archive.py DIR snapshot SITE [--at YYYY-MM-DD]
+    python3 geo_archive.py DIR evict --budget-mb 500
+"""
+
+import argparse
+import collections
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+import zlib
+from urllib.parse import urlsplit
+
+from geo_http_cache import normalize_url
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_BUDGET_MB = 1024
+LOW_WATER = 0.9            # eviction stops at this share of the budget
+TRAIN_SAMPLES = 16         # bodies of one site before its dictionary is trained
+DICT_SIZE = 32 * 1024      # zlib's preset dictionary window; also used for zstd
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    dict_id INTEGER,
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS objects_by_use ON objects (last_used);
+CREATE TABLE IF NOT EXISTS refs (
+    site TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    final_url TEXT,
+    status INTEGER,
+    content_type TEXT,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (url, fetched_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS refs_by_site ON refs (site, fetched_at);
+CREATE INDEX IF NOT EXISTS refs_by_digest ON refs (digest);
+CREATE TABLE IF NOT EXISTS dictionaries (
+    id INTEGER PRIMARY KEY,
+    site TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    UNIQUE (site, codec)
+);
+"""
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def site_of(url):
+    """The site a URL belongs to: scheme and host, "www." folded."""
+    parts = urlsplit(normalize_url(url))
+    return f"{parts.scheme}://{parts.netloc.removeprefix('www.')}/"
+
+
+def archive_time(at):
+    """End of the given day ("YYYY-MM-DD") as epoch seconds; None: now."""
+    if at is None:
+        return time.time()
+    return time.mktime(time.strptime(str(at)[:10], "%Y-%m-%d")) + 86400
+
+
+# ============================================================
+# CODECS AND DICTIONARIES
+# ============================================================
+
+def default_codec():
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def compress(data, codec, zdict=None):
+    if codec == "zstd":
+        params = {"dict_data": zstandard.ZstdCompressionDict(zdict)} if zdict else {}
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL, **params).compress(data)
+    c = zlib.compressobj(ZLIB_LEVEL, zdict=zdict) if zdict else zlib.compressobj(ZLIB_LEVEL)
+    return c.compress(data) + c.flush()
+
+
+def decompress(data, codec, zdict=None):
+    if codec == "zstd":
+        if zstandard is None:
+            raise ArchiveError("object is zstd-compressed; pip install zstandard to read it")
+        params = {"dict_data": zstandard.ZstdCompressionDict(zdict)} if zdict else {}
+        return zstandard.ZstdDecompressor(**params).decompress(data)
+    d = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+    return d.decompress(data) + d.flush()
+
+
+def train_dictionary(samples, codec, size=DICT_SIZE):
+    """A compression dictionary from sample bodies, or None when the
+    samples share too little to be worth one."""
+    if codec == "zstd":
+        try:
+            return zstandard.train_dictionary(size, samples).as_bytes()
+        except zstandard.ZstdError:
+            return None
+    # zlib: the lines at least half the samples contain, most shared last
+    # (zlib reaches the end of a preset dictionary most cheaply)
+    seen = collections.Counter()
+    for body in samples:
+        seen.update({line.strip() for line in body.splitlines() if len(line.strip()) > 8})
+    shared = [line for line, n in seen.items() if n * 2 >= len(samples)]
+    shared.sort(key=lambda line: (seen[line], len(line)))
+    zdict = b"\n".join(shared)[-size:]
+    return zdict or None
+
+
+# ============================================================
+# ARCHIVE
+# ============================================================
+
+class PageArchive:
+    """Content-addressed body store with per-site dictionaries and an LRU
+    disk budget."""
+
+    def __init__(self, archive_dir, budget_mb=DEFAULT_BUDGET_MB, codec=None):
+        self.archive_dir = archive_dir
+        self.objects_dir = os.path.join(archive_dir, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.budget = int(budget_mb * 1024 * 1024)
+        self.codec = codec or default_codec()
+        self.db = sqlite3.connect(os.path.join(archive_dir, "index.db"), timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.executescript(SCHEMA)
+        self._clock = self.db.execute("SELECT COALESCE(MAX(last_used), 0) FROM objects").fetchone()[0]
+        self.stored_bytes = self.db.execute("SELECT COALESCE(SUM(stored_size), 0) FROM objects").fetchone()[0]
+        self._dicts = {}
+        self._superseded = []   # object files to remove once the open transaction commits
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def _object_path(self, digest, dict_id=None):
+        # Recompressing with a dictionary writes a new file next to the old one,
+        # so the old stays readable until the index stops pointing at it
+        name = digest if dict_id is None else f"{digest}.d{dict_id}"
+        return os.path.join(self.objects_dir, digest[:2], name)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """A self.db transaction that removes the object files it superseded
+        only after committing; a rollback leaves them, and the index rows
+        that still point at them, as they were."""
+        stored_bytes, self._superseded = self.stored_bytes, []
+        try:
+            with self.db:
+                yield
+        except BaseException:
+            self.stored_bytes = stored_bytes
+            raise
+        finally:
+            superseded, self._superseded = self._superseded, []
+        for path in superseded:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _write_object(self, digest, dict_id, data):
+        path = self._object_path(digest, dict_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _dictionary(self, dict_id):
+        if dict_id not in self._dicts:
+            row = self.db.execute("SELECT data FROM dictionaries WHERE id = ?", (dict_id,)).fetchone()
+            if row is None:
+                raise ArchiveError(f"dictionary {dict_id} missing from the archive index")
+            self._dicts[dict_id] = bytes(row[0])
+        return self._dicts[dict_id]
+
+    def _site_dictionary(self, site):
+        """(dict_id, bytes) of the site's dictionary for this codec, training
+        it once the site has enough bodies stored without one."""
+        row = self.db.execute("SELECT id FROM dictionaries WHERE site = ? AND codec = ?",
+                              (site, self.codec)).fetchone()
+        if row is not None:
+            return row[0], self._dictionary(row[0])
+        digests = [d for d, in self.db.execute(
+            "SELECT DISTINCT objects.digest FROM refs JOIN objects ON objects.digest = refs.digest"
+            " WHERE site = ? AND dict_id IS NULL AND codec = ?", (site, self.codec))]
+        if len(digests) < TRAIN_SAMPLES or len(digests) % TRAIN_SAMPLES:
+            return None, None  # (re)try at every TRAIN_SAMPLES-th body
+        samples = [self._read(d) for d in digests]
+        zdict = train_dictionary(samples, self.codec)
+        if zdict is None:
+            return None, None
+        dict_id = self.db.execute("INSERT INTO dictionaries (site, codec, data) VALUES (?, ?, ?)",
+                                  (site, self.codec, zdict)).lastrowid
+        self._dicts[dict_id] = zdict
+        for digest, raw in zip(digests, samples):  # the samples benefit too
+            self._store_object(digest, raw, dict_id, zdict)
+            self._superseded.append(self._object_path(digest))
+        return dict_id, zdict
+
+    def _store_object(self, digest, raw, dict_id, zdict):
+        data = compress(raw, self.codec, zdict)
+        old = self.db.execute("SELECT stored_size FROM objects WHERE digest = ?", (digest,)).fetchone()
+        self._write_object(digest, dict_id, data)
+        self.db.execute("INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?)",
+                        (digest, self.codec, dict_id, len(raw), len(data), self._tick()))
+        self.stored_bytes += len(data) - (old[0] if old else 0)
+
+    def _read(self, digest):
+        row = self.db.execute("SELECT codec, dict_id FROM objects WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            raise ArchiveError(f"object {digest[:12]} is not in the archive (evicted?)")
+        codec, dict_id = row
+        with open(self._object_path(digest, dict_id), "rb") as f:
+            data = f.read()
+        return decompress(data, codec, self._dictionary(dict_id) if dict_id is not None else None)
+
+    # -- writing ----------------------------------------------------------
+
+    def put(self, url, body, status=200, content_type=None, final_url=None, fetched_at=None):
+        """Archive one fetched body and reference it from `url` at
+        `fetched_at` (epoch seconds, default now). Returns its digest."""
+        digest = hashlib.sha256(body).hexdigest()
+        site = site_of(url)
+        with self._transaction():
+            if self.db.execute("SELECT 1 FROM objects WHERE digest = ?", (digest,)).fetchone():
+                self.db.execute("UPDATE objects SET last_used = ? WHERE digest = ?", (self._tick(), digest))
+            else:
+                dict_id, zdict = self._site_dictionary(site)
+                self._store_object(digest, body, dict_id, zdict)
+            self.db.execute("INSERT OR REPLACE INTO refs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (site, normalize_url(url), fetched_at or time.time(), final_url or url,
+                             status, content_type, digest))
+            if self.stored_bytes > self.budget:
+                self._evict()
+        return digest
+
+    def revisit(self, url, fetched_at=None):
+        """Reference the body last archived for `url` again (a 304 revalidation
+        downloads nothing new). False when there is nothing to reference."""
+        key = normalize_url(url)
+        row = self.db.execute("SELECT site, final_url, status, content_type, digest FROM refs"
+                              " WHERE url = ? ORDER BY fetched_at DESC LIMIT 1", (key,)).fetchone()
+        if row is None:
+            return False
+        site, final_url, status, content_type, digest = row
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO refs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (site, key, fetched_at or time.time(), final_url, status, content_type, digest))
+            self.db.execute("UPDATE objects SET last_used = ? WHERE digest = ?", (self._tick(), digest))
+        return True
+
+    def _evict(self, target=None):
+        """Drop least recently used objects (and the refs to them) until the
+        archive is under `target` bytes (default LOW_WATER of the budget)."""
+        target = self.budget * LOW_WATER if target is None else target
+        evicted = 0
+        while self.stored_bytes > target:
+            rows = self.db.execute("SELECT digest, dict_id, stored_size FROM objects"
+                                   " ORDER BY last_used LIMIT 256").fetchall()
+            if not rows:
+                break
+            for digest, dict_id, size in rows:
+                if self.stored_bytes <= target:
+                    break
+                self.db.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+                self.db.execute("DELETE FROM refs WHERE digest = ?", (digest,))
+                self._superseded.append(self._object_path(digest, dict_id))
+                self.stored_bytes -= size
+                evicted += 1
+        return evicted
+
+    def evict(self, budget_mb=None):
+        """Apply the budget now (optionally a new one); returns objects evicted."""
+        if budget_mb is not None:
+            self.budget = int(budget_mb * 1024 * 1024)
+        with self._transaction():
+            return self._evict() if self.stored_bytes > self.budget else 0
+
+    # -- reading ----------------------------------------------------------
+
+    def lookup(self, url, at=None):
+        """The latest reference to `url` fetched at or before `at` (epoch
+        seconds, default now): {"url", "final_url", "status",
+        "content_type", "digest", "fetched_at"}, or None."""
+        row = self.db.execute(
+            "SELECT url, final_url, status, content_type, digest, fetched_at FROM refs"
+            " WHERE url = ? AND fetched_at <= ? ORDER BY fetched_at DESC LIMIT 1",
+            (normalize_url(url), at if at is not None else time.time())).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("url", "final_url", "status", "content_type", "digest", "fetched_at"), row))
+
+    def body(self, digest):
+        """The stored body bytes (counts as a use for eviction)."""
+        data = self._read(digest)
+        with self.db:
+            self.db.execute("UPDATE objects SET last_used = ? WHERE digest = ?", (self._tick(), digest))
+        return data
+
+    def snapshot(self, site, at=None):
+        """The site's archived pages as of `at`: {"site", "fetched_at",
+        "pages": [{url, status, digest}], "digest"}; digest summarises the
+        whole snapshot, so two snapshots with the same digest are identical."""
+        rows = self.db.execute(
+            "SELECT url, status, digest, MAX(fetched_at) FROM refs WHERE site = ? AND fetched_at <= ?"
+            " GROUP BY url ORDER BY url", (site_of(site), at if at is not None else time.time())).fetchall()
+        h = hashlib.sha256()
+        for url, status, digest, _ in rows:
+            h.update(f"{url} {status} {digest}\n".encode("utf-8"))
+        return {"site": site_of(site), "fetched_at": max((r[3] for r in rows), default=None),
+                "pages": [{"url": u, "status": s, "digest": d} for u, s, d, _ in rows],
+                "digest": h.hexdigest()}
+
+    def stats(self):
+        objects, raw, stored = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM objects").fetchone()
+        refs, sites = self.db.execute("SELECT COUNT(*), COUNT(DISTINCT site) FROM refs").fetchone()
+        dicts = self.db.execute("SELECT COUNT(*) FROM dictionaries").fetchone()[0]
+        return {"objects": objects, "refs": refs, "sites": sites, "dictionaries": dicts,
+                "raw_bytes": raw, "stored_bytes": stored, "budget_bytes": self.budget,
+                "ratio": round(raw / stored, 2) if stored else None}
+
+
+# ============================================================
+# REPLAY
+# ============================================================
+
+class ArchiveFetcher:
+    """Stands in for geo_crawler's HttpPool when replaying a crawl offline:
+    get() answers from the archive as of `at` with the same response dict."""
+
+    def __init__(self, archive, at=None):
+        self.archive = archive
+        self.at = at
+        self.connections_opened = 0
+        self.bytes_received = 0
+
+    async def get(self, url, headers=None, stream_to=None):
+        ref = self.archive.lookup(url, self.at)
+        if ref is None:
+            raise ArchiveError(f"{url} is not in the archive")
+        body = self.archive.body(ref["digest"])
+        response_headers = {"content-type": ref["content_type"]} if ref["content_type"] else {}
+        sink = stream_to(ref["final_url"], ref["status"], response_headers) if stream_to else None
+        if sink is not None:
+            sink.feed(body)
+            body = b""
+        return {"url": ref["final_url"], "status": ref["status"], "headers": response_headers,
+                "body": body, "sink": sink, "elapsed_ms": 0}
+
+    async def close(self):
+        pass
+
+
+class TeeSink:
+    """Passes a streamed body on to a sink while keeping a copy to archive."""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.pieces = []
+
+    def feed(self, data):
+        self.pieces.append(data)
+        self.sink.feed(data)
+
+    def close(self):
+        return self.sink.close()
+
+    def body(self):
+        return b"".join(self.pieces)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and maintain the GEO page archive.")
+    parser.add_argument("archive", help="Archive directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Object, reference and size totals")
+    get = commands.add_parser("get", help="Print (or write) an archived body")
+    get.add_argument("url")
+    get.add_argument("--at", help="As of this date, YYYY-MM-DD (default: latest)")
+    get.add_argument("-o", "--output", help="Write the body to this file")
+    snap = commands.add_parser("snapshot", help="A site's archived pages and snapshot digest, as JSON")
+    snap.add_argument("site")
+    snap.add_argument("--at", help="As of this date, YYYY-MM-DD (default: latest)")
+    evict = commands.add_parser("evict", help="Evict least recently used objects down to a budget")
+    evict.add_argument("--budget-mb", type=float, required=True)
+    args = parser.parse_args()
+
+    try:
+        with PageArchive(args.archive) as archive:
+            if args.command == "stats":
+                for key, value in archive.stats().items():
+                    print(f"  {key:14s} {value}")
+            elif args.command == "get":
+                ref = archive.lookup(args.url, archive_time(args.at) if args.at else None)
+                if ref is None:
+                    sys.exit(f"{args.url} is not in the archive")
+                data = archive.body(ref["digest"])
+                if args.output:
+                    with open(args.output, "wb") as f:
+                        f.write(data)
+                else:
+                    sys.stdout.buffer.write(data)
+            elif args.command == "snapshot":
+                print(json.dumps(archive.snapshot(args.site, archive_time(args.at) if args.at else None), indent=1))
+            else:
+                print(f"Evicted {archive.evict(args.budget_mb)} objects; "
+                      f"{archive.stored_bytes:,} bytes stored")
+    except ArchiveError as exc:
+        sys.exit(str(exc))
+
+
+if __name__ == "__main__":
+    main()
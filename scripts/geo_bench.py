@@ -0,0 +1,317 @@
+#!/home/claude-runner/.claude/skills/geo/venv/bin/python3
+"""
+GEO PDF Benchmarks — wall time, peak memory and output size of every PDF
+generator, checked against stored baselines.
+
+Each case renders one document on fixed data in a freshly spawned process,
+so its peak RSS is its own and not the harness's or an earlier case's, and
+in deterministic mode with a pinned build date, so output bytes compare
+run to run. Time is the fastest of --repeat runs; peak RSS and bytes the
+largest.
+
+Cases:
+    comparison              generate_report() on the Paragon audit
+    overview, sales_deck, methodology, technical_reference
+                            the four generate_geo_system_pdfs suite documents
+    scaled-small, scaled    a synthetic report built from the comparison
+                            report's own components: N categories through
+                            score_comparison, the score-card table and both
+                            charts, then an M-row AppendixTable streamed
+                            through StreamingDocTemplate. scaled is 100
+                            categories and 10,000 rows, scaled-small a tenth
+                            of that; the growth between them is printed
+                            (10.0x is linear).
+
+With --baseline FILE every metric is compared to FILE, and any that is
+worse than its baseline by more than its threshold fails the run (exit
+status 1). Timings must also be worse by at least MIN_TIME_DELTA seconds,
+so sub-second documents don't fail on scheduler noise. --update writes the
+results as the new baseline instead.
+
+Usage:
+    python3 geo_bench.py [--cases comparison,scaled] [--repeat 3] [-o results.json]
+                         [--baseline bench.json [--update]] [--threshold 0.10]
+                         [--time-threshold 0.2] [--rss-threshold 0.1] [--bytes-threshold 0.01]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import reportlab
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import PageBreak, Paragraph, Spacer
+
+import generate_geo_comparison_pdf as comparison
+import generate_geo_system_pdfs as suite
+from geo_appendix_table import AppendixTable
+from geo_scoring import score_comparison
+from geo_streaming import StreamingDocTemplate
+from geo_table_rules import text_color_rule
+
+FIXTURE_DATE = date(2026, 2, 1)
+REPEAT = 3
+THRESHOLD = 0.10           # default allowed regression, as a fraction of the baseline
+MIN_TIME_DELTA = 0.05      # seconds; smaller slowdowns are never regressions
+METRICS = ("seconds", "peak_rss_mb", "bytes")
+BASELINE_VERSION = 1
+
+# Scaled fixtures: (categories, appendix rows)
+SCALED = {"scaled-small": (10, 1000), "scaled": (100, 10000)}
+BARS_PER_CHART = 12        # horizontal comparison bars per drawing (one drawing must fit a page)
+SCHEMA_TYPES = ["LocalBusiness", "WebPage", "Service, Breadcrumb", "FAQPage, Breadcrumb",
+                "Product, Offer", "Article, Person", "Review (6)", "—"]
+
+
+# ============================================================
+# SCALED FIXTURE
+# ============================================================
+
+def scaled_categories(n):
+    """n synthetic (name, before, after, weight) categories whose integer
+    weights sum to 100, as score_comparison expects."""
+    rng = random.Random(n)
+    categories = []
+    for i in range(n):
+        before = rng.randint(10, 75)
+        after = min(100, before + rng.choice([0, 0, rng.randint(1, 45)]))
+        categories.append((f"Category {i + 1:03d}", before, after, 100 // n + (1 if i < 100 % n else 0)))
+    return categories
+
+
+def scaled_rows(n):
+    """n page-inventory rows, generated lazily for AppendixTable."""
+    rng = random.Random(n)
+    for i in range(n):
+        yield [f"/locations/service-area-{i:05d}", rng.choice(SCHEMA_TYPES),
+               f"{rng.randint(120, 4200):,} words", str(rng.randint(5, 100))]
+
+
+def generate_scaled(output_dir, n_categories, n_rows):
+    """The scaled benchmark document: comparison-report components at
+    n_categories categories plus an n_rows appendix table."""
+    path = os.path.join(output_dir, f"GEO-Scaled-{n_categories}x{n_rows}.pdf")
+    categories = scaled_categories(n_categories)
+    scores = score_comparison(categories)
+    styles = comparison.build_styles()
+    doc = StreamingDocTemplate(path, pagesize=letter, topMargin=55, bottomMargin=55, leftMargin=50, rightMargin=50)
+
+    el = []
+    comparison.section_header(el, styles, 1, f"Score Card — {n_categories} Categories")
+    el.append(comparison.score_card_table(categories, scores))
+    el.append(Spacer(1, 12))
+    el.append(comparison.create_comparison_bar_chart([f"C{i + 1}" for i in range(n_categories)],
+                                                     [c[1] for c in categories], [c[2] for c in categories]))
+    el.append(PageBreak())
+    comparison.section_header(el, styles, 2, "What Changed")
+    for i in range(0, n_categories, BARS_PER_CHART):
+        chunk = categories[i:i + BARS_PER_CHART]
+        el.append(comparison.create_horizontal_comparison_bars(
+            [c[0] for c in chunk], [c[1] for c in chunk], [c[2] for c in chunk]))
+    el.append(PageBreak())
+    comparison.section_header(el, styles, 3, f"Page Inventory — {n_rows:,} Pages")
+    el.append(Paragraph("Synthetic inventory rows, streamed one page at a time.", styles['BodyCustom']))
+    el.append(AppendixTable(["Page", "Schema Types", "Content", "Score"], scaled_rows(n_rows),
+                            colWidths=[190, 130, 90, 50], style=comparison.make_table_style,
+                            rules=lambda rows: [text_color_rule(3, [int(r[3]) for r in rows],
+                                                                comparison.score_color)]))
+    doc.build(el, onFirstPage=comparison.make_header_footer("Scaled Fixture", "Scaled Fixture"),
+              onLaterPages=comparison.make_header_footer("Scaled Fixture", "Scaled Fixture"))
+    return path
+
+
+# ============================================================
+# CASES
+# ============================================================
+
+def _comparison_case(output_dir):
+    return comparison.generate_report(os.path.join(output_dir, "GEO-Comparison-Wix-vs-NextJS.pdf"))
+
+
+CASES = {
+    "comparison": _comparison_case,
+    "overview": suite.generate_overview,
+    "sales_deck": suite.generate_sales_deck,
+    "methodology": suite.generate_methodology,
+    "technical_reference": suite.generate_technical_reference,
+}
+for _name, (_categories, _rows) in SCALED.items():
+    CASES[_name] = lambda output_dir, c=_categories, r=_rows: generate_scaled(output_dir, c, r)
+
+
+def _peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+def _run_case(name, build_date):
+    """Worker entry point: render one case into a scratch directory and
+    return its measurements."""
+    comparison.configure_build(build_date, deterministic=True)
+    suite.configure_build(build_date, deterministic=True)
+    with tempfile.TemporaryDirectory(prefix="geo-bench-") as output_dir:
+        base_rss = _peak_rss_mb()
+        start = time.perf_counter()
+        path = CASES[name](output_dir)
+        seconds = time.perf_counter() - start
+        return {"seconds": seconds, "peak_rss_mb": _peak_rss_mb(), "base_rss_mb": base_rss,
+                "bytes": os.path.getsize(path)}
+
+
+def run_case(name, repeat=REPEAT, build_date=FIXTURE_DATE):
+    """Measure one case over `repeat` fresh processes: the fastest time,
+    the largest peak RSS and output size."""
+    runs = []
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            runs.append(pool.submit(_run_case, name, build_date).result())
+    return {
+        "seconds": round(min(r["seconds"] for r in runs), 4),
+        "peak_rss_mb": round(max(r["peak_rss_mb"] for r in runs), 1),
+        "base_rss_mb": round(max(r["base_rss_mb"] for r in runs), 1),
+        "bytes": max(r["bytes"] for r in runs),
+        "runs": repeat,
+    }
+
+
+def environment():
+    return {"python": platform.python_version(), "reportlab": reportlab.Version,
+            "machine": platform.machine(), "cpus": os.cpu_count()}
+
+
+# ============================================================
+# BASELINES
+# ============================================================
+
+def compare(results, baseline, thresholds):
+    """[(case, metric, baseline, value, change)] for every metric that got
+    worse than its baseline by more than its threshold."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            continue
+        for metric in METRICS:
+            old, new = base.get(metric), result[metric]
+            if not old:
+                continue
+            worse = new - old
+            if metric == "seconds" and worse < MIN_TIME_DELTA:
+                continue
+            if worse > old * thresholds[metric]:
+                regressions.append((name, metric, old, new, worse / old))
+    return regressions
+
+
+def scaling(results):
+    """{metric: (scaled-small, scaled)} for the two scaled fixtures, peak
+    RSS counted above the interpreter's own; None unless both ran."""
+    if not all(name in results for name in SCALED):
+        return None
+    small, large = (results[name] for name in SCALED)
+    growth = {metric: (small[metric], large[metric]) for metric in METRICS}
+    growth["peak_rss_mb"] = (small["peak_rss_mb"] - small["base_rss_mb"],
+                             large["peak_rss_mb"] - large["base_rss_mb"])
+    return growth
+
+
+def _format(metric, value):
+    if metric == "seconds":
+        return f"{value:.2f}s"
+    if metric == "peak_rss_mb":
+        return f"{value:.1f} MB"
+    return f"{value:,} B"
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the GEO PDF generators against baselines.")
+    parser.add_argument("--cases", help=f"Comma-separated cases (default: all of {', '.join(CASES)})")
+    parser.add_argument("--repeat", type=int, default=REPEAT,
+                        help=f"Runs per case; the fastest time counts (default: {REPEAT})")
+    parser.add_argument("--baseline", metavar="FILE", help="Baseline JSON to compare against (or --update)")
+    parser.add_argument("--update", action="store_true", help="Write the results to --baseline instead")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"Allowed regression for every metric, as a fraction (default: {THRESHOLD})")
+    parser.add_argument("--time-threshold", type=float, help="Override --threshold for wall time")
+    parser.add_argument("--rss-threshold", type=float, help="Override --threshold for peak RSS")
+    parser.add_argument("--bytes-threshold", type=float, help="Override --threshold for output size")
+    parser.add_argument("--output", "-o", help="Also write the results JSON here")
+    args = parser.parse_args()
+
+    names = args.cases.split(",") if args.cases else list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+    if args.update and not args.baseline:
+        parser.error("--update needs --baseline")
+    thresholds = {
+        "seconds": args.time_threshold if args.time_threshold is not None else args.threshold,
+        "peak_rss_mb": args.rss_threshold if args.rss_threshold is not None else args.threshold,
+        "bytes": args.bytes_threshold if args.bytes_threshold is not None else args.threshold,
+    }
+
+    baseline = {}
+    if args.baseline and not args.update and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"  {'case':22s} {'time':>9s} {'peak RSS':>10s} {'output':>13s}")
+    for name in names:
+        results[name] = result = run_case(name, args.repeat)
+        base = baseline.get("cases", {}).get(name)
+        change = ""
+        if base:
+            change = "  vs baseline " + " / ".join(
+                f"{(result[m] - base[m]) / base[m]:+.0%}" if base.get(m) else "n/a" for m in METRICS)
+        print(f"  {name:22s} {result['seconds']:8.2f}s {result['peak_rss_mb']:7.1f} MB "
+              f"{result['bytes']:11,} B{change}")
+
+    growth = scaling(results)
+    if growth:
+        ratio = SCALED["scaled"][1] / SCALED["scaled-small"][1]
+        (t0, t1), (r0, r1), (b0, b1) = (growth[m] for m in METRICS)
+        print(f"\n  Scaling ({ratio:.0f}x the data): time {t1 / t0:.1f}x, output {b1 / b0:.1f}x, "
+              f"memory above the interpreter {r0:.1f} MB -> {r1:.1f} MB")
+
+    report = {"version": BASELINE_VERSION, "date": date.today().isoformat(), "environment": environment(),
+              "cases": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    if args.update:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+        print(f"\nBaseline written to {args.baseline}")
+        return
+    if not baseline:
+        if args.baseline:
+            print(f"\nNo baseline at {args.baseline}; run with --update to create one")
+        return
+
+    if baseline.get("environment") != environment():
+        print(f"\nNote: baseline recorded on {baseline.get('environment')}; comparisons may not be meaningful")
+    regressions = compare(results, baseline, thresholds)
+    if not regressions:
+        print(f"\nNo regressions against {args.baseline}")
+        return
+    print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+    for name, metric, old, new, change in regressions:
+        print(f"  {name:22s} {metric:12s} {_format(metric, old)} -> {_format(metric, new)} "
+              f"({change:+.0%}, limit {thresholds[metric]:+.0%})")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Incremental Build Cache for the GEO PDF generators.
+
+Every document gets an input key: a SHA-256 over its generator's source,
+the shared helpers and palette of the generator's module, the source of
+every project module that module imports, its style definitions and its
+data. Rendered PDFs are stored once under the hash of their bytes, and a
+manifest maps input keys to those content hashes, so a document whose key
+is already known is copied out of the cache instead of being re-rendered.
+
+Cache layout:
+    <cache_dir>/manifest.json              input key -> object, file name, size
+    <cache_dir>/objects/ab/abcdef....pdf   content-addressed PDFs
+
+All cache reads and writes happen in the parent process; workers only render.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _canonical(value):
+    """Reduce data tables, styles and colors to JSON-serialisable, stable values."""
+    if isinstance(value, dict):
+        items = [(k if isinstance(k, str) else json.dumps(_canonical(k), sort_keys=True), v)
+                 for k, v in value.items()]
+        return {k: _canonical(v) for k, v in sorted(items, key=lambda kv: kv[0])}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):  # iteration order varies with the hash seed
+        return sorted((_canonical(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True))
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if inspect.ismethod(value) or inspect.isbuiltin(value) or inspect.isfunction(value):
+        # by name, not repr(), which carries a memory address
+        owner = getattr(value, "__self__", None)
+        prefix = _canonical(owner) if owner is not None and not inspect.ismodule(owner) else value.__module__
+        return {"__callable__": value.__qualname__, "owner": prefix}
+    if isinstance(value, struct.Struct):
+        return {"__struct__": value.format}
+    if hasattr(value, "hexval"):  # reportlab Color
+        return value.hexval()
+    if hasattr(value, "__dict__"):  # ParagraphStyle, StyleSheet1, ...
+        return {"__type__": type(value).__name__, **_canonical(vars(value))}
+    return repr(value)
+
+
+def source_digest(*objects):
+    """SHA-256 over the source code of the given functions/classes."""
+    h = hashlib.sha256()
+    for obj in objects:
+        h.update(inspect.getsource(obj).encode("utf-8"))
+    return h.hexdigest()
+
+
+def module_digest(module, exclude=()):
+    """SHA-256 over a module's shared code: every function defined in it
+    (minus `exclude`) and every UPPER_CASE constant such as the palette.
+
+    Anything not excluded counts as an input, so forgetting to exclude a
+    helper only costs a rebuild, never a stale document.
+    """
+    excluded = {getattr(f, "__name__", f) for f in exclude}
+    h = hashlib.sha256()
+    for name, value in sorted(vars(module).items()):
+        if name in excluded:
+            continue
+        func = inspect.unwrap(value) if callable(value) else None  # see through lru_cache etc.
+        if inspect.isfunction(func) and func.__module__ == module.__name__:
+            h.update(name.encode("utf-8"))
+            h.update(inspect.getsource(func).encode("utf-8"))
+        elif name.isupper():
+            h.update(name.encode("utf-8"))
+            h.update(json.dumps(_canonical(value), sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _project_module(value):
+    """The project module (a file in PROJECT_DIR) `value` is or was defined in, if any."""
+    module = value if inspect.ismodule(value) else sys.modules.get(getattr(value, "__module__", None) or "")
+    path = getattr(module, "__file__", None)
+    if path and os.path.dirname(os.path.abspath(path)) == PROJECT_DIR:
+        return module
+    return None
+
+
+def project_digest(module):
+    """SHA-256 over the source files of every project module `module` imports,
+    directly or through other project modules (geo_scoring, geo_table_rules,
+    geo_streaming, ...). `module` itself is left out: its shared code is
+    covered by module_digest.
+
+    Dependencies are found by walking the imports rather than listed by hand,
+    so a helper module added later is part of the key without anyone
+    remembering to add it.
+    """
+    seen, todo = {module.__name__: module}, [module]
+    while todo:
+        for value in list(vars(todo.pop()).values()):
+            dep = _project_module(value)
+            if dep is not None and dep.__name__ not in seen:
+                seen[dep.__name__] = dep
+                todo.append(dep)
+    h = hashlib.sha256()
+    for name, dep in sorted(seen.items()):
+        if dep is not module:
+            h.update(name.encode("utf-8"))
+            with open(dep.__file__, "rb") as f:
+                h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+def input_key(**parts):
+    """Hash the named inputs of one document (sources, styles, data) into a key."""
+    payload = json.dumps(_canonical(parts), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class BuildCache:
+    """Manifest of input keys plus a content-addressed store of rendered PDFs."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.manifest = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.pdf")
+
+    def lookup(self, key):
+        """Return the manifest entry for `key` if its object is still on disk."""
+        entry = self.manifest.get(key)
+        if entry and os.path.exists(self._object_path(entry["object"])):
+            return entry
+        return None
+
+    def fetch(self, key, output_dir, name=None):
+        """Copy the cached PDF for `key` into output_dir. Returns its path, or None on a miss."""
+        entry = self.lookup(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        dest = os.path.join(output_dir, name or entry["name"])
+        shutil.copyfile(self._object_path(entry["object"]), dest)
+        return dest
+
+    def store(self, key, path):
+        """Add a freshly rendered PDF under its content hash and record `key` -> object."""
+        digest = file_digest(path)
+        obj = self._object_path(digest)
+        if not os.path.exists(obj):
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            tmp = f"{obj}.{os.getpid()}.tmp"
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, obj)
+        self.manifest[key] = {"object": digest, "name": os.path.basename(path),
+                              "bytes": os.path.getsize(path)}
+        return digest
+
+    def save(self):
+        """Write the manifest atomically."""
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
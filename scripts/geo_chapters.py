@@ -0,0 +1,213 @@
+"""
+Chapter Splitting and Merging for chapter-parallel PDF builds.
+
+A long document is written as a generator of chapters (lists of
+flowables, each starting on a new page). Serially the chapters are joined
+into one story; in parallel each chapter lays out independently, the
+per-chapter PDFs are then concatenated and page numbers are stamped over
+the merged result, since no chapter knows its final page offset while it
+is being laid out.
+
+Merging needs pypdf (pip install pypdf); serial builds do not.
+"""
+
+import gc
+import io
+
+from reportlab.pdfgen import canvas as pdfcanvas
+from reportlab.platypus import PageBreak, Paragraph
+
+
+def join_chapters(chapters):
+    """One flat story from per-chapter flowable lists, a PageBreak between
+    consecutive chapters (the serial build of a chaptered document)."""
+    story = []
+    for flowables in chapters:
+        if story:
+            story.append(PageBreak())
+        story.extend(flowables)
+    return story
+
+
+def chapter_title(flowables, heading_style="SectionHead"):
+    """Plain text of a chapter's first top-level heading, or None (the cover)."""
+    for f in flowables:
+        style = getattr(f, "style", None)
+        if isinstance(f, Paragraph) and style is not None and style.name == heading_style:
+            return f.getPlainText()
+    return None
+
+
+def chapter_start_pages(page_counts, first_page=1):
+    """Absolute first page of each chapter, given each chapter's page count."""
+    starts, page = [], first_page
+    for n in page_counts:
+        starts.append(page)
+        page += n
+    return starts
+
+
+def _stamp_overlay(page_sizes, stamp):
+    """One transparent page per merged page, carrying whatever `stamp` draws."""
+    buf = io.BytesIO()
+    c = pdfcanvas.Canvas(buf, pagesize=page_sizes[0])
+    for number, size in enumerate(page_sizes, 1):
+        c.setPageSize(size)
+        stamp(c, number)
+        c.showPage()
+    c.save()
+    buf.seek(0)
+    return buf
+
+
+def merge_chapters(part_paths, output_path, stamp=None):
+    """Concatenate chapter PDFs into output_path.
+
+    stamp(canvas, page_number) is drawn onto every merged page (e.g. the
+    "Page N" footer text), using the final page numbering.
+    """
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError as exc:
+        raise RuntimeError("chapter-parallel builds need pypdf: pip install pypdf") from exc
+
+    writer = PdfWriter()
+    for path in part_paths:
+        writer.append(path)
+    if stamp is not None:
+        sizes = [(float(p.mediabox.width), float(p.mediabox.height)) for p in writer.pages]
+        overlay = PdfReader(_stamp_overlay(sizes, stamp))
+        for page, over in zip(writer.pages, overlay.pages):
+            page.merge_page(over)
+            page.compress_content_streams()  # merge_page leaves the content uncompressed
+    metadata = PdfReader(part_paths[0]).metadata
+    if metadata:
+        writer.add_metadata(dict(metadata))
+    with open(output_path, "wb") as f:
+        writer.write(f)
+    return output_path
+
+
+def _write_object(out, obj, ref):
+    """Serialise a pypdf object, writing every indirect reference as ref(it)."""
+    from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+    if isinstance(obj, IndirectObject):
+        out.write(b"%d 0 R" % ref(obj))
+    elif isinstance(obj, DictionaryObject):
+        out.write(b"<<")
+        for key, value in obj.items():
+            if isinstance(obj, StreamObject) and key == "/Length":
+                continue
+            key.write_to_stream(out)
+            out.write(b" ")
+            _write_object(out, value, ref)
+            out.write(b"\n")
+        if isinstance(obj, StreamObject):
+            out.write(b"/Length %d>>\nstream\n" % len(obj._data))
+            out.write(obj._data)
+            out.write(b"\nendstream")
+        else:
+            out.write(b">>")
+    elif isinstance(obj, ArrayObject):
+        out.write(b"[")
+        for i, value in enumerate(obj):
+            if i:
+                out.write(b" ")
+            _write_object(out, value, ref)
+        out.write(b"]")
+    else:
+        obj.write_to_stream(out)
+
+
+def _write_entries(out, items, ref):
+    for key, value in items:
+        key.write_to_stream(out)
+        out.write(b" ")
+        _write_object(out, value, ref)
+        out.write(b"\n")
+
+
+def _copy_part(out, reader, offsets, kids, head):
+    """Write one part's pages and every object they use to out, numbered
+    from len(offsets) on; page numbers are appended to kids. The first part
+    also fills head. Nothing of the part outlives the call."""
+    numbers, todo = {}, []
+
+    def ref(indirect):
+        key = (indirect.idnum, indirect.generation)
+        if key not in numbers:
+            numbers[key] = len(offsets)
+            offsets.append(None)
+            todo.append(indirect)
+        return numbers[key]
+
+    pages = set()
+    for page in reader.pages:
+        pages.add((page.indirect_reference.idnum, page.indirect_reference.generation))
+        kids.append(ref(page.indirect_reference))
+    if not head:
+        out.write(reader.pdf_header.encode("latin-1") + b"\n%\x93\x8c\x8b\x9e\n")
+        head.update(catalog=io.BytesIO(), info=None, id=io.BytesIO())
+        root = reader.trailer["/Root"].get_object()
+        _write_entries(head["catalog"], [(k, v) for k, v in root.items() if k not in ("/Type", "/Pages")], ref)
+        if "/Info" in reader.trailer:
+            head["info"] = ref(reader.trailer.raw_get("/Info"))
+        if "/ID" in reader.trailer:
+            _write_object(head["id"], reader.trailer["/ID"], ref)
+    while todo:
+        indirect = todo.pop()
+        num = numbers[(indirect.idnum, indirect.generation)]
+        obj = indirect.get_object()
+        offsets[num] = out.tell()
+        out.write(b"%d 0 obj\n" % num)
+        if (indirect.idnum, indirect.generation) in pages:  # re-parented onto the merged page tree
+            out.write(b"<</Parent 2 0 R\n")
+            _write_entries(out, [(k, v) for k, v in obj.items() if k != "/Parent"], ref)
+            out.write(b">>")
+        else:
+            _write_object(out, obj, ref)
+        out.write(b"\nendobj\n")
+
+
+def concat_pdfs(part_paths, output_path):
+    """Concatenate PDFs into output_path one part at a time.
+
+    merge_chapters collects every page in a PdfWriter before anything is
+    written, so its memory grows with the document. Here each part's pages
+    and the objects they use are copied straight to the output, renumbered,
+    and the part is dropped before the next one is read; only the byte
+    offsets and page numbers of the whole document are kept until the page
+    tree, xref table and trailer are written at the end. Catalog entries,
+    /Info and /ID come from the first part.
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError as exc:
+        raise RuntimeError("merging streamed parts needs pypdf: pip install pypdf") from exc
+
+    offsets = [None, None, None]   # object number -> byte offset; 1 is the catalog, 2 the page tree
+    kids = []
+    head = {}                      # catalog entries, /Info and /ID of the first part
+    with open(output_path, "wb") as out:
+        for path in part_paths:
+            _copy_part(out, PdfReader(path), offsets, kids, head)
+            gc.collect()  # a PdfReader is full of reference cycles; free it before the next part
+
+        offsets[1] = out.tell()
+        out.write(b"1 0 obj\n<</Type /Catalog /Pages 2 0 R\n%s>>\nendobj\n" % head["catalog"].getvalue())
+        offsets[2] = out.tell()
+        out.write(b"2 0 obj\n<</Type /Pages /Count %d /Kids [" % len(kids))
+        out.write(b" ".join(b"%d 0 R" % k for k in kids))
+        out.write(b"]>>\nendobj\n")
+        xref = out.tell()
+        out.write(b"xref\n0 %d\n0000000000 65535 f \n" % len(offsets))
+        for offset in offsets[1:]:
+            out.write(b"%010d 00000 n \n" % offset)
+        out.write(b"trailer\n<</Size %d /Root 1 0 R" % len(offsets))
+        if head["info"] is not None:
+            out.write(b" /Info %d 0 R" % head["info"])
+        if head["id"].getvalue():
+            out.write(b" /ID " + head["id"].getvalue())
+        out.write(b">>\nstartxref\n%d\n%%%%EOF\n" % xref)
+    return output_path
@@ -0,0 +1,251 @@
+#!/home/claude-runner/.claude/skills/geo/venv/bin/python3
+"""
+GEO Citability Analyzer — passage windowing for the AI Citability category.
+
+Implements the Citability Module spec from the Technical Reference:
+
+  - passage self-containment: does a passage open without leaning on
+    earlier text ("This", "It", "However", ...)?
+  - answer blocks: is a direct, declarative answer placed in the first
+    200-300 words of the page?
+  - optimal passage length: 134-167 words.
+
+A page's text blocks (the "blocks" of a geo_html_extract page record) are
+split into sections at headings, each section into sentences, and every
+run of whole sentences of 134-167 words is a candidate window. Windows
+are enumerated with two pointers over the sentence boundaries and scored
+in O(1) each from prefix sums, so a page costs time linear in its length
+no matter how many windows overlap.
+
+analyze_page() returns the per-page figures, analyze_pages() runs a batch
+(optionally over a process pool) and site_score() folds page scores into
+the 0-100 AI Citability score geo_modules reports.
+
+Usage:
+    python3 geo_citability.py crawl.json [-j 4] [-o citability.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import re
+import sys
+
+WINDOW_MIN = 134
+WINDOW_MAX = 167
+ANSWER_ZONE = 300          # words from the top of the page
+ANSWER_MAX_WORDS = 40      # longest sentence still read as a direct answer
+CITABLE_SCORE = 0.75       # window score that counts as citable
+TARGET_WINDOWS = 3         # citable windows for a page's full window credit
+PARAGRAPH_MIN_WORDS = 20   # shorter blocks are labels, not passages
+
+# Component weights of a page's 0-100 citability score
+PAGE_WEIGHTS = {
+    "windows": 35,          # citable 134-167-word windows
+    "answer_first": 25,     # direct answer within ANSWER_ZONE
+    "self_contained": 20,   # paragraphs that stand alone
+    "paragraph_length": 20, # paragraphs already at citation length
+}
+
+ANAPHORA = frozenset((
+    "this", "that", "these", "those", "it", "its", "they", "them", "their", "he", "she",
+    "his", "her", "such", "however", "also", "additionally", "moreover", "furthermore",
+    "besides", "therefore", "thus", "meanwhile", "otherwise", "instead", "likewise",
+    "similarly", "then", "but", "and", "or", "so", "here", "there",
+))
+ANSWER_VERBS = frozenset((
+    "is", "are", "was", "were", "means", "refers", "costs", "takes", "includes",
+    "provides", "offers", "requires", "uses", "lets", "helps", "allows",
+))
+SENTENCE_END = re.compile(r"[.!?][\"')\]]*$")
+HAS_DIGIT = re.compile(r"\d")
+
+
+# ============================================================
+# TOKENIZING
+# ============================================================
+
+def sections(blocks):
+    """Body text blocks grouped by heading: a list of word lists, plus the
+    per-word flag marking the first word of each paragraph."""
+    out, words, starts = [], [], []
+    for level, text in blocks:
+        if level:
+            if words:
+                out.append((words, starts))
+            words, starts = [], []
+            continue
+        tokens = text.split()
+        if tokens:
+            starts.append(len(words))
+            words.extend(tokens)
+    if words:
+        out.append((words, starts))
+    return out
+
+
+def sentence_bounds(words):
+    """Start indexes of the sentences in `words`, plus len(words) as a sentinel."""
+    bounds = [0]
+    for i, word in enumerate(words[:-1]):
+        if SENTENCE_END.search(word):
+            bounds.append(i + 1)
+    bounds.append(len(words))
+    return bounds
+
+
+def _opens_cold(word):
+    return word.strip("\"'([").lower().rstrip(",;:") in ANAPHORA
+
+
+def _is_answer(sentence):
+    return (len(sentence) <= ANSWER_MAX_WORDS and not _opens_cold(sentence[0])
+            and any(w.lower().strip(",;:") in ANSWER_VERBS for w in sentence[1:8]))
+
+
+# ============================================================
+# WINDOWS
+# ============================================================
+
+def scan_windows(words, paragraph_starts):
+    """Every window of whole sentences between WINDOW_MIN and WINDOW_MAX
+    words in one section, as (start, end, score) tuples.
+
+    Score (0-1) = 0.4 for opening self-contained, 0.3 for fact density
+    (digits per word against the 1:80 target), 0.3 for starting at a
+    paragraph boundary rather than mid-paragraph. Linear in len(words):
+    the end pointer only moves forward, each start has at most
+    WINDOW_MAX - WINDOW_MIN + 1 fitting ends, and every term is a
+    prefix-sum lookup.
+    """
+    bounds = sentence_bounds(words)
+    facts = [0]
+    for word in words:
+        facts.append(facts[-1] + (1 if HAS_DIGIT.search(word) else 0))
+    paragraph_start = set(paragraph_starts)
+
+    windows, j = [], 0
+    for i in range(len(bounds) - 1):
+        start = bounds[i]
+        j = max(j, i + 1)
+        while j + 1 < len(bounds) and bounds[j + 1] - start <= WINDOW_MAX:
+            j += 1
+        opening = 0.4 * (not _opens_cold(words[start])) + 0.3 * (start in paragraph_start)
+        # from the longest fit, walk back to each shorter fit
+        k = j
+        while k > i and bounds[k] - start >= WINDOW_MIN:
+            end = bounds[k]
+            if end - start <= WINDOW_MAX:
+                density = min(1.0, (facts[end] - facts[start]) * 80 / (end - start))
+                windows.append((start, end, round(opening + 0.3 * density, 3)))
+            k -= 1
+    return windows
+
+
+def best_windows(windows):
+    """Non-overlapping citable windows, earliest first (windows in start order)."""
+    picked, last_end = [], 0
+    for start, end, score in windows:
+        if score >= CITABLE_SCORE and start >= last_end:
+            picked.append((start, end, score))
+            last_end = end
+    return picked
+
+
+# ============================================================
+# PAGES AND SITES
+# ============================================================
+
+def analyze_page(page):
+    """Citability figures and 0-100 score for one page record."""
+    blocks = page.get("blocks") or []
+    windows, citable, best = 0, 0, 0.0
+    body = []
+    for words, starts in sections(blocks):
+        found = scan_windows(words, starts)
+        windows += len(found)
+        citable += len(best_windows(found))
+        best = max([best] + [score for _, _, score in found])
+        body.extend(words)
+
+    answer_at = None
+    bounds = sentence_bounds(body) if body else [0]
+    for a, b in zip(bounds, bounds[1:]):
+        if a >= ANSWER_ZONE:
+            break
+        if _is_answer(body[a:b]):
+            answer_at = a
+            break
+
+    paragraphs = [text.split() for level, text in blocks if not level]
+    paragraphs = [p for p in paragraphs if len(p) >= PARAGRAPH_MIN_WORDS]
+    self_contained = (sum(1 for p in paragraphs if not _opens_cold(p[0])) / len(paragraphs)
+                      if paragraphs else 0.0)
+    optimal = (sum(1 for p in paragraphs if WINDOW_MIN <= len(p) <= WINDOW_MAX) / len(paragraphs)
+               if paragraphs else 0.0)
+    parts = {
+        "windows": min(1.0, citable / TARGET_WINDOWS),
+        "answer_first": 1.0 if answer_at is not None else 0.0,
+        "self_contained": self_contained,
+        "paragraph_length": min(1.0, optimal * 4),  # one paragraph in four at length is full credit
+    }
+    return {
+        "url": page.get("final_url") or page.get("url"),
+        "words": len(body),
+        "paragraphs": len(paragraphs),
+        "windows": windows,
+        "citable_windows": citable,
+        "best_window": best,
+        "answer_at": answer_at,
+        "self_contained": round(self_contained, 3),
+        "optimal_paragraphs": round(optimal, 3),
+        "score": round(sum(PAGE_WEIGHTS[k] * v for k, v in parts.items())),
+    }
+
+
+def analyze_pages(pages, jobs=None, chunksize=64):
+    """analyze_page() over a batch of page records, in order, skipping error
+    pages and pages without text. With jobs > 1 the batch is spread over a
+    process pool in chunks."""
+    pages = [p for p in pages if p.get("blocks") and p.get("status", 200) == 200]
+    if not jobs or jobs <= 1 or len(pages) < chunksize:
+        return [analyze_page(p) for p in pages]
+    with multiprocessing.Pool(jobs) as pool:
+        return pool.map(analyze_page, pages, chunksize)
+
+
+def site_score(results):
+    """The site's AI Citability passage score: mean page score, or None when
+    no page had body text."""
+    scored = [r["score"] for r in results if r["words"]]
+    return round(sum(scored) / len(scored)) if scored else None
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Score passage citability for a crawl.")
+    parser.add_argument("crawl", help="Crawl JSON written by geo_crawler.py")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: 1)")
+    parser.add_argument("-o", "--output", help="Write per-page results as JSON to this file")
+    args = parser.parse_args()
+
+    with open(args.crawl, encoding="utf-8") as f:
+        crawl = json.load(f)
+    results = analyze_pages(crawl["pages"], jobs=args.jobs)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"pages": results, "score": site_score(results)}, f, indent=1)
+    for r in results:
+        answer = "-" if r["answer_at"] is None else f"@{r['answer_at']}"
+        print(f"  {r['score']:3d}  {r['citable_windows']:2d}/{r['windows']:<4d} windows  "
+              f"answer {answer:5s}  {r['url']}")
+    score = site_score(results)
+    if score is None:
+        sys.exit("No page text to score (crawl predates text blocks?)")
+    print(f"AI Citability passage score: {score}/100")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,633 @@
+#!/home/claude-runner/.claude/skills/geo/venv/bin/python3
+"""
+GEO Site Crawler — Phase 1 (Discovery & Reconnaissance).
+
+Implements the discovery phase described in the Methodology Guide:
+fetch the homepage, crawl the sitemap (up to 50 pages, prioritized by
+navigation hierarchy), respect robots.txt, 30-second timeout per page and a
+1-second delay between fetches to the same host. Every page is reduced to a
+record of the data the analysis modules need: title, meta tags, headings,
+word count, JSON-LD, links and images. HTML bodies are fed to the
+geo_html_extract streaming extractor as they download, so extraction
+overlaps the network and no page is held in memory whole.
+
+Standard library only: a small asyncio HTTP/1.1 client keeps a pool of
+keep-alive connections per host, so a 50-page crawl opens a handful of
+sockets rather than fifty. With --cache, responses are revalidated with
+conditional GETs (geo_http_cache): an unchanged page answers 304 and its
+stored page record is reused without downloading or parsing it again.
+With --archive every body received is kept in a geo_archive page archive,
+and --replay crawls from such an archive offline instead of the network.
+
+Usage:
+    python3 geo_crawler.py https://example.com [-o crawl.json] [--max-pages 50]
+                           [--concurrency 4] [--delay 1.0] [--timeout 30] [--cache DIR]
+                           [--archive DIR | --replay DIR [--at YYYY-MM-DD]]
+    python3 geo_crawler.py --self-check     # crawl a local server with broken responses
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import ssl
+import sys
+import time
+import zlib
+from urllib.parse import urljoin, urlsplit
+from xml.etree import ElementTree
+
+from geo_archive import ArchiveError, ArchiveFetcher, PageArchive, TeeSink, archive_time
+from geo_html_extract import PageExtractor, charset_from_content_type
+from geo_http_cache import ResponseCache
+from geo_llms import LLMS_PATH, llms_sink
+from geo_robots import DISALLOW_ALL, policy_for_status
+
+USER_AGENT = "GEO-Audit/1.0"
+MAX_PAGES = 50
+TIMEOUT = 30.0
+DELAY = 1.0
+CONCURRENCY = 4
+MAX_REDIRECTS = 5
+MAX_BODY_BYTES = 5 * 1024 * 1024
+READ_SIZE = 64 * 1024
+MAX_SITEMAPS = 10
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+
+# ============================================================
+# HTTP CLIENT (KEEP-ALIVE CONNECTION POOL)
+# ============================================================
+
+class FetchError(Exception):
+    pass
+
+
+# What one failed fetch can raise (besides asyncio.TimeoutError): network and
+# protocol errors, truncated bodies (asyncio.IncompleteReadError is an
+# EOFError) and undecodable content encodings. Each costs that fetch, never
+# the crawl.
+FETCH_ERRORS = (OSError, EOFError, FetchError, ValueError, zlib.error)
+
+
+class DeflateDecoder:
+    """Content-Encoding: deflate decoder. The body should be zlib-wrapped,
+    but many servers send raw deflate; a bad zlib header switches to that."""
+
+    def __init__(self):
+        self._d = zlib.decompressobj()
+        self._head = b""   # input so far, until the zlib header has been accepted
+
+    def decompress(self, data):
+        if self._head is None:
+            return self._d.decompress(data)
+        self._head += data
+        try:
+            out = self._d.decompress(data)
+        except zlib.error:
+            self._d, data, self._head = zlib.decompressobj(-zlib.MAX_WBITS), self._head, None
+            return self._d.decompress(data)
+        if len(self._head) >= 2:
+            self._head = None
+        return out
+
+    def flush(self):
+        return self._d.flush()
+
+
+class HttpPool:
+    """Minimal HTTP/1.1 GET client with a pool of idle keep-alive connections
+    per (scheme, host, port)."""
+
+    def __init__(self, timeout=TIMEOUT, user_agent=USER_AGENT):
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._idle = {}
+        self._ssl = ssl.create_default_context()
+        self.connections_opened = 0
+        self.bytes_received = 0
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        self.connections_opened += 1
+        return await asyncio.open_connection(host, port, ssl=self._ssl if scheme == "https" else None)
+
+    async def _exchange(self, conn, host_header, path, headers, sink_for):
+        reader, writer = conn
+        lines = [f"GET {path} HTTP/1.1", f"Host: {host_header}", f"User-Agent: {self.user_agent}",
+                 "Accept-Encoding: gzip, deflate", "Connection: keep-alive"]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before response")
+        parts = status_line.decode("latin-1").split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise FetchError(f"bad status line: {status_line[:80]!r}")
+        status = int(parts[1])
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        keep_alive = response_headers.get("connection", "").lower() != "close" and parts[0] != "HTTP/1.0"
+        chunked = response_headers.get("transfer-encoding", "").lower() == "chunked"
+        if not chunked and "content-length" in response_headers:
+            if int(response_headers["content-length"]) > MAX_BODY_BYTES:
+                raise FetchError(f"body too large ({response_headers['content-length']} bytes)")
+        elif not chunked:
+            keep_alive = False
+
+        encoding = response_headers.get("content-encoding", "").lower()
+        decompressor = (zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == "gzip"
+                        else DeflateDecoder() if encoding == "deflate" else None)
+        sink = sink_for(status, response_headers)
+        body, total = [], 0
+        async for piece in self._body_pieces(reader, status, response_headers, chunked):
+            total += len(piece)
+            self.bytes_received += len(piece)
+            if total > MAX_BODY_BYTES:
+                raise FetchError("body too large")
+            if decompressor is not None:
+                piece = decompressor.decompress(piece)
+            if sink is not None:
+                sink.feed(piece)
+            else:
+                body.append(piece)
+        if decompressor is not None:
+            tail = decompressor.flush()
+            if sink is not None:
+                sink.feed(tail)
+            else:
+                body.append(tail)
+        return status, response_headers, b"".join(body), sink, keep_alive
+
+    async def _body_pieces(self, reader, status, response_headers, chunked):
+        """The raw (still content-encoded) body, piece by piece as it arrives."""
+        if status in (204, 304) or 100 <= status < 200:
+            return
+        if chunked:
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    return
+                while size:
+                    piece = await reader.readexactly(min(size, READ_SIZE))
+                    size -= len(piece)
+                    yield piece
+                await reader.readline()
+        elif "content-length" in response_headers:
+            remaining = int(response_headers["content-length"])
+            while remaining:
+                piece = await reader.readexactly(min(remaining, READ_SIZE))
+                remaining -= len(piece)
+                yield piece
+        else:
+            while True:
+                piece = await reader.read(READ_SIZE)
+                if not piece:
+                    return
+                yield piece
+
+    async def _get_once(self, url, headers, stream_to):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise FetchError(f"unsupported scheme: {parts.scheme}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        idle = self._idle.setdefault(key, [])
+        reused = bool(idle)
+        conn = idle.pop() if idle else await self._connect(key)
+        streamed = []
+
+        def sink_for(status, response_headers):
+            sink = stream_to(url, status, response_headers) if stream_to else None
+            streamed.append(sink)
+            return sink
+
+        try:
+            result = await self._exchange(conn, parts.netloc, path, headers, sink_for)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            conn[1].close()
+            if not reused or streamed:
+                raise
+            # the server dropped an idle keep-alive connection; retry on a fresh one
+            conn = await self._connect(key)
+            result = await self._exchange(conn, parts.netloc, path, headers, sink_for)
+        except BaseException:
+            conn[1].close()
+            raise
+        status, response_headers, body, sink, keep_alive = result
+        if keep_alive:
+            idle.append(conn)
+        else:
+            conn[1].close()
+        return status, response_headers, body, sink
+
+    async def get(self, url, headers=None, stream_to=None):
+        """GET url, following redirects, within the pool's timeout. Returns a
+        response dict with url (final), status, headers, body (bytes), sink
+        and elapsed_ms.
+
+        stream_to(url, status, headers), if given, is called once the final
+        response's headers are in; when it returns a sink (anything with a
+        feed(bytes) method) the decoded body is fed to it piece by piece as
+        it arrives instead of being buffered, and body is b"".
+        """
+        return await asyncio.wait_for(self._follow(url, headers, stream_to), self.timeout)
+
+    async def _follow(self, url, headers, stream_to):
+        start = time.perf_counter()
+
+        def final_only(target, status, response_headers):
+            if status in REDIRECT_CODES and "location" in response_headers:
+                return None
+            return stream_to(target, status, response_headers)
+
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers, body, sink = await self._get_once(
+                url, headers, final_only if stream_to else None)
+            if status in REDIRECT_CODES and "location" in response_headers:
+                url = urljoin(url, response_headers["location"])
+                continue
+            return {"url": url, "status": status, "headers": response_headers, "body": body,
+                    "sink": sink, "elapsed_ms": round((time.perf_counter() - start) * 1000)}
+        raise FetchError(f"more than {MAX_REDIRECTS} redirects")
+
+    async def close(self):
+        for conns in self._idle.values():
+            for _, writer in conns:
+                writer.close()
+        self._idle.clear()
+
+
+class HostThrottle:
+    """Per-host politeness: at least `delay` seconds between request starts."""
+
+    def __init__(self, delay=DELAY):
+        self.delay = delay
+        self._locks = {}
+        self._next = {}
+
+    async def wait(self, url):
+        host = urlsplit(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            pause = self._next.get(host, 0) - loop.time()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            self._next[host] = loop.time() + self.delay
+
+
+# ============================================================
+# RESPONSE DECODING
+# ============================================================
+
+def decode_body(body, headers):
+    """Text of a buffered (non-HTML) body such as robots.txt."""
+    charset = charset_from_content_type(headers.get("content-type", "")) or "utf-8"
+    try:
+        return body.decode(charset, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+# ============================================================
+# ROBOTS.TXT AND SITEMAP DISCOVERY
+# ============================================================
+
+async def fetch_robots(get, root):
+    """(robots.txt text or None, HTTP status or None, compiled policy). A
+    missing file allows everything; a server error, timeout or failed
+    connection disallows everything, as crawlers must (RFC 9309)."""
+    try:
+        resp = await get(urljoin(root, "/robots.txt"))
+    except (asyncio.TimeoutError, *FETCH_ERRORS):
+        return None, None, DISALLOW_ALL
+    text = decode_body(resp["body"], resp["headers"]) if resp["status"] < 400 else None
+    return text, resp["status"], policy_for_status(text, resp["status"])
+
+
+async def fetch_llms(get, root):
+    """(llms.txt record or None, HTTP status or None). The body is streamed
+    into geo_llms' parser as it arrives."""
+    try:
+        resp = await get(urljoin(root, LLMS_PATH), stream_to=llms_sink)
+    except (asyncio.TimeoutError, *FETCH_ERRORS):
+        return None, None
+    return (resp["sink"].close() if resp["sink"] is not None else None), resp["status"]
+
+
+async def fetch_sitemap_urls(get, root, robots_text, limit):
+    """Page URLs from the sitemap(s) declared in robots.txt, else /sitemap.xml.
+    Follows sitemap indexes; stops once `limit` URLs are collected."""
+    queue = [line.split(":", 1)[1].strip() for line in (robots_text or "").splitlines()
+             if line.lower().startswith("sitemap:")] or [urljoin(root, "/sitemap.xml")]
+    seen, urls = set(), []
+    while queue and len(seen) < MAX_SITEMAPS and len(urls) < limit:
+        sitemap = queue.pop(0)
+        if sitemap in seen:
+            continue
+        seen.add(sitemap)
+        try:
+            resp = await get(sitemap)
+            if resp["status"] >= 400:
+                continue
+            tree = ElementTree.fromstring(resp["body"])
+        except (asyncio.TimeoutError, ElementTree.ParseError, *FETCH_ERRORS):
+            continue
+        is_index = tree.tag.endswith("sitemapindex")
+        for loc in tree.iter():
+            if loc.tag.endswith("loc") and loc.text:
+                (queue if is_index else urls).append(loc.text.strip())
+    return urls[:limit]
+
+
+def prioritize(urls, homepage_links, limit):
+    """Order candidate URLs by navigation hierarchy: pages linked from the
+    homepage first, then shallower paths, then sitemap order."""
+    linked = set(homepage_links)
+    unique = list(dict.fromkeys(urls))
+    ranked = sorted(range(len(unique)), key=lambda i: (
+        unique[i] not in linked, urlsplit(unique[i]).path.rstrip("/").count("/"), i))
+    return [unique[i] for i in ranked][:limit]
+
+
+# ============================================================
+# CRAWL
+# ============================================================
+
+async def crawl_site(start_url, max_pages=MAX_PAGES, concurrency=CONCURRENCY, delay=DELAY,
+                     timeout=TIMEOUT, user_agent=USER_AGENT, cache_dir=None, archive_dir=None,
+                     replay_dir=None, replay_at=None):
+    """Crawl one site and return a crawl dict:
+
+        {"start_url", "robots_txt", "robots_status", "llms", "llms_status", "sitemap_urls",
+         "pages": [page records], "skipped": [{"url", "reason"}], "stats": {...}}
+
+    Each page record holds url, final_url, status, content_type, elapsed_ms
+    and error, plus the geo_html_extract page record fields for HTML
+    responses. llms is the geo_llms record of /llms.txt (None when missing
+    or disallowed). With a cache_dir, requests are conditional and pages
+    that answer 304 Not Modified reuse their cached record. With an
+    archive_dir every body received is archived; with a replay_dir the
+    crawl is answered from that archive as of replay_at (epoch seconds,
+    default latest) without touching the network.
+    """
+    archive = PageArchive(replay_dir or archive_dir) if (replay_dir or archive_dir) else None
+    if replay_dir:
+        pool, cache = ArchiveFetcher(archive, replay_at), None
+    else:
+        pool = HttpPool(timeout=timeout, user_agent=user_agent)
+        cache = ResponseCache(cache_dir) if cache_dir else None
+    throttle = HostThrottle(delay)
+    semaphore = asyncio.Semaphore(concurrency)
+    root = f"{urlsplit(start_url).scheme}://{urlsplit(start_url).netloc}/"
+    crawled_at = time.time()
+    started = time.perf_counter()
+
+    async def polite_get(url, stream_to=None):
+        if replay_dir:
+            try:
+                return await pool.get(url, stream_to=stream_to)
+            except ArchiveError as exc:
+                raise FetchError(str(exc)) from exc
+        tees = []
+
+        def teeing(target, status, headers):
+            sink = stream_to(target, status, headers)
+            if sink is not None:
+                tees.append(TeeSink(sink))
+                return tees[-1]
+            return sink
+
+        # A 304 only helps the archive if it already holds the body (a crawl
+        # with --cache alone leaves it empty); otherwise ask for the full body,
+        # and ask again if the archived body was evicted while this request ran.
+        for revalidate in (archive is None or archive.lookup(url) is not None, False):
+            await throttle.wait(url)
+            tees.clear()
+            fetch = pool.get if cache is None else functools.partial(cache.get, pool.get, revalidate=revalidate)
+            resp = await fetch(url, stream_to=teeing if stream_to and archive is not None else stream_to)
+            if archive is None:
+                return resp
+            if not resp.get("not_modified"):
+                archive.put(url, tees[-1].body() if tees else resp["body"], resp["status"],
+                            resp["headers"].get("content-type"), resp["url"], crawled_at)
+                return resp
+            if archive.revisit(url, crawled_at):
+                return resp
+
+    def html_extractor(final_url, status, headers):
+        content_type = headers.get("content-type", "")
+        if "html" in content_type or not content_type:
+            return PageExtractor(final_url, charset_from_content_type(content_type))
+        return None
+
+    async def fetch_page(url):
+        record = {"url": url, "final_url": None, "status": None, "content_type": None,
+                  "elapsed_ms": None, "error": None}
+        async with semaphore:
+            try:
+                resp = await polite_get(url, stream_to=html_extractor)
+            except asyncio.TimeoutError:
+                record["error"] = f"timeout after {timeout:g}s"
+                return record
+            except FETCH_ERRORS as exc:
+                record["error"] = f"{type(exc).__name__}: {exc}"
+                return record
+        content_type = resp["headers"].get("content-type", "")
+        record.update(final_url=resp["url"], status=resp["status"],
+                      content_type=content_type.split(";")[0].strip() or None,
+                      elapsed_ms=resp["elapsed_ms"])
+        if resp["sink"] is not None:
+            record.update(resp["sink"].close())
+        return record
+
+    try:
+        robots_text, robots_status, robots = await fetch_robots(polite_get, root)
+        pages, skipped = [], []
+        if robots.can_fetch(user_agent, start_url):
+            pages.append(await fetch_page(start_url))
+        else:
+            skipped.append({"url": start_url, "reason": "disallowed by robots.txt"})
+        llms, llms_status = None, None
+        if robots.can_fetch(user_agent, urljoin(root, LLMS_PATH)):
+            llms, llms_status = await fetch_llms(polite_get, root)
+        sitemap_urls = await fetch_sitemap_urls(polite_get, root, robots_text, limit=max_pages * 4)
+
+        host = urlsplit(start_url).netloc
+        homepage_links = pages[0].get("links", {}).get("internal", []) if pages else []
+        candidates = [u for u in (sitemap_urls or homepage_links)
+                      if urlsplit(u).netloc == host and u.rstrip("/") != start_url.rstrip("/")]
+        allowed = []
+        for url in prioritize(candidates, homepage_links, len(candidates)):
+            if not robots.can_fetch(user_agent, url):
+                skipped.append({"url": url, "reason": "disallowed by robots.txt"})
+            elif len(allowed) < max_pages - len(pages):
+                allowed.append(url)
+
+        pages += await asyncio.gather(*(fetch_page(u) for u in allowed))
+    finally:
+        await pool.close()
+        if archive is not None:
+            archive.close()
+
+    return {
+        "start_url": start_url,
+        "robots_txt": robots_text,
+        "robots_status": robots_status,
+        "llms": llms,
+        "llms_status": llms_status,
+        "sitemap_urls": sitemap_urls,
+        "pages": pages,
+        "skipped": skipped,
+        "stats": {
+            "pages": len(pages),
+            "errors": sum(1 for p in pages if p["error"]),
+            "connections": pool.connections_opened,
+            "body_bytes": pool.bytes_received,
+            "not_modified": cache.not_modified if cache is not None else 0,
+            "seconds": round(time.perf_counter() - started, 2),
+        },
+    }
+
+
+def crawl(start_url, **options):
+    """Synchronous wrapper around crawl_site() for the report generators."""
+    return asyncio.run(crawl_site(start_url, **options))
+
+
+# ============================================================
+# SELF-CHECK (LOCAL SERVER)
+# ============================================================
+
+def _raw_deflate(data):
+    c = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return c.compress(data) + c.flush()
+
+
+def _check_site(root):
+    """path -> (status, headers, body, bytes actually sent or None for all)
+    of a small site whose pages misbehave in the ways real servers do."""
+    page = b"<html><head><title>%s</title></head><body><p>Check page.</p></body></html>"
+    sitemap = (b'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+               + b"".join(b"<url><loc>%s%s</loc></url>" % (root.encode("ascii"), path) for path in
+                          (b"truncated", b"raw-deflate", b"zlib-deflate", b"bad-gzip", b"ok"))
+               + b"</urlset>")
+    html = {"content-type": "text/html; charset=utf-8"}
+    return {
+        "/": (200, html, page % b"Home", None),
+        "/robots.txt": (200, {"content-type": "text/plain"}, b"User-agent: *\nAllow: /\n", None),
+        "/sitemap.xml": (200, {"content-type": "application/xml", "content-encoding": "deflate"},
+                         _raw_deflate(sitemap), None),
+        "/llms.txt": (200, {"content-type": "text/plain"}, b"# Check\n" * 200, 11),
+        "/truncated": (200, html, page % b"Truncated" + b" " * 1000, 11),
+        "/raw-deflate": (200, dict(html, **{"content-encoding": "deflate"}), _raw_deflate(page % b"Raw"), None),
+        "/zlib-deflate": (200, dict(html, **{"content-encoding": "deflate"}), zlib.compress(page % b"Zlib"), None),
+        "/bad-gzip": (200, dict(html, **{"content-encoding": "gzip"}), b"definitely not gzip data", None),
+        "/ok": (200, html, page % b"OK", None),
+    }
+
+
+async def _serve_check_site(reader, writer, site):
+    try:
+        request = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        path = request.split()[1].decode("latin-1") if len(request.split()) > 1 else "/"
+        status, headers, body, sent = site.get(path, (404, {"content-type": "text/plain"}, b"missing", None))
+        head = [f"HTTP/1.1 {status} X", f"Content-Length: {len(body)}", "Connection: close"]
+        head += [f"{k}: {v}" for k, v in headers.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body[:sent])
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def self_check():
+    """Crawl a local server that truncates bodies and sends raw-deflate and
+    undecodable responses; returns [(check, passed, detail)]."""
+    site = {}
+    server = await asyncio.start_server(lambda r, w: _serve_check_site(r, w, site), "127.0.0.1", 0)
+    root = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/"
+    site.update(_check_site(root))
+    async with server:
+        result = await crawl_site(root, delay=0, timeout=5)
+    pages = {urlsplit(p["url"]).path: p for p in result["pages"]}
+    truncated, bad_gzip = pages.get("/truncated", {}), pages.get("/bad-gzip", {})
+    return [
+        ("crawl finished with every sitemap page", len(pages) == 6, sorted(pages)),
+        ("raw-deflate sitemap decoded", len(result["sitemap_urls"]) == 5, result["sitemap_urls"]),
+        ("truncated body is a page error", "IncompleteRead" in (truncated.get("error") or ""),
+         truncated.get("error")),
+        ("undecodable gzip is a page error", "error" in (bad_gzip.get("error") or "").lower(), bad_gzip.get("error")),
+        ("raw deflate page decoded", pages.get("/raw-deflate", {}).get("title") == "Raw",
+         pages.get("/raw-deflate", {}).get("error")),
+        ("zlib deflate page decoded", pages.get("/zlib-deflate", {}).get("title") == "Zlib",
+         pages.get("/zlib-deflate", {}).get("error")),
+        ("truncated llms.txt is treated as missing", result["llms_status"] is None, result["llms_status"]),
+        ("other pages unaffected", pages.get("/ok", {}).get("title") == "OK", pages.get("/ok", {}).get("error")),
+    ]
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Crawl a site for a GEO audit (Phase 1 discovery).")
+    parser.add_argument("url", nargs="?", help="Site homepage, e.g. https://example.com/")
+    parser.add_argument("-o", "--output", help="Write the crawl as JSON to this file (default: stdout)")
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES,
+                        help=f"Pages to fetch including the homepage (default: {MAX_PAGES})")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY,
+                        help=f"Requests in flight at once (default: {CONCURRENCY})")
+    parser.add_argument("--delay", type=float, default=DELAY,
+                        help=f"Seconds between requests to the same host (default: {DELAY:g})")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT,
+                        help=f"Per-page timeout in seconds (default: {TIMEOUT:g})")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="Conditional-GET response cache; unchanged pages are revalidated, not re-fetched")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--archive", metavar="DIR", help="Keep every body received in this page archive")
+    source.add_argument("--replay", metavar="DIR", help="Crawl offline from this page archive")
+    parser.add_argument("--at", metavar="YYYY-MM-DD", help="With --replay: the archive as of this date")
+    parser.add_argument("--self-check", action="store_true",
+                        help="Crawl a local test server with broken responses and report, instead of a site")
+    args = parser.parse_args()
+
+    if args.self_check:
+        checks = asyncio.run(self_check())
+        for name, passed, detail in checks:
+            print(f"  {'ok  ' if passed else 'FAIL'}  {name}" + ("" if passed else f": {detail}"))
+        sys.exit(0 if all(passed for _, passed, _ in checks) else 1)
+    if not args.url:
+        parser.error("a site URL is required (or --self-check)")
+
+    result = crawl(args.url, max_pages=args.max_pages, concurrency=args.concurrency,
+                   delay=args.delay, timeout=args.timeout, cache_dir=args.cache, archive_dir=args.archive,
+                   replay_dir=args.replay, replay_at=archive_time(args.at) if args.at else None)
+    text = json.dumps(result, indent=1, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        stats = result["stats"]
+        print(f"Crawled {stats['pages']} pages ({stats['errors']} errors, "
+              f"{len(result['skipped'])} skipped) in {stats['seconds']}s -> {args.output}")
+        if args.cache:
+            print(f"  {stats['not_modified']} not modified, {stats['body_bytes']:,} body bytes received")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Deterministic Build Settings for the GEO PDF generators.
+
+ReportLab stamps the wall-clock time into /CreationDate and /ModDate and
+seeds the document /ID from it, so two renders of the same data never
+match byte for byte. In deterministic mode the build date is pinned and
+ReportLab runs in invariant mode: dates are taken as if SOURCE_DATE_EPOCH
+were set to the build date, and the /ID is derived from the document
+content alone.
+"""
+
+import calendar
+import contextlib
+import functools
+import os
+from datetime import date, datetime, timezone
+
+from reportlab import rl_config
+from reportlab.lib.utils import TimeStamp
+from reportlab.pdfbase import pdfdoc
+
+
+def resolve_build_date(value=None, deterministic=False):
+    """Pick the build date: --build-date (YYYY-MM-DD), then SOURCE_DATE_EPOCH,
+    then today. Deterministic builds refuse to fall back to today."""
+    if value:
+        return date.fromisoformat(value)
+    epoch = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc).date()
+    if deterministic:
+        raise ValueError("deterministic builds need a pinned date: pass --build-date or set SOURCE_DATE_EPOCH")
+    return date.today()
+
+
+@contextlib.contextmanager
+def _source_date_epoch(epoch):
+    """SOURCE_DATE_EPOCH=epoch for the duration of the block, then as before."""
+    saved = os.environ.get("SOURCE_DATE_EPOCH")
+    os.environ["SOURCE_DATE_EPOCH"] = str(epoch)
+    try:
+        yield
+    finally:
+        if saved is None:
+            del os.environ["SOURCE_DATE_EPOCH"]
+        else:
+            os.environ["SOURCE_DATE_EPOCH"] = saved
+
+
+def _pinned_timestamp(epoch, invariant=None):
+    """ReportLab's TimeStamp as it reads SOURCE_DATE_EPOCH, taken at epoch."""
+    with _source_date_epoch(epoch):
+        return TimeStamp(invariant)
+
+
+def apply_pdf_invariance(build_date=None):
+    """Pin ReportLab's metadata dates to midnight UTC on build_date and fix the /ID.
+
+    Without a build_date the pinned date is resolved as for
+    --deterministic (SOURCE_DATE_EPOCH, else ValueError). Process-wide; call
+    it in every worker before rendering. The environment is left as it was,
+    so child processes do not inherit a SOURCE_DATE_EPOCH.
+    """
+    if build_date is None:
+        build_date = resolve_build_date(deterministic=True)
+    epoch = calendar.timegm(build_date.timetuple())
+    pdfdoc.TimeStamp = functools.partial(_pinned_timestamp, epoch)
+    rl_config.invariant = 1
@@ -0,0 +1,64 @@
+"""
+Form XObject Cache for repeated vector drawings.
+
+Score rings, gauges and scales are rebuilt from the same arguments over and
+over, both within one document and across a client batch. `form_cached`
+memoises a Drawing factory per process and returns a FormDrawing flowable,
+which emits the drawing's vector operators once per PDF as a named form
+XObject and references it with a single `Do` operator everywhere it
+reappears.
+"""
+
+import functools
+import hashlib
+
+from reportlab.graphics import renderPDF
+from reportlab.platypus import Flowable
+
+MAX_CACHED_DRAWINGS = 512
+
+
+class FormDrawing(Flowable):
+    """Flowable that draws a Drawing through a per-document form XObject."""
+
+    def __init__(self, key, drawing):
+        Flowable.__init__(self)
+        self.key = key
+        self.drawing = drawing
+        self.hAlign = getattr(drawing, "hAlign", "LEFT")
+        # repr() of ints, strings and reportlab Colors is stable across runs,
+        # so form names (and --deterministic output) are too
+        self.form_name = "GeoForm" + hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+
+    def wrap(self, availWidth, availHeight):
+        return self.drawing.wrap(availWidth, availHeight)
+
+    def draw(self):
+        canv = self.canv
+        if not canv.hasForm(self.form_name):
+            # Drawings routinely place labels outside their nominal box, and a
+            # form's BBox clips, so leave generous room on every side
+            width, height = self.drawing.wrap(0, 0)
+            pad = max(width, height)
+            canv.beginForm(self.form_name, -pad, -pad, width + pad, height + pad)
+            renderPDF.draw(self.drawing, canv, 0, 0, showBoundary=False)
+            canv.endForm()
+        canv.doForm(self.form_name)
+
+
+def form_cached(func):
+    """Decorator for Drawing factories: build each unique (function, args)
+    drawing once per process and return it wrapped in a FormDrawing.
+
+    Arguments must be hashable (numbers, strings, Colors, tuples).
+    """
+    build = functools.lru_cache(maxsize=MAX_CACHED_DRAWINGS)(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        return FormDrawing(key, build(*args, **kwargs))
+
+    wrapper.cache_info = build.cache_info
+    wrapper.cache_clear = build.cache_clear
+    return wrapper
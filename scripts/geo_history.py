@@ -0,0 +1,267 @@
+#!/home/claude-runner/.claude/skills/geo/venv/bin/python3
+"""
+GEO Audit History — an embedded SQLite store of past audit results.
+
+Every run of the analysis modules (geo_modules.run_modules) can be recorded
+against its site and date; the report generators then query score time
+series for the trend and roadmap visuals instead of hard-coding them.
+
+The database runs in WAL mode, so a batch writing new audits never blocks
+report workers reading it. Scores are stored one row per (site, category,
+date) in WITHOUT ROWID tables keyed in that order, so one site's series
+for one category is a single contiguous range scan of the primary key and
+its latest score on a date one index probe; portfolio queries make one
+such probe per site, and an index on date serves queries across sites by
+audit date. Years of weekly audits for hundreds of sites are a few million
+rows and any report query stays in the low milliseconds.
+
+    with AuditHistory("history.db") as history:
+        history.record("https://example.com/", results, "2026-02-01")
+        points = history.series("https://example.com/")      # composite
+        points = history.series("https://example.com/", "Technical GEO")
+
+Usage:
+    python3 geo_history.py history.db record results.json --site URL [--date YYYY-MM-DD]
+    python3 geo_history.py history.db series URL [--category NAME] [--since YYYY-MM-DD]
+    python3 geo_history.py history.db portfolio [--category NAME] [--on YYYY-MM-DD]
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import date, datetime
+
+SCHEMA_VERSION = 1
+PACE_DAYS = 30             # pace is reported in points per this many days
+MIN_PACE_SPAN = 14         # days of history before a pace is meaningful
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sites (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS audits (
+    site_id INTEGER NOT NULL REFERENCES sites (id),
+    audited_at TEXT NOT NULL,
+    composite INTEGER,
+    coverage INTEGER,
+    label TEXT,
+    findings INTEGER,
+    PRIMARY KEY (site_id, audited_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS audits_by_date ON audits (audited_at, site_id);
+CREATE TABLE IF NOT EXISTS scores (
+    site_id INTEGER NOT NULL REFERENCES sites (id),
+    category TEXT NOT NULL,
+    audited_at TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (site_id, category, audited_at)
+) WITHOUT ROWID;
+"""
+
+
+def _day(value):
+    """ISO date string for a date, datetime or "YYYY-MM-DD" (None: today)."""
+    if value is None:
+        return date.today().isoformat()
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return date.fromisoformat(str(value)[:10]).isoformat()
+
+
+# ============================================================
+# STORE
+# ============================================================
+
+class AuditHistory:
+    """Audit results by site and date in one SQLite (WAL) database file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"{path}: history schema v{version} is newer than v{SCHEMA_VERSION}")
+        with self.db:
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._site_ids = {}
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _site_id(self, url, create=False):
+        if url not in self._site_ids:
+            row = self.db.execute("SELECT id FROM sites WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                if not create:
+                    return None
+                row = (self.db.execute("INSERT INTO sites (url) VALUES (?)", (url,)).lastrowid,)
+            self._site_ids[url] = row[0]
+        return self._site_ids[url]
+
+    # -- writing ----------------------------------------------------------
+
+    def _insert(self, site, result, audited_at):
+        site_id, day = self._site_id(site, create=True), _day(audited_at)
+        findings = sum(len(m.get("findings", [])) for m in result.get("modules", {}).values())
+        self.db.execute("INSERT OR REPLACE INTO audits VALUES (?, ?, ?, ?, ?, ?)",
+                        (site_id, day, result.get("composite"), result.get("coverage"),
+                         result.get("label"), findings))
+        self.db.execute("DELETE FROM scores WHERE site_id = ? AND audited_at = ?", (site_id, day))
+        self.db.executemany("INSERT INTO scores VALUES (?, ?, ?, ?)",
+                            [(site_id, category, day, score)
+                             for category, score in result.get("categories", {}).items()
+                             if score is not None])
+
+    def record(self, site, result, audited_at=None):
+        """Store one geo_modules run_modules() result (re-recording a site
+        on the same date replaces that audit)."""
+        with self.db:
+            self._insert(site, result, audited_at)
+
+    def record_many(self, audits):
+        """Store (site, result, audited_at) triples in one transaction."""
+        with self.db:
+            for site, result, audited_at in audits:
+                self._insert(site, result, audited_at)
+
+    # -- queries ----------------------------------------------------------
+
+    def sites(self):
+        return [url for url, in self.db.execute("SELECT url FROM sites ORDER BY url")]
+
+    def series(self, site, category=None, since=None, until=None):
+        """[(date, score), ...] oldest first: the composite, or one category."""
+        site_id = self._site_id(site)
+        if site_id is None:
+            return []
+        low, high = _day(since) if since else "", _day(until) if until else "9999"
+        if category is None:
+            rows = self.db.execute(
+                "SELECT audited_at, composite FROM audits WHERE site_id = ? AND audited_at BETWEEN ? AND ?"
+                " AND composite IS NOT NULL ORDER BY audited_at", (site_id, low, high))
+        else:
+            rows = self.db.execute(
+                "SELECT audited_at, score FROM scores WHERE site_id = ? AND category = ?"
+                " AND audited_at BETWEEN ? AND ? ORDER BY audited_at", (site_id, category, low, high))
+        return rows.fetchall()
+
+    def latest(self, site, on=None):
+        """The site's most recent audit on or before `on` (default: ever):
+        {"audited_at", "composite", "coverage", "label", "findings",
+        "categories": {name: score}}, or None."""
+        site_id = self._site_id(site)
+        if site_id is None:
+            return None
+        row = self.db.execute(
+            "SELECT audited_at, composite, coverage, label, findings FROM audits"
+            " WHERE site_id = ? AND audited_at <= ? ORDER BY audited_at DESC LIMIT 1",
+            (site_id, _day(on) if on else "9999")).fetchone()
+        if row is None:
+            return None
+        audit = dict(zip(("audited_at", "composite", "coverage", "label", "findings"), row))
+        audit["categories"] = dict(self.db.execute(
+            "SELECT category, score FROM scores WHERE site_id = ? AND audited_at = ?", (site_id, row[0])))
+        return audit
+
+    def portfolio(self, category=None, on=None):
+        """{site: (date, score)}: every site's latest composite (or category
+        score) on or before `on`."""
+        day = _day(on) if on else "9999"
+        # sites drive the join (CROSS JOIN fixes the order): one primary-key probe
+        # per site rather than a scan of every audit
+        if category is None:
+            rows = self.db.execute(
+                "SELECT url, audited_at, composite FROM sites CROSS JOIN audits ON site_id = id"
+                " AND audited_at = (SELECT MAX(audited_at) FROM audits"
+                "                   WHERE site_id = id AND audited_at <= ? AND composite IS NOT NULL)",
+                (day,))
+        else:
+            rows = self.db.execute(
+                "SELECT url, audited_at, score FROM sites CROSS JOIN scores ON site_id = id AND category = ?"
+                " AND audited_at = (SELECT MAX(audited_at) FROM scores"
+                "                   WHERE site_id = id AND category = ? AND audited_at <= ?)",
+                (category, category, day))
+        return {url: (audited_at, score) for url, audited_at, score in rows}
+
+    def audits_between(self, since, until=None):
+        """[(site, date, composite), ...] of every audit in a date range,
+        oldest first."""
+        return self.db.execute(
+            "SELECT url, audited_at, composite FROM audits JOIN sites ON sites.id = site_id"
+            " WHERE audited_at BETWEEN ? AND ? ORDER BY audited_at, url",
+            (_day(since), _day(until) if until else "9999")).fetchall()
+
+
+# ============================================================
+# TRENDS
+# ============================================================
+
+def pace(points, days=PACE_DAYS):
+    """Least-squares score change per `days` over [(date, score), ...], or
+    None with fewer than two audits or under MIN_PACE_SPAN days of history."""
+    if len(points) < 2:
+        return None
+    xs = [date.fromisoformat(_day(d)).toordinal() for d, _ in points]
+    if xs[-1] - xs[0] < MIN_PACE_SPAN:
+        return None
+    ys = [s for _, s in points]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    var = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var * days if var else None
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Record and query GEO audit history.")
+    parser.add_argument("db", help="History database (SQLite; created if missing)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="Store a geo_modules.py results JSON")
+    record.add_argument("results", help="Results JSON written by geo_modules.py -o")
+    record.add_argument("--site", required=True, help="Site the results belong to")
+    record.add_argument("--date", help="Audit date, YYYY-MM-DD (default: today)")
+    series = commands.add_parser("series", help="Score time series for one site")
+    series.add_argument("site")
+    series.add_argument("--category", help="Category name (default: the composite)")
+    series.add_argument("--since", help="First date, YYYY-MM-DD")
+    portfolio = commands.add_parser("portfolio", help="Latest score of every site")
+    portfolio.add_argument("--category", help="Category name (default: the composite)")
+    portfolio.add_argument("--on", help="As of this date, YYYY-MM-DD (default: latest)")
+    args = parser.parse_args()
+
+    try:
+        with AuditHistory(args.db) as history:
+            if args.command == "record":
+                with open(args.results, encoding="utf-8") as f:
+                    history.record(args.site, json.load(f), args.date)
+                print(f"Recorded {args.site} ({_day(args.date)}) in {args.db}")
+            elif args.command == "series":
+                points = history.series(args.site, args.category, args.since)
+                for day, score in points:
+                    print(f"  {day}  {score:3d}")
+                trend = pace(points)
+                if trend is not None:
+                    print(f"  pace: {trend:+.1f} points / {PACE_DAYS} days over {len(points)} audits")
+            else:
+                for site, (day, score) in sorted(history.portfolio(args.category, args.on).items()):
+                    print(f"  {score:3d}  {day}  {site}")
+    except ValueError as exc:
+        sys.exit(str(exc))
+
+
+if __name__ == "__main__":
+    main()
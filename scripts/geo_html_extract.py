@@ -0,0 +1,232 @@
+"""
+Single-Pass Streaming HTML Extraction for page records.
+
+PageExtractor is fed the response body chunk by chunk as it arrives from
+the network (raw bytes; decoding is incremental) and collects every field
+of a page record in one pass over the tag/text events, without building a
+DOM: title, lang, meta description/robots, canonical, Open Graph, headings,
+visible word count, JSON-LD blocks, links, images and the text blocks
+(headings and paragraphs, navigation and footer left out) that passage
+analysis works on. State is the fields themselves plus a stack of open
+elements for end-tag matching (which grows with nesting depth) and, until
+the charset is known, up to SNIFF_BYTES of undecoded input; the document
+as a whole is never held.
+
+    extractor = PageExtractor(url, charset_from_content_type(content_type))
+    for chunk in body_chunks:
+        extractor.feed(chunk)
+    record = extractor.close()
+"""
+
+import codecs
+import json
+import re
+from html.parser import HTMLParser
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+SKIP_TEXT_TAGS = frozenset(("script", "style", "noscript", "template", "svg", "head"))
+VOID_TAGS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input",
+                       "link", "meta", "source", "track", "wbr"))
+BLOCK_TAGS = frozenset(("p", "div", "li", "ul", "ol", "dl", "dt", "dd", "td", "th", "tr", "table",
+                        "blockquote", "pre", "figcaption", "section", "article", "main",
+                        "header", "aside", "form", "br", "hr"))
+CHROME_TAGS = frozenset(("nav", "footer"))
+HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([A-Za-z0-9_.:-]+)""", re.I)
+HEAD_END = re.compile(rb"</head", re.I)
+SNIFF_BYTES = 2048  # bytes to look through for <meta charset> before choosing a decoder
+
+
+def charset_from_content_type(content_type):
+    """The charset parameter of a Content-Type header, or None."""
+    if "charset=" not in (content_type or ""):
+        return None
+    return content_type.split("charset=", 1)[1].split(";")[0].strip().strip('"\'') or None
+
+
+class PageExtractor(HTMLParser):
+    """Event-driven page record extractor; feed() bytes, then close()."""
+
+    def __init__(self, base_url, charset=None):
+        HTMLParser.__init__(self, convert_charrefs=True)
+        self.base_url = base_url
+        self.charset = charset
+        self._decoder = None
+        self._pending = b""      # raw bytes held back until the charset is known
+        self.title = []
+        self.lang = None
+        self.meta = {}
+        self.canonical = None
+        self.headings = []
+        self.words = 0
+        self.json_ld = []
+        self.links = []
+        self.images = []
+        self._open = []          # open non-void elements, for end-tag matching
+        self._skip_depth = 0     # open elements whose text is not page copy
+        self.blocks = []
+        self._text = []          # text run since the last tag event
+        self._block = []         # text runs of the current text block
+        self._chrome_depth = 0   # open nav/footer elements
+        self._heading = None
+        self._in_title = False
+        self._json_ld_buf = None
+
+    # -- byte input -------------------------------------------------------
+
+    def feed(self, data):
+        if isinstance(data, bytes):
+            if self._decoder is None:
+                self._pending += data
+                if (self.charset is None and len(self._pending) < SNIFF_BYTES
+                        and not HEAD_END.search(self._pending)):
+                    return  # no header charset: wait for <meta charset> to arrive
+                data, self._pending = self._pending, b""
+                self._decoder = self._make_decoder(data)
+            data = self._decoder.decode(data)
+        HTMLParser.feed(self, data)
+
+    def _make_decoder(self, head):
+        charset = self.charset
+        if charset is None:
+            match = META_CHARSET.search(head[:SNIFF_BYTES])
+            charset = match.group(1).decode("ascii") if match else "utf-8"
+        try:
+            return codecs.getincrementaldecoder(charset)(errors="replace")
+        except LookupError:
+            return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def close(self):
+        """Finish parsing and return the page record dict."""
+        if self._decoder is None and self._pending:
+            self._decoder = self._make_decoder(self._pending)
+            HTMLParser.feed(self, self._decoder.decode(self._pending))
+            self._pending = b""
+        if self._decoder is not None:
+            HTMLParser.feed(self, self._decoder.decode(b"", final=True))
+        HTMLParser.close(self)
+        self._flush_text()
+        self._end_block()
+        return self.record()
+
+    # -- events -----------------------------------------------------------
+
+    def _flush_text(self):
+        if self._text:
+            run = "".join(self._text)
+            self._text = []
+            self.words += len(run.split())
+            if self._heading is not None:
+                self._heading[1].append(run)
+            if not self._chrome_depth:
+                self._block.append(run)
+
+    def _end_block(self, level=0):
+        if self._block:
+            text = " ".join("".join(self._block).split())
+            self._block = []
+            if text:
+                self.blocks.append([level, text])
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        a = {k: (v or "") for k, v in attrs}
+        if tag == "html":
+            self.lang = a.get("lang") or None
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "meta":
+            name = (a.get("name") or a.get("property") or "").lower()
+            if name and "content" in a:
+                self.meta[name] = a["content"]
+        elif tag == "link":
+            if "canonical" in a.get("rel", "").lower().split():
+                self.canonical = urljoin(self.base_url, a.get("href", ""))
+        elif tag == "a":
+            if a.get("href"):
+                self.links.append(urldefrag(urljoin(self.base_url, a["href"]))[0])
+        elif tag == "img":
+            self.images.append({"src": urljoin(self.base_url, a.get("src", "")), "alt": a.get("alt")})
+        elif tag in HEADING_TAGS:
+            self._end_block()
+            self._heading = [HEADING_TAGS[tag], []]
+        elif tag == "script" and a.get("type", "").lower() == "application/ld+json":
+            self._json_ld_buf = []
+        if tag in BLOCK_TAGS:
+            self._end_block()
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+            if tag in SKIP_TEXT_TAGS:
+                self._skip_depth += 1
+            elif tag in CHROME_TAGS:
+                self._chrome_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if tag in self._open:
+            while self._open:
+                closed = self._open.pop()
+                if closed in SKIP_TEXT_TAGS:
+                    self._skip_depth -= 1
+                elif closed in CHROME_TAGS:
+                    self._chrome_depth -= 1
+                if closed == tag:
+                    break
+        if tag == "title":
+            self._in_title = False
+        elif self._heading is not None and HEADING_TAGS.get(tag) == self._heading[0]:
+            self._end_block(self._heading[0])
+            self.headings.append([self._heading[0], " ".join(" ".join(self._heading[1]).split())])
+            self._heading = None
+        elif tag == "script" and self._json_ld_buf is not None:
+            raw = "".join(self._json_ld_buf).strip()
+            try:
+                self.json_ld.append(json.loads(raw))
+            except ValueError as exc:
+                self.json_ld.append({"@error": str(exc), "@raw": raw[:500]})
+            self._json_ld_buf = None
+        elif tag in BLOCK_TAGS:
+            self._end_block()
+
+    def handle_data(self, data):
+        if self._json_ld_buf is not None:
+            self._json_ld_buf.append(data)
+        elif self._in_title:
+            self.title.append(data)
+        elif not self._skip_depth:
+            self._text.append(data)
+
+    # -- result -----------------------------------------------------------
+
+    def record(self):
+        host = urlsplit(self.base_url).netloc
+        internal, external = set(), set()
+        for target in self.links:
+            if target.startswith(("http://", "https://")):
+                (internal if urlsplit(target).netloc == host else external).add(target)
+        return {
+            "title": " ".join("".join(self.title).split()),
+            "lang": self.lang,
+            "meta_description": self.meta.get("description"),
+            "meta_robots": self.meta.get("robots"),
+            "canonical": self.canonical,
+            "open_graph": {k: v for k, v in self.meta.items() if k.startswith("og:")},
+            "headings": self.headings,
+            "word_count": self.words,
+            "json_ld": self.json_ld,
+            "links": {"internal": sorted(internal), "external": sorted(external)},
+            "images": self.images,
+            "blocks": self.blocks,
+        }
+
+
+def extract_page(url, html, charset=None):
+    """Page record for a complete document (str or bytes)."""
+    extractor = PageExtractor(url, charset)
+    extractor.feed(html)
+    return extractor.close()
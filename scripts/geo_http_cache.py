@@ -0,0 +1,136 @@
+"""
+Conditional-GET Response Cache for the crawler.
+
+Responses that carry a validator (ETag or Last-Modified) are kept on disk,
+keyed by normalized URL. On the next crawl the request is sent with
+If-None-Match / If-Modified-Since; a 304 costs a status line and headers
+instead of the body, and the stored response stands in for it. For a
+streamed page the cache keeps what the sink produced (the extracted page
+record), so an unchanged page is neither downloaded nor parsed again; for
+a buffered response (robots.txt, sitemaps) it keeps the body.
+
+Cache layout:
+    <cache_dir>/pages/ab/abcdef....json    validators, status, headers, record
+    <cache_dir>/pages/ab/abcdef....body    buffered body, when there is one
+
+    cache = ResponseCache(cache_dir)
+    resp = await cache.get(pool.get, url, stream_to=factory)
+"""
+
+import hashlib
+import json
+import os
+from urllib.parse import urlsplit, urlunsplit
+
+KEPT_HEADERS = ("content-type", "etag", "last-modified")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url):
+    """Cache key form of a URL: lower-case scheme and host, no default port,
+    no fragment, "/" for an empty path."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+class StoredSink:
+    """Stands in for a streaming sink on a 304: close() returns the record
+    the original sink produced."""
+
+    def __init__(self, record):
+        self.record = record
+
+    def feed(self, data):
+        pass
+
+    def close(self):
+        return self.record
+
+
+class ResponseCache:
+    """On-disk store of validated responses plus the conditional-GET wrapper."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.pages_dir = os.path.join(cache_dir, "pages")
+        os.makedirs(self.pages_dir, exist_ok=True)
+        self.not_modified = 0
+        self.stored = 0
+
+    def _path(self, url):
+        digest = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.pages_dir, digest[:2], digest)
+
+    def lookup(self, url):
+        """The cache entry for `url`, or None."""
+        try:
+            with open(self._path(url) + ".json", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write(self, path, data, mode):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def store(self, url, resp, record=None):
+        """Keep a 200 response that has a validator; `record` is what its
+        streaming sink produced."""
+        headers = resp["headers"]
+        if resp["status"] != 200 or not ("etag" in headers or "last-modified" in headers):
+            return
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if resp["body"]:
+            self._write(path + ".body", resp["body"], "wb")
+        entry = {"url": normalize_url(url), "final_url": resp["url"], "status": resp["status"],
+                 "headers": {k: headers[k] for k in KEPT_HEADERS if k in headers},
+                 "body": bool(resp["body"]), "streamed": resp["sink"] is not None, "record": record}
+        self._write(path + ".json", json.dumps(entry, ensure_ascii=False), "w")
+        self.stored += 1
+
+    def _replay(self, url, entry, resp):
+        body = b""
+        if entry["body"]:
+            with open(self._path(url) + ".body", "rb") as f:
+                body = f.read()
+        self.not_modified += 1
+        return {"url": entry["final_url"], "status": entry["status"], "headers": dict(entry["headers"]),
+                "body": body, "sink": StoredSink(entry["record"]) if entry["streamed"] else None,
+                "elapsed_ms": resp["elapsed_ms"], "not_modified": True}
+
+    async def get(self, fetch, url, headers=None, stream_to=None, revalidate=True):
+        """fetch(url, headers=..., stream_to=...) made conditional: a 304 is
+        answered from the cache, a fresh 200 is stored. The returned
+        response dict is shaped like HttpPool.get()'s; a streamed one has
+        already been closed, its sink replaced by a StoredSink. With
+        revalidate=False the validators are left off, for callers that need
+        the body itself; the response is still stored."""
+        entry = self.lookup(url) if revalidate else None
+        conditional = dict(headers or {})
+        if entry is not None and (entry["streamed"] == (stream_to is not None)):
+            if "etag" in entry["headers"]:
+                conditional["If-None-Match"] = entry["headers"]["etag"]
+            if "last-modified" in entry["headers"]:
+                conditional["If-Modified-Since"] = entry["headers"]["last-modified"]
+        else:
+            entry = None
+
+        def fresh_only(target, status, response_headers):
+            return None if status == 304 else stream_to(target, status, response_headers)
+
+        resp = await fetch(url, headers=conditional, stream_to=fresh_only if stream_to else None)
+        if resp["status"] == 304 and entry is not None:
+            return self._replay(url, entry, resp)
+        record = None
+        if resp["sink"] is not None:
+            record = resp["sink"].close()
+            resp["sink"] = StoredSink(record)
+        self.store(url, resp, record)
+        return resp
@@ -0,0 +1,450 @@
+#!/home/claude-runner/.claude/skills/geo/venv/bin/python3
+"""
+GEO llms.txt Checker — presence, validity and completeness of /llms.txt.
+
+LlmsParser reads an llms.txt line by line as it arrives (feed() bytes or
+text, then close(), the same sink interface as geo_html_extract's
+PageExtractor, so geo_crawler streams the response straight into it) and
+keeps only the outline: the H1 title, the "> summary" blockquote, the H2
+sections with their word, item and link counts, every link and which
+business topics the text covers. Structural problems are recorded with
+their line numbers as they are met, following the llmstxt.org layout:
+
+    # Site name                          (required, exactly one, first)
+    > One-paragraph summary              (recommended)
+    Free-form details                    (optional)
+    ## Section                           (H2-delimited lists of links)
+    - [Page name](https://...): notes
+    ## Optional                          (links a short context may skip)
+
+check_site() then cross-checks the links against the crawled page set
+(broken, unknown and unlisted pages) and scores completeness 0-100;
+check_sites() runs a whole portfolio of crawls in one batch, optionally
+over a process pool.
+
+Usage:
+    python3 geo_llms.py crawl.json [crawl2.json ...] [-j 4] [-o llms.json]
+    python3 geo_llms.py --file llms.txt [--site https://example.com/]
+"""
+
+import argparse
+import codecs
+import json
+import multiprocessing
+import re
+import sys
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+from geo_html_extract import charset_from_content_type
+
+LLMS_PATH = "/llms.txt"
+READ_SIZE = 64 * 1024
+TARGET_PAGES = 10          # key pages a complete llms.txt links to ("10-20 high-value pages")
+MAX_LINKS = 100            # beyond this the file stops being a curated summary
+
+# Business topics a complete AI-readable summary covers, matched against
+# headings and text lines
+TOPICS = [
+    ("about", r"\b(?:about|founded|founder|owner|history|who we are|mission)\b"),
+    ("contact", r"\b(?:phone|e-?mail|contact)\b|\(?\b\d{3}\)?[-.\s]\d{3}[-.]\d{4}\b"),
+    ("locations", r"\b(?:address|locations?|headquarters|offices?)\b"),
+    ("hours", r"\b(?:hours|opening times|monday|weekdays)\b"),
+    ("offerings", r"\b(?:services?|products?|packages?|solutions?|plans?)\b"),
+    ("pricing", r"[$€£]\s?\d|\b(?:prices?|pricing|costs?|quotes?|fees?)\b"),
+    ("faq", r"\b(?:faqs?|frequently asked|questions)\b|^Q:"),
+    ("area", r"\b(?:service areas?|areas? served|serving|regions?|near)\b"),
+]
+# searched separately (one alternation would let "Service" hide "Service Area"),
+# and only for the topics not found yet
+TOPIC_RES = [(name, re.compile(pattern, re.I).search) for name, pattern in TOPICS]
+
+# Weights of the 0-100 completeness score
+SCORE_WEIGHTS = {
+    "title": 10,
+    "summary": 10,
+    "sections": 10,     # at least two H2 sections
+    "topics": 50,       # share of TOPICS covered
+    "link_lists": 10,   # "- [name](url)" lists present
+    "coverage": 10,     # crawled pages linked, against TARGET_PAGES
+}
+
+HEADING = re.compile(r"(#{1,6})\s+(.*?)\s*#*\s*$")
+LIST_ITEM = re.compile(r"\s*(?:[-*+]|\d+[.)])\s+(.*)")
+FILE_LINK = re.compile(r"\[([^\]]*)\]\(\s*([^)\s]*)[^)]*\)(?:\s*:\s*(.*))?")
+INLINE_LINK = re.compile(r"\[[^\]]*\]\(\s*([^)\s]+)[^)]*\)")
+BARE_URL = re.compile(r"https?://[^\s<>()\]\"']+")
+
+
+# ============================================================
+# STREAMING PARSER
+# ============================================================
+
+class LlmsParser:
+    """Line-oriented llms.txt parser; feed() bytes or text, then close()."""
+
+    def __init__(self, url, charset=None, content_type=None):
+        self.url = url
+        self.charset = charset or "utf-8"
+        self.content_type = content_type
+        self._decoder = None
+        self._partial = ""
+        self.line_no = 0
+        self.title = None
+        self.summary = []
+        self.details = 0           # words of free-form text between summary and first H2
+        self.sections = []
+        self.links = []
+        self.topics = set()
+        self.problems = []
+        self.words = 0
+        self._section = None
+        self._summary_open = False  # still in the blockquote right after the H1
+        self._fence = False
+        self._seen_text = False
+
+    # -- input ------------------------------------------------------------
+
+    def feed(self, data):
+        if isinstance(data, bytes):
+            if self._decoder is None:
+                try:
+                    self._decoder = codecs.getincrementaldecoder(self.charset)(errors="replace")
+                except LookupError:
+                    self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            data = self._decoder.decode(data)
+        lines = (self._partial + data).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._line(line.rstrip("\r"))
+
+    def close(self):
+        """Finish parsing and return the llms.txt record dict."""
+        if self._decoder is not None:
+            self._partial += self._decoder.decode(b"", final=True)
+        if self._partial:
+            self._line(self._partial.rstrip("\r"))
+            self._partial = ""
+        if self._fence:
+            self._problem("Low", "Unclosed code fence")
+        return self.record()
+
+    # -- lines ------------------------------------------------------------
+
+    def _problem(self, severity, message, line=None):
+        self.problems.append([severity, line if line is not None else self.line_no, message])
+
+    def _line(self, line):
+        self.line_no += 1
+        stripped = line.strip()
+        if self.line_no == 1:
+            stripped = stripped.lstrip("\ufeff")
+            if stripped.startswith("<") or "html" in (self.content_type or ""):
+                self._problem("Critical", "Served as HTML, not Markdown text")
+        if stripped.startswith("```") or stripped.startswith("~~~"):
+            self._fence = not self._fence
+            return
+        if self._fence:
+            self.words += len(stripped.split())
+            return
+        if not stripped:
+            return
+
+        heading = HEADING.match(stripped)
+        if heading:
+            self._heading(len(heading.group(1)), heading.group(2))
+            return
+        self._seen_text = True
+        self._topics(stripped)
+        self.words += len(stripped.split())
+
+        if stripped.startswith(">"):
+            if self._summary_open:
+                self.summary.append(stripped.lstrip("> ").strip())
+                return
+        else:
+            self._summary_open = False
+
+        item = LIST_ITEM.match(line)
+        if self._section is not None:
+            self._section["words"] += len(stripped.split())
+            if item:
+                self._section["items"] += 1
+        elif self.title is not None and not stripped.startswith(">"):
+            self.details += len(stripped.split())
+
+        if item:
+            link = FILE_LINK.match(item.group(1))
+            if link:
+                name, target, notes = link.groups()
+                if not target:
+                    self._problem("Medium", f"Link \"{name}\" has no URL")
+                else:
+                    self._link(target, name, notes, listed=True)
+                if not name.strip():
+                    self._problem("Low", "Link without a name")
+                rest = item.group(1)[link.end():]
+            else:
+                rest = item.group(1)
+        else:
+            rest = stripped
+        for target in INLINE_LINK.findall(rest):
+            self._link(target, None, None, listed=False)
+        for target in BARE_URL.findall(INLINE_LINK.sub("", rest)):
+            self._link(target.rstrip(".,;:"), None, None, listed=False)
+
+    def _topics(self, text):
+        if len(self.topics) < len(TOPICS):
+            self.topics.update(name for name, search in TOPIC_RES if name not in self.topics and search(text))
+
+    def _heading(self, level, text):
+        self._summary_open = False
+        self._topics(text)
+        if level == 1:
+            if self.title is not None:
+                self._problem("Medium", f"More than one H1 (\"{text}\")")
+                return
+            if self._section is not None or self._seen_text:
+                self._problem("High", "H1 title is not the first line")
+            self.title = text
+            self._summary_open = True
+            self._seen_text = True
+            return
+        self._seen_text = True
+        if level == 2:
+            self._section = {"title": text, "line": self.line_no, "words": 0, "items": 0,
+                             "links": 0, "subsections": 0}
+            self.sections.append(self._section)
+        elif self._section is None:
+            self._problem("Low", f"H{level} \"{text}\" outside any H2 section")
+        else:
+            self._section["subsections"] += 1
+            self._section["words"] += len(text.split())
+
+    def _link(self, target, name, notes, listed):
+        url = urldefrag(urljoin(self.url, target))[0]
+        if not url.startswith(("http://", "https://")):
+            return
+        self.links.append({"url": url, "name": name, "notes": notes or None, "listed": listed,
+                           "section": self._section["title"] if self._section else None,
+                           "line": self.line_no})
+        if self._section is not None:
+            self._section["links"] += 1
+
+    # -- result -----------------------------------------------------------
+
+    def record(self):
+        return {
+            "url": self.url,
+            "title": self.title,
+            "summary": " ".join(self.summary) or None,
+            "details_words": self.details,
+            "sections": self.sections,
+            "links": self.links,
+            "topics": [name for name, _ in TOPICS if name in self.topics],
+            "words": self.words,
+            "lines": self.line_no,
+            "problems": self.problems,
+        }
+
+
+def parse_llms(url, text, charset=None, content_type=None):
+    """llms.txt record for a complete body (str or bytes)."""
+    parser = LlmsParser(url, charset, content_type)
+    parser.feed(text)
+    return parser.close()
+
+
+def llms_sink(url, status, headers):
+    """geo_crawler stream_to factory: an LlmsParser for a successful response."""
+    if status >= 400:
+        return None
+    content_type = headers.get("content-type", "")
+    return LlmsParser(url, charset_from_content_type(content_type), content_type)
+
+
+# ============================================================
+# VALIDATION AND CROSS-CHECK
+# ============================================================
+
+def validate(record):
+    """[[severity, message], ...]: the parser's line problems plus the
+    file-level ones."""
+    problems = [[severity, f"line {line}: {message}"] for severity, line, message in record["problems"]]
+    if record["title"] is None:
+        problems.append(["High", "No H1 title (the one required element)"])
+    if record["summary"] is None:
+        problems.append(["Medium", "No \"> summary\" blockquote after the title"])
+    if not record["sections"]:
+        problems.append(["Medium", "No H2 sections"])
+    empty = [s["title"] for s in record["sections"] if not s["words"] and not s["subsections"]]
+    if empty:
+        problems.append(["Low", f"Empty sections: {', '.join(empty)}"])
+    listed = [link for link in record["links"] if link["listed"]]
+    if not listed:
+        problems.append(["Low", "No \"- [name](url)\" link lists pointing AI systems at key pages"])
+    elif len(listed) > MAX_LINKS:
+        problems.append(["Low", f"{len(listed)} listed links; a curated llms.txt lists 10-20 key pages"])
+    return problems
+
+
+def _key(url, host):
+    """Comparable form of a URL: path and query when on the site's host
+    (www. or not), the full URL otherwise."""
+    parts = urlsplit(url)
+    if parts.netloc.lower().removeprefix("www.") != host:
+        return url
+    return (parts.path.rstrip("/") or "/") + (f"?{parts.query}" if parts.query else "")
+
+
+def cross_check(record, crawl):
+    """Links against the crawl: {"broken": links to pages that failed,
+    "unknown": internal links neither crawled nor in the sitemap,
+    "unlisted": crawled pages llms.txt never links to, "covered": crawled
+    pages it does}."""
+    host = urlsplit(crawl["start_url"]).netloc.lower().removeprefix("www.")
+    fetched = {}
+    for page in crawl["pages"]:
+        for url in (page["url"], page.get("final_url")):
+            if url:
+                fetched.setdefault(_key(url, host), page)
+    known = {_key(url, host) for url in crawl.get("sitemap_urls") or []}
+    known.update(_key(s["url"], host) for s in crawl.get("skipped", []))
+
+    linked, broken, unknown = set(), [], []
+    for link in record["links"]:
+        key = _key(link["url"], host)
+        if key == link["url"]:
+            continue  # external
+        linked.add(key)
+        page = fetched.get(key)
+        if page is not None:
+            if page.get("status") != 200:
+                broken.append(link["url"])
+        elif key not in known:
+            unknown.append(link["url"])
+    good = {_key(p["url"], host): p["url"] for p in crawl["pages"] if p.get("status") == 200}
+    return {
+        "broken": sorted(set(broken)),
+        "unknown": sorted(set(unknown)),
+        "unlisted": sorted(url for key, url in good.items() if key not in linked),
+        "covered": len([key for key in good if key in linked]),
+        "pages": len(good),
+    }
+
+
+def completeness(record, links=None):
+    """0-100 completeness score; `links` is the cross_check() result, when
+    there is a crawl to check against."""
+    parts = {
+        "title": record["title"] is not None,
+        "summary": record["summary"] is not None,
+        "sections": min(1.0, len(record["sections"]) / 2),
+        "topics": len(record["topics"]) / len(TOPICS),
+        "link_lists": any(link["listed"] for link in record["links"]),
+    }
+    weights = dict(SCORE_WEIGHTS)
+    if links is not None and links["pages"]:
+        parts["coverage"] = min(1.0, links["covered"] / min(TARGET_PAGES, links["pages"]))
+    else:
+        del weights["coverage"]
+    return round(100 * sum(weights[k] * parts[k] for k in weights) / sum(weights.values()))
+
+
+# ============================================================
+# SITES
+# ============================================================
+
+def check_site(crawl):
+    """llms.txt verdict for one crawl (geo_crawler output)."""
+    record, status = crawl.get("llms"), crawl.get("llms_status")
+    result = {"site": crawl["start_url"], "status": status, "present": record is not None,
+              "valid": False, "problems": [], "score": 0}
+    if record is None:
+        return result
+    problems = validate(record)
+    links = cross_check(record, crawl)
+    result.update(
+        valid=not any(severity in ("Critical", "High") for severity, _ in problems),
+        problems=problems,
+        sections=len(record["sections"]),
+        links=len(record["links"]),
+        topics=record["topics"],
+        missing_topics=[name for name, _ in TOPICS if name not in record["topics"]],
+        score=completeness(record, links),
+        **links,
+    )
+    return result
+
+
+def check_sites(crawls, jobs=None, chunksize=16):
+    """check_site() across a portfolio of crawls, in order; with jobs > 1
+    the batch is spread over a process pool."""
+    crawls = list(crawls)
+    if not jobs or jobs <= 1 or len(crawls) < chunksize:
+        return [check_site(c) for c in crawls]
+    with multiprocessing.Pool(jobs) as pool:
+        return pool.map(check_site, crawls, chunksize)
+
+
+def read_file(path, site=None):
+    """Parse an llms.txt on disk, streamed in READ_SIZE chunks."""
+    parser = LlmsParser(urljoin(site or "https://example.com/", LLMS_PATH))
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_SIZE):
+            parser.feed(chunk)
+    return parser.close()
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Check llms.txt presence, structure and completeness.")
+    parser.add_argument("crawls", nargs="*", help="Crawl JSON files written by geo_crawler.py")
+    parser.add_argument("--file", help="Check a local llms.txt instead of crawls")
+    parser.add_argument("--site", help="Site the --file belongs to (resolves relative links)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: 1)")
+    parser.add_argument("-o", "--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    if args.file:
+        record = read_file(args.file, args.site)
+        results = [{"site": args.site or args.file, "status": None, "present": True,
+                    "problems": validate(record), "sections": len(record["sections"]),
+                    "links": len(record["links"]), "topics": record["topics"],
+                    "missing_topics": [name for name, _ in TOPICS if name not in record["topics"]],
+                    "score": completeness(record)}]
+        results[0]["valid"] = not any(s in ("Critical", "High") for s, _ in results[0]["problems"])
+    elif args.crawls:
+        crawls = []
+        for path in args.crawls:
+            with open(path, encoding="utf-8") as f:
+                crawls.append(json.load(f))
+        if any("llms_status" not in c for c in crawls):
+            sys.exit("Crawl predates llms.txt fetching; re-run geo_crawler.py")
+        results = check_sites(crawls, jobs=args.jobs)
+    else:
+        parser.error("give crawl JSON files or --file")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+    for r in results:
+        if not r["present"]:
+            print(f"{r['site']}  no llms.txt (HTTP {r['status']})")
+            continue
+        print(f"{r['site']}  completeness {r['score']}/100, {'valid' if r['valid'] else 'INVALID'}, "
+              f"{r['sections']} sections, {r['links']} links")
+        if r["missing_topics"]:
+            print(f"  missing topics: {', '.join(r['missing_topics'])}")
+        for key in ("broken", "unknown"):
+            if r.get(key):
+                print(f"  {key} links: {', '.join(r[key])}")
+        if "unlisted" in r and r["unlisted"]:
+            print(f"  {len(r['unlisted'])} of {r['pages']} crawled pages not linked")
+        for severity, message in r["problems"]:
+            print(f"  [{severity}] {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+#!/home/claude-runner/.claude/skills/geo/venv/bin/python3
+"""
+GEO Analysis Modules and their Parallel Runner — Phase 2.
+
+An analysis module is a plain top-level function registered with
+@analysis_module(name). It receives the crawl dict produced by geo_crawler
+and returns
+
+    {"scores": {category: 0-100, ...}, "findings": [[severity, text], ...]}
+
+where the categories are the composite's (geo_scoring.CATEGORY_WEIGHTS) and
+severity is one of Critical / High / Medium / Low.
+
+run_modules() fans the crawl out to every module on a process pool, gives
+each module its own deadline and, when a module overruns, terminates the
+pool instead of waiting for it. Whatever finished in time still produces a
+composite: missing categories are dropped and the remaining weights
+renormalised (geo_scoring.partial_composite), with the covered share
+reported alongside.
+
+With a cache directory, results are kept under a key of the crawl's
+content and the analysis code, so re-auditing an unchanged site (pages
+revalidated with 304s by geo_crawler --cache) reuses them instead of
+recomputing. Modules registered with cacheable=False always run.
+
+Usage:
+    python3 geo_modules.py crawl.json [--timeout 60] [--jobs 5] [-o results.json] [--cache DIR]
+                          [--history history.db [--date YYYY-MM-DD]]
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from urllib.parse import urlsplit
+
+from geo_build_cache import file_digest, input_key, project_digest
+from geo_citability import analyze_pages, site_score
+from geo_facts import WORDS_PER_FACT, site_summary as fact_summary
+from geo_history import AuditHistory
+from geo_llms import check_site as check_llms
+from geo_robots import BLOCKED, NO_RULES, PARTIAL, WILDCARD, crawl_matrix
+from geo_schema import VOCAB_PATH, load_index as load_schema_index, validate_blocks
+from geo_scoring import partial_composite, score_label
+
+MODULE_TIMEOUT = 60.0
+MAX_SCHEMA_FINDINGS = 10
+ANALYSIS_MODULES = {}
+UNCACHEABLE = set()
+
+
+def analysis_module(name, cacheable=True):
+    """Register a module function under `name` (run in suite order).
+    cacheable=False marks a module whose result depends on more than the
+    crawl's content (response times, say) and must never be reused."""
+    def register(func):
+        ANALYSIS_MODULES[name] = func
+        if not cacheable:
+            UNCACHEABLE.add(name)
+        return func
+    return register
+
+
+def score_checks(checks):
+    """Turn [(weight, passed, severity, message), ...] into (score, findings):
+    the weighted share of passed checks and the messages of failed ones."""
+    total = sum(w for w, _, _, _ in checks)
+    passed = sum(w for w, ok, _, _ in checks if ok)
+    findings = [[severity, message] for _, ok, severity, message in checks if not ok]
+    return (round(100 * passed / total) if total else 0), findings
+
+
+def _html_pages(crawl):
+    return [p for p in crawl["pages"] if p.get("status") == 200 and "headings" in p]
+
+
+def _json_ld_nodes(page):
+    """Every JSON-LD object on a page, flattening @graph and top-level lists."""
+    stack, nodes = list(page.get("json_ld", [])), []
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict) and "@error" not in node:
+            nodes.append(node)
+            stack.extend(node.get("@graph", []))
+    return nodes
+
+
+def _types(node):
+    t = node.get("@type", [])
+    return set(t if isinstance(t, list) else [t])
+
+
+def _share(pages, predicate):
+    return sum(1 for p in pages if predicate(p)) / len(pages) if pages else 0
+
+
+# ============================================================
+# MODULES
+# ============================================================
+
+@analysis_module("citability")
+def analyze_citability(crawl):
+    """AI Citability: structure that lets a passage be lifted and quoted,
+    averaged with the geo_citability passage score when the crawl has text."""
+    pages = _html_pages(crawl)
+    question = re.compile(r"^(how|what|why|when|where|who|which|can|do|does|is|are)\b|\?$", re.I)
+    checks = [
+        (3, _share(pages, lambda p: sum(1 for h in p["headings"] if h[0] == 1) == 1) >= 0.8,
+         "High", "Pages should have exactly one H1"),
+        (3, _share(pages, lambda p: any(h[0] == 2 for h in p["headings"])) >= 0.6,
+         "Medium", "Most pages lack H2 sections that break content into citable blocks"),
+        (3, _share(pages, lambda p: p["word_count"] >= 300) >= 0.5,
+         "High", "Most pages have under 300 words of indexable text"),
+        (2, any(question.search(h[1]) for p in pages for h in p["headings"]),
+         "Medium", "No question-style headings (direct answer blocks)"),
+        (1, _share(pages, lambda p: p.get("meta_description")) >= 0.8,
+         "Low", "Meta descriptions missing on some pages"),
+    ]
+    facts = fact_summary(pages)
+    if facts["pages"]:  # statistical density needs the text blocks of a current crawl
+        checks.append((2, facts["pages_at_target"] >= 0.5, "Medium",
+                       f"Most pages have under 1 fact per {WORDS_PER_FACT} words (statistical density)"))
+    score, findings = score_checks(checks)
+
+    # passage-level analysis; crawls without text blocks keep the structural score
+    passages = analyze_pages(pages)
+    passage_score = site_score(passages)
+    if passage_score is not None:
+        scored = [r for r in passages if r["words"]]
+        if _share(scored, lambda r: r["answer_at"] is not None) < 0.5:
+            findings.append(["High", "Most pages give no direct answer in their first 300 words"])
+        if _share(scored, lambda r: r["citable_windows"]) < 0.5:
+            findings.append(["Medium", "Few self-contained 134-167-word passages to cite"])
+        if sum(r["self_contained"] for r in scored) / len(scored) < 0.7:
+            findings.append(["Medium", "Many paragraphs open with a reference to earlier text"])
+        score = round((score + passage_score) / 2)
+    return {"scores": {"AI Citability": score}, "findings": findings}
+
+
+@analysis_module("brand")
+def analyze_brand(crawl):
+    """Brand Authority and Platform Optimization, from the on-site signals
+    (sameAs profiles, outbound platform links). Off-site scanning is not
+    part of the crawl, so these are lower bounds."""
+    pages = _html_pages(crawl)
+    same_as = {url for p in pages for n in _json_ld_nodes(p)
+               for url in (n.get("sameAs") if isinstance(n.get("sameAs"), list) else [n.get("sameAs")])
+               if isinstance(url, str)}
+    outbound = {urlsplit(u).netloc.lower() for p in pages for u in p["links"]["external"]} | \
+               {urlsplit(u).netloc.lower() for u in same_as}
+
+    def present(*domains):
+        return any(host == d or host.endswith("." + d) for host in outbound for d in domains)
+
+    brand_checks = [
+        (3, len(same_as) >= 3, "High", "Organization schema lists fewer than 3 sameAs profiles"),
+        (2, present("wikipedia.org", "wikidata.org"), "Medium", "No Wikipedia/Wikidata entity"),
+        (2, present("linkedin.com"), "Low", "No LinkedIn company profile linked"),
+        (1, present("reddit.com"), "Low", "No Reddit presence linked"),
+    ]
+    platform_checks = [
+        (3, present("google.com", "g.page", "goo.gl"), "High", "No Google Business Profile linked"),
+        (2, present("youtube.com"), "Medium", "No YouTube channel linked"),
+        (2, present("yelp.com"), "Medium", "No Yelp listing linked"),
+        (2, present("facebook.com", "instagram.com"), "Low", "No Facebook/Instagram profile linked"),
+    ]
+    brand, brand_findings = score_checks(brand_checks)
+    platform, platform_findings = score_checks(platform_checks)
+    return {"scores": {"Brand Authority": brand, "Platform Optimization": platform},
+            "findings": brand_findings + platform_findings}
+
+
+@analysis_module("technical", cacheable=False)  # reads response times
+def analyze_technical(crawl):
+    """Technical GEO: AI crawler access, response health and head metadata."""
+    pages = _html_pages(crawl)
+    matrix = crawl_matrix(crawl)
+
+    def crawlers(tier, *statuses):
+        return [bot for bot, row in matrix.items() if row["tier"] == tier and row["status"] in statuses]
+
+    blocked_1, blocked_2 = crawlers(1, BLOCKED), crawlers(2, BLOCKED)
+    partial = crawlers(1, PARTIAL) + crawlers(2, PARTIAL)
+    implicit = crawlers(1, WILDCARD, NO_RULES)
+    fetched = crawl["pages"]
+    checks = [
+        (4, not blocked_1, "Critical", f"Tier 1 AI crawlers blocked by robots.txt: {', '.join(blocked_1)}"),
+        (2, not blocked_2, "High", f"Tier 2 AI crawlers blocked by robots.txt: {', '.join(blocked_2)}"),
+        (1, not partial, "Medium", f"Some pages blocked for AI crawlers: {', '.join(partial)}"),
+        (1, not implicit, "Low", f"Tier 1 AI crawlers not explicitly allowed: {', '.join(implicit)}"),
+        (3, _share(fetched, lambda p: p.get("status") == 200) >= 0.95,
+         "Critical", "Pages fail to load or return errors"),
+        (2, _share(pages, lambda p: (p.get("elapsed_ms") or 0) < 3000) >= 0.9,
+         "Medium", "Pages take over 3 seconds to respond"),
+        (2, _share(pages, lambda p: p.get("canonical")) >= 0.8, "Low", "Canonical URLs missing"),
+        (1, _share(pages, lambda p: p.get("lang")) >= 0.8, "Low", "<html lang> missing"),
+        (1, _share(pages, lambda p: p.get("open_graph")) >= 0.8, "Low", "Open Graph tags missing"),
+    ]
+    if "llms_status" in crawl:  # crawls made before llms.txt was fetched skip these
+        llms = check_llms(crawl)
+        invalid = [message for severity, message in llms["problems"] if severity in ("Critical", "High")]
+        checks += [
+            (2, llms["present"], "High", "No llms.txt"),
+            (1, not llms["present"] or llms["valid"], "Medium", f"llms.txt structure invalid: {'; '.join(invalid)}"),
+            (1, not llms["present"] or llms["score"] >= 70,
+             "Medium", f"Incomplete llms.txt (completeness {llms['score']}/100)"),
+            (1, not llms.get("broken"), "Medium",
+             f"llms.txt links to pages that fail to load: {', '.join(llms.get('broken', []))}"),
+        ]
+    score, findings = score_checks(checks)
+    return {"scores": {"Technical GEO": score}, "findings": findings}
+
+
+@analysis_module("content")
+def analyze_content(crawl):
+    """Content E-E-A-T: authorship, freshness, depth and trust pages."""
+    pages = _html_pages(crawl)
+    nodes = [n for p in pages for n in _json_ld_nodes(p)]
+    paths = {urlsplit(u).path.lower() for p in pages for u in p["links"]["internal"]} | \
+            {urlsplit(p["url"]).path.lower() for p in pages}
+    checks = [
+        (3, any("Person" in _types(n) or "author" in n for n in nodes),
+         "High", "No author attribution (Person schema or author property)"),
+        (2, any("datePublished" in n or "dateModified" in n for n in nodes),
+         "Low", "No publication or update dates"),
+        (2, any("about" in path for path in paths), "Medium", "No About page"),
+        (2, any("contact" in path for path in paths), "Medium", "No Contact page"),
+        (3, sum(p["word_count"] for p in pages) / max(len(pages), 1) >= 500,
+         "Medium", "Average page depth under 500 words"),
+    ]
+    score, findings = score_checks(checks)
+    return {"scores": {"Content E-E-A-T": score}, "findings": findings}
+
+
+@analysis_module("schema")
+def analyze_schema(crawl):
+    """Schema & Structured Data: JSON-LD coverage, essential types, validity
+    against the bundled schema.org vocabulary (geo_schema)."""
+    pages = _html_pages(crawl)
+    types = set().union(*(_types(n) for p in pages for n in _json_ld_nodes(p)))
+    broken = sum(1 for p in pages for n in p.get("json_ld", []) if isinstance(n, dict) and "@error" in n)
+    business = {"Organization", "LocalBusiness", "Corporation"} | {t for t in types if t.endswith("Business")}
+    index = load_schema_index()
+    problems = {}  # message -> severity, deduplicated across pages
+    for p in pages:
+        for _, node_findings in validate_blocks(p.get("json_ld", []), index):
+            for severity, message in node_findings:
+                problems.setdefault(message, severity)
+    invalid = sorted(m for m, severity in problems.items() if severity != "Low")
+    checks = [
+        (3, _share(pages, lambda p: p.get("json_ld")) >= 0.8, "High", "JSON-LD missing on most pages"),
+        (3, bool(types & business), "High", "No Organization/LocalBusiness schema"),
+        (1, "WebSite" in types, "Low", "No WebSite schema"),
+        (1, "BreadcrumbList" in types, "Low", "No BreadcrumbList schema"),
+        (2, "FAQPage" in types, "Medium", "No FAQPage schema"),
+        (2, broken == 0, "Medium", f"{broken} JSON-LD block(s) fail to parse"),
+        (3, not invalid, "High", f"{len(invalid)} schema.org validation error(s)"),
+    ]
+    score, findings = score_checks(checks)
+    findings += [[problems[m], m] for m in invalid[:MAX_SCHEMA_FINDINGS]]
+    return {"scores": {"Schema & Structured Data": score}, "findings": findings}
+
+
+# ============================================================
+# RESULT CACHE
+# ============================================================
+
+def crawl_digest(crawl):
+    """SHA-256 of a crawl's content: everything but stats and response times."""
+    content = dict(crawl, pages=[{k: v for k, v in p.items() if k != "elapsed_ms"} for p in crawl["pages"]])
+    content.pop("stats", None)
+    payload = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def code_digest():
+    """Digest of the analysis code: this module, every project module it
+    imports (classes such as SchemaIndex and RobotsPolicy included) and the
+    schema.org vocabulary."""
+    module = sys.modules[__name__]
+    return input_key(
+        module=file_digest(module.__file__),
+        imports=project_digest(module),
+        vocab=file_digest(VOCAB_PATH),
+    )
+
+
+def _result_path(cache_dir, name, crawl_key):
+    key = input_key(module=name, crawl=crawl_key, code=code_digest())
+    return os.path.join(cache_dir, "results", key[:2], f"{key}.json")
+
+
+def _load_result(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _store_result(path, value):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f)
+    os.replace(tmp, path)
+
+
+# ============================================================
+# PARALLEL RUNNER
+# ============================================================
+
+def _run_one(func, crawl):
+    start = time.perf_counter()
+    result = func(crawl)
+    return result, time.perf_counter() - start
+
+
+def run_modules(crawl, modules=None, timeout=MODULE_TIMEOUT, timeouts=None, jobs=None, cache_dir=None):
+    """Run analysis modules on a crawl in parallel and aggregate a composite.
+
+    modules: {name: function}, default every registered module.
+    timeout / timeouts: default and per-module deadlines in seconds, counted
+        from submission. A module past its deadline is recorded as
+        "timeout" and its worker is killed once the others are done.
+    jobs: pool size (default one process per module, so deadlines are fair).
+    cache_dir: reuse results stored for the same crawl content and code;
+        reused modules report status "ok" and "cached": True.
+
+    Returns {"modules": {name: {status, seconds, scores, findings, error}},
+             "categories": {category: score}, "composite", "label", "coverage"}.
+    """
+    modules = dict(modules or ANALYSIS_MODULES)
+    timeouts = timeouts or {}
+    report, paths = {}, {}
+    if cache_dir:
+        crawl_key = crawl_digest(crawl)
+        for name in modules:
+            if name in UNCACHEABLE:
+                continue
+            paths[name] = _result_path(cache_dir, name, crawl_key)
+            value = _load_result(paths[name])
+            if value is not None:
+                report[name] = {"status": "ok", "seconds": 0.0, "error": None, "cached": True, **value}
+    to_run = {name: func for name, func in modules.items() if name not in report}
+    pool = multiprocessing.Pool(processes=jobs or len(to_run)) if to_run else None
+    started = time.perf_counter()
+    pending = {name: pool.apply_async(_run_one, (func, crawl)) for name, func in to_run.items()}
+    deadlines = {name: started + timeouts.get(name, timeout) for name in to_run}
+    try:
+        while pending:
+            now = time.perf_counter()
+            for name, result in list(pending.items()):
+                if result.ready():
+                    try:
+                        value, seconds = result.get()
+                        report[name] = {"status": "ok", "seconds": round(seconds, 3), "error": None, **value}
+                        if name in paths:
+                            _store_result(paths[name], value)
+                    except Exception as exc:
+                        report[name] = {"status": "error", "seconds": round(now - started, 3),
+                                        "error": f"{type(exc).__name__}: {exc}"}
+                elif now >= deadlines[name]:
+                    report[name] = {"status": "timeout", "seconds": round(now - started, 3),
+                                    "error": f"no result within {deadlines[name] - started:g}s"}
+                else:
+                    continue
+                del pending[name]
+            if pending:
+                nearest = min(deadlines[name] for name in pending)
+                next(iter(pending.values())).wait(max(0.0, min(0.05, nearest - time.perf_counter())))
+    finally:
+        if pool is not None:
+            if any(r["status"] == "timeout" for r in report.values()):
+                pool.terminate()  # cancels the overrunning modules
+            else:
+                pool.close()
+            pool.join()
+
+    categories = {}
+    for name in modules:
+        categories.update(report[name].get("scores", {}))
+    composite, coverage = partial_composite(categories)
+    return {
+        "modules": {name: report[name] for name in modules},
+        "categories": categories,
+        "composite": composite,
+        "label": score_label(composite) if composite is not None else None,
+        "coverage": coverage,
+    }
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Run the GEO analysis modules on a crawl (Phase 2).")
+    parser.add_argument("crawl", help="Crawl JSON written by geo_crawler.py")
+    parser.add_argument("-o", "--output", help="Write module results as JSON to this file")
+    parser.add_argument("--timeout", type=float, default=MODULE_TIMEOUT,
+                        help=f"Per-module timeout in seconds (default: {MODULE_TIMEOUT:g})")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Worker processes (default: one per module)")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="Reuse module results for unchanged crawls (can share geo_crawler's --cache)")
+    parser.add_argument("--history", metavar="DB",
+                        help="Record the results in this audit history database (geo_history.py)")
+    parser.add_argument("--date", help="Audit date recorded in --history, YYYY-MM-DD (default: today)")
+    args = parser.parse_args()
+
+    with open(args.crawl, encoding="utf-8") as f:
+        crawl = json.load(f)
+    result = run_modules(crawl, timeout=args.timeout, jobs=args.jobs, cache_dir=args.cache)
+
+    for name, r in result["modules"].items():
+        scores = ", ".join(f"{k} {v}" for k, v in r.get("scores", {}).items()) or r["error"]
+        status = "cached" if r.get("cached") else r["status"]
+        print(f"  {name:12s} {status:8s} {r['seconds']:6.2f}s  {scores}")
+    if result["composite"] is None:
+        print("No module finished; no composite.")
+    else:
+        partial = "" if result["coverage"] == 100 else f" (partial: {result['coverage']}% of weight scored)"
+        print(f"Composite GEO score: {result['composite']}/100 — {result['label']}{partial}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=1)
+    if args.history and result["composite"] is not None:
+        with AuditHistory(args.history) as history:
+            history.record(crawl["start_url"], result, args.date)
+        print(f"Recorded in {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/home/claude-runner/.claude/skills/geo/venv/bin/python3
+"""
+GEO Build Profiling — cProfile statistics and flamegraph stacks per
+generated document.
+
+With --profile DIR the generators render every document under a
+DocumentProfile, which writes two files per document:
+
+    <DIR>/<document>.pstats    cProfile statistics (pstats, snakeviz, ...)
+    <DIR>/<document>.folded    collapsed stacks, one "a;b;c count" line per
+                               distinct stack, for flamegraph.pl, speedscope
+                               or inferno
+
+cProfile only records caller -> callee pairs, not whole stacks, so the
+folded stacks come from a sampler running alongside it: every
+SAMPLE_INTERVAL seconds of CPU time (SIGPROF) the current Python stack is
+recorded; its handler shows up in the .pstats as StackSampler._sample, at
+a fraction of a percent. Sampling needs the main thread of its process,
+which is where the generators and their pool workers render; elsewhere
+only the .pstats file is written. Batch rows and suite documents rendered
+in worker processes are profiled there (they inherit GEO_PROFILE_DIR), so
+each document gets its own files. A document name may contain a "/": the
+chapters of a chapter-parallel build are written as <document>/chapter-NN
+next to the document's own profile, and this script adds up several
+.pstats files into one listing.
+
+Usage:
+    python3 geo_profile.py DIR/report.pstats [--sort cumulative] [--top 30]
+    python3 geo_profile.py DIR/generate_methodology.pstats DIR/generate_methodology/*.pstats
+"""
+
+import argparse
+import collections
+import contextlib
+import cProfile
+import os
+import pstats
+import signal
+import threading
+
+PROFILE_ENV = "GEO_PROFILE_DIR"
+SAMPLE_INTERVAL = 0.005   # seconds of CPU time between stack samples
+
+ACTIVE = None  # the DocumentProfile recording in this process, if any
+
+
+def _frame_name(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+# ============================================================
+# STACK SAMPLER
+# ============================================================
+
+class StackSampler:
+    """Collapsed Python stacks sampled on SIGPROF (CPU time)."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._previous = None
+
+    def _sample(self, signum, frame):
+        names = []
+        while frame is not None:
+            names.append(_frame_name(frame.f_code))
+            frame = frame.f_back
+        self.stacks[";".join(reversed(names))] += 1
+
+    def start(self):
+        """Begin sampling; False (and no sampling) off the main thread."""
+        if threading.current_thread() is not threading.main_thread():
+            return False
+        self._previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return True
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous or signal.SIG_DFL)
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+# ============================================================
+# DOCUMENT PROFILES
+# ============================================================
+
+class DocumentProfile:
+    """Context manager profiling one document's build into
+    <profile_dir>/<name>.pstats and <name>.folded."""
+
+    def __init__(self, profile_dir, name, interval=SAMPLE_INTERVAL):
+        self.profile_dir = profile_dir
+        self.name = name
+        self.profiler = cProfile.Profile()
+        self.sampler = StackSampler(interval)
+        self._sampling = False
+
+    def __enter__(self):
+        global ACTIVE
+        if ACTIVE is not None:
+            raise RuntimeError("a DocumentProfile is already recording in this process")
+        ACTIVE = self
+        self._sampling = self.sampler.start()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        global ACTIVE
+        self.profiler.disable()
+        if self._sampling:
+            self.sampler.stop()
+        ACTIVE = None
+        base = os.path.join(self.profile_dir, self.name)
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        self.profiler.dump_stats(f"{base}.pstats")
+        if self._sampling:
+            self.sampler.write(f"{base}.folded")
+
+
+def _forget_in_child():
+    """A forked pool worker must not go on recording into its parent's profile."""
+    global ACTIVE
+    if ACTIVE is not None:
+        ACTIVE.profiler.disable()
+        if ACTIVE._sampling:
+            ACTIVE.sampler.stop()
+        ACTIVE = None
+
+
+os.register_at_fork(after_in_child=_forget_in_child)
+
+
+def profile_document(name):
+    """A DocumentProfile into GEO_PROFILE_DIR when profiling is switched on
+    (--profile), otherwise a do-nothing context (also inside a document
+    already being profiled, which records the nested work itself)."""
+    profile_dir = os.environ.get(PROFILE_ENV)
+    if not profile_dir or ACTIVE is not None:
+        return contextlib.nullcontext()
+    return DocumentProfile(profile_dir, name)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Print a GEO build profile.")
+    parser.add_argument("pstats", nargs="+", help=".pstats files written with --profile (several are combined)")
+    parser.add_argument("--sort", default="cumulative", help="pstats sort key (default: cumulative)")
+    parser.add_argument("--top", type=int, default=30, help="Functions to list (default: 30)")
+    args = parser.parse_args()
+
+    stats = pstats.Stats(*args.pstats)
+    stats.strip_dirs().sort_stats(args.sort).print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
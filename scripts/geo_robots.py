@@ -0,0 +1,217 @@
+#!/home/claude-runner/.claude/skills/geo/venv/bin/python3
+"""
+GEO Robots Policy — compiled robots.txt matching and the AI crawler access
+matrix.
+
+compile_robots() parses a robots.txt once (RFC 9309 semantics: groups
+selected by case-insensitive product token with "*" as the fallback,
+longest matching rule wins, Allow wins ties, "*" wildcards and a trailing
+"$" anchor) and turns every group into one regular expression whose
+alternatives are the rules ordered by precedence. A query is then a
+single regex match against the URL path: the first alternative that
+matches is the winning rule. Identical robots.txt files, common across
+sites on the same platform, are compiled once.
+
+access_matrix() answers every crawler x every crawled URL for one site in
+bulk and labels each crawler the way the reports do ("Explicitly
+whitelisted", "Wildcard only", "Blocked", ...). site_matrices() does the
+same across many crawls.
+
+Usage:
+    python3 geo_robots.py crawl.json [crawl2.json ...]
+"""
+
+import argparse
+import functools
+import json
+import re
+from urllib.parse import unquote, urlsplit
+
+# The 9 crawlers of the Technical module spec: (user-agent token, platform, tier)
+AI_CRAWLERS = [
+    ("GPTBot", "ChatGPT / OpenAI", 1),
+    ("ClaudeBot", "Claude / Anthropic", 1),
+    ("PerplexityBot", "Perplexity AI", 1),
+    ("Google-Extended", "Gemini / Google AI", 1),
+    ("Bingbot", "Bing Copilot", 1),
+    ("Amazonbot", "Alexa / Amazon", 2),
+    ("Bytespider", "TikTok", 2),
+    ("ChatGPT-User", "ChatGPT Browsing", 2),
+    ("cohere-ai", "Cohere", 2),
+]
+
+EXPLICIT = "Explicitly whitelisted"
+WILDCARD = "Wildcard only"
+NO_RULES = "No rules"
+PARTIAL = "Partially blocked"
+BLOCKED = "Blocked"
+
+
+# ============================================================
+# COMPILING
+# ============================================================
+
+def _pattern_regex(pattern):
+    anchored = pattern.endswith("$")
+    body = pattern[:-1] if anchored else pattern
+    regex = ".*".join(re.escape(part) for part in body.split("*"))
+    return regex + (r"\Z" if anchored else "")
+
+
+class RobotsGroup:
+    """The rules of one user-agent group, compiled into a single regex."""
+
+    def __init__(self, rules):
+        # precedence: longer patterns first, Allow before Disallow on a tie
+        self.rules = sorted(rules, key=lambda rule: (-len(rule[1]), not rule[0]))
+        self._allow = [allow for allow, _ in self.rules]
+        self._match = (re.compile("|".join(f"({_pattern_regex(p)})" for _, p in self.rules)).match
+                       if self.rules else None)
+
+    def allowed(self, path):
+        if self._match is None or path == "/robots.txt":
+            return True
+        m = self._match(path)
+        return True if m is None else self._allow[m.lastindex - 1]
+
+
+class RobotsPolicy:
+    """A compiled robots.txt: user-agent groups plus sitemap lines."""
+
+    def __init__(self, groups, sitemaps=()):
+        self.groups = groups          # lower-case token -> RobotsGroup
+        self.sitemaps = list(sitemaps)
+
+    def group_for(self, agent):
+        """(group or None, token that selected it: the agent's, "*" or None)."""
+        token = agent.split("/")[0].strip().lower()
+        if token in self.groups:
+            return self.groups[token], token
+        if "*" in self.groups:
+            return self.groups["*"], "*"
+        return None, None
+
+    def can_fetch(self, agent, url):
+        group, _ = self.group_for(agent)
+        return group is None or group.allowed(url_path(url))
+
+
+def url_path(url):
+    """The part of a URL robots rules match against: path and query,
+    percent-decoded."""
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    return unquote(path + (f"?{parts.query}" if parts.query else ""))
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_robots(text):
+    """Compile robots.txt text (None or "" allows everything)."""
+    groups, sitemaps = {}, []
+    agents, in_rules = [], False
+    for raw in (text or "").splitlines():
+        line = raw.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        field, value = (s.strip() for s in line.split(":", 1))
+        field = field.lower()
+        if field == "user-agent":
+            if in_rules:  # a user-agent line after rules starts a new group
+                agents, in_rules = [], False
+            agents.append(value.split("/")[0].strip().lower())
+            groups.setdefault(agents[-1], [])
+        elif field in ("allow", "disallow"):
+            in_rules = True
+            if value:  # an empty Disallow allows everything
+                for agent in agents:
+                    groups[agent].append((field == "allow", unquote(value)))
+        elif field == "sitemap":
+            sitemaps.append(value)
+    return RobotsPolicy({agent: RobotsGroup(rules) for agent, rules in groups.items()}, sitemaps)
+
+
+ALLOW_ALL = compile_robots("")
+DISALLOW_ALL = compile_robots("User-agent: *\nDisallow: /")
+
+
+def policy_for_status(text, status):
+    """The policy a crawler must follow given the robots.txt response: a
+    missing file (4xx) allows everything, a server error (5xx) nothing."""
+    if status is not None and status >= 500:
+        return DISALLOW_ALL
+    if status is not None and status >= 400:
+        return ALLOW_ALL
+    return compile_robots(text or "")
+
+
+# ============================================================
+# ACCESS MATRIX
+# ============================================================
+
+def access_matrix(policy, urls, crawlers=AI_CRAWLERS):
+    """Allow/deny every crawler for every URL of one site.
+
+    Returns {token: {"platform", "tier", "group", "allowed", "blocked":
+    [urls], "status"}} where group is the crawler's own token when it has
+    a group of its own, "*" when it falls back to the wildcard group and
+    None when no group applies.
+    """
+    paths = [(url, url_path(url)) for url in dict.fromkeys(urls)]
+    matrix = {}
+    for token, platform, tier in crawlers:
+        group, selected = policy.group_for(token)
+        blocked = [url for url, path in paths if group is not None and not group.allowed(path)]
+        if paths and len(blocked) == len(paths):
+            status = BLOCKED
+        elif blocked:
+            status = PARTIAL
+        elif selected is None:
+            status = NO_RULES
+        else:
+            status = WILDCARD if selected == "*" else EXPLICIT
+        matrix[token] = {"platform": platform, "tier": tier, "group": selected,
+                         "allowed": len(paths) - len(blocked), "blocked": blocked, "status": status}
+    return matrix
+
+
+def crawl_matrix(crawl, crawlers=AI_CRAWLERS):
+    """access_matrix() for a geo_crawler crawl: its robots.txt against the
+    homepage and every fetched page. Pages the robots.txt keeps from every
+    crawler were skipped by the crawl and so never count against the AI
+    crawlers."""
+    policy = policy_for_status(crawl.get("robots_txt"), crawl.get("robots_status"))
+    urls = [crawl["start_url"]] + [p["url"] for p in crawl["pages"]]
+    return access_matrix(policy, urls, crawlers)
+
+
+def site_matrices(crawls, crawlers=AI_CRAWLERS):
+    """{start_url: matrix} across many crawls."""
+    return {crawl["start_url"]: crawl_matrix(crawl, crawlers) for crawl in crawls}
+
+
+def accessible_count(matrix):
+    """How many crawlers can reach the site's pages ("9 of 9")."""
+    return sum(1 for row in matrix.values() if row["status"] != BLOCKED)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="AI crawler access matrix from crawled robots.txt files.")
+    parser.add_argument("crawls", nargs="+", help="Crawl JSON files written by geo_crawler.py")
+    args = parser.parse_args()
+
+    crawls = []
+    for path in args.crawls:
+        with open(path, encoding="utf-8") as f:
+            crawls.append(json.load(f))
+    for site, matrix in site_matrices(crawls).items():
+        print(f"{site}  ({accessible_count(matrix)} of {len(matrix)} AI crawlers have access)")
+        for token, row in matrix.items():
+            detail = f"  {len(row['blocked'])} URL(s) blocked" if row["blocked"] else ""
+            print(f"  Tier {row['tier']}  {token:16s} {row['status']}{detail}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/home/claude-runner/.claude/skills/geo/venv/bin/python3
+"""
+GEO Schema Validator — offline schema.org checks for JSON-LD blocks.
+
+The schema.org vocabulary ships with the scripts (geo_schema_vocab.json:
+every core type with its parents, every property with the types it
+applies to, and superseded property names). It is compiled once into a
+binary index and memory-mapped:
+
+    header   magic, vocabulary digest, counts, section offsets
+    names    type names then property names, newline separated
+    isa      one bitset row per type: its ancestors, itself included
+    allows   one bitset row per type: the properties that apply to it
+
+so "is Plumber a LocalBusiness?" and "does openingHours apply to
+Plumber?" are single bit tests, and validating a JSON-LD block costs
+microseconds with no network access. The index lives in the temp
+directory under the vocabulary's digest and is rebuilt only when the
+vocabulary changes.
+
+On top of the vocabulary, RULES lists the required and recommended
+properties of the rich-result types the Schema module scores
+(LocalBusiness, Organization, FAQPage, Product, Review, BreadcrumbList,
+Article, ...).
+
+Usage:
+    python3 geo_schema.py crawl.json
+    python3 geo_schema.py --vocab-from schemaorg-current-https.jsonld
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+VOCAB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geo_schema_vocab.json")
+MAGIC = b"GEOSCH01"
+HEADER = struct.Struct("<8s32sIIIIIIII")
+SCHEMA_PREFIXES = ("https://schema.org/", "http://schema.org/", "schema:")
+
+# type: (required, recommended); a tuple inside required means "any one of"
+RULES = {
+    "Organization": (["name"], ["url", "logo", "sameAs", "contactPoint"]),
+    "LocalBusiness": (["name", "address"], ["telephone", "url", "image", "geo",
+                                            "openingHoursSpecification", "priceRange"]),
+    "PostalAddress": ([], ["streetAddress", "addressLocality", "addressRegion", "postalCode",
+                           "addressCountry"]),
+    "WebSite": ([], ["name", "url"]),
+    "Person": (["name"], []),
+    "FAQPage": (["mainEntity"], []),
+    "Question": (["name", "acceptedAnswer"], []),
+    "Answer": (["text"], []),
+    "Product": (["name", ("offers", "review", "aggregateRating")],
+                ["image", "description", "brand", "sku"]),
+    "Offer": ([("price", "priceSpecification")], ["priceCurrency", "availability", "url"]),
+    "Review": (["author", "reviewRating"], ["itemReviewed", "datePublished", "reviewBody"]),
+    "Rating": (["ratingValue"], ["bestRating"]),
+    "AggregateRating": (["ratingValue", ("ratingCount", "reviewCount")], ["bestRating"]),
+    "BreadcrumbList": (["itemListElement"], []),
+    "ListItem": (["position"], ["name", "item"]),
+    "Article": (["headline"], ["author", "datePublished", "dateModified", "image"]),
+    "Service": (["name"], ["provider", "areaServed", "description"]),
+}
+
+
+# ============================================================
+# VOCABULARY
+# ============================================================
+
+def _local(name):
+    for prefix in SCHEMA_PREFIXES:
+        if name.startswith(prefix):
+            return name[len(prefix):]
+    return name
+
+
+def _ids(value):
+    if value is None:
+        return []
+    return [_local(v["@id"]) for v in (value if isinstance(value, list) else [value])]
+
+
+def build_vocab(release_path, out_path=VOCAB_PATH):
+    """Reduce a schema.org release (schemaorg-current-https.jsonld) to the
+    vocabulary file: types -> parents, properties -> domain types,
+    superseded properties -> replacement."""
+    with open(release_path, encoding="utf-8") as f:
+        graph = json.load(f)["@graph"]
+    types, properties, superseded = {}, {}, {}
+    for node in graph:
+        kinds = node["@type"] if isinstance(node["@type"], list) else [node["@type"]]
+        name = _local(node["@id"])
+        if "rdfs:Class" in kinds:
+            types[name] = sorted(_ids(node.get("rdfs:subClassOf")))
+        elif "rdf:Property" in kinds:
+            properties[name] = sorted(_ids(node.get("schema:domainIncludes")))
+            if node.get("schema:supersededBy"):
+                superseded[name] = _ids(node["schema:supersededBy"])[0]
+    for parents in types.values():  # drop rdfs/external parents
+        parents[:] = [p for p in parents if p in types]
+    source = "/".join(os.path.abspath(release_path).split(os.sep)[-2:])  # e.g. 12.0/schemaorg-...
+    lines = ["{", f' "source": {json.dumps(source)},', ' "types": {']
+    lines.append(",\n".join(f"  {json.dumps(k)}: {json.dumps(v)}" for k, v in sorted(types.items())))
+    lines.append(' },\n "properties": {')
+    lines.append(",\n".join(f"  {json.dumps(k)}: {json.dumps(v)}" for k, v in sorted(properties.items())))
+    lines.append(' },\n "superseded": {')
+    lines.append(",\n".join(f"  {json.dumps(k)}: {json.dumps(v)}" for k, v in sorted(superseded.items())))
+    lines.append(" }\n}\n")
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    return len(types), len(properties)
+
+
+# ============================================================
+# COMPILED INDEX
+# ============================================================
+
+def compile_index(vocab_bytes):
+    """The binary index for a vocabulary file's contents."""
+    vocab = json.loads(vocab_bytes)
+    type_names = sorted(vocab["types"])
+    prop_names = sorted(vocab["properties"])
+    type_id = {name: i for i, name in enumerate(type_names)}
+    prop_id = {name: i for i, name in enumerate(prop_names)}
+    type_row, prop_row = (len(type_names) + 7) // 8, (len(prop_names) + 7) // 8
+
+    ancestors = {}
+
+    def closure(name):
+        if name not in ancestors:
+            ancestors[name] = {name}
+            for parent in vocab["types"][name]:
+                ancestors[name] |= closure(parent)
+        return ancestors[name]
+
+    domain_props = {}
+    for prop, domains in vocab["properties"].items():
+        for domain in domains:
+            domain_props.setdefault(domain, []).append(prop_id[prop])
+
+    isa, allows = bytearray(type_row * len(type_names)), bytearray(prop_row * len(type_names))
+    for t, name in enumerate(type_names):
+        for ancestor in closure(name):
+            a = type_id[ancestor]
+            isa[t * type_row + (a >> 3)] |= 1 << (a & 7)
+            for p in domain_props.get(ancestor, ()):
+                allows[t * prop_row + (p >> 3)] |= 1 << (p & 7)
+
+    names = "\n".join(type_names + prop_names + [f"{k}\t{v}" for k, v in sorted(vocab["superseded"].items())])
+    names = names.encode("utf-8")
+    names_at = HEADER.size
+    isa_at = names_at + len(names)
+    allows_at = isa_at + len(isa)
+    header = HEADER.pack(MAGIC, hashlib.sha256(vocab_bytes).digest(), len(type_names), len(prop_names),
+                         len(vocab["superseded"]), type_row, prop_row, names_at, isa_at, allows_at)
+    return header + names + bytes(isa) + bytes(allows)
+
+
+class SchemaIndex:
+    """Read-only view of a compiled index (a memory map or bytes)."""
+
+    def __init__(self, buf):
+        (magic, self.digest, n_types, n_props, n_superseded, self._type_row, self._prop_row,
+         names_at, isa_at, allows_at) = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not a schema index")
+        self._buf = buf
+        self._isa_at, self._allows_at = isa_at, allows_at
+        names = bytes(buf[names_at:isa_at]).decode("utf-8").split("\n")
+        self.type_names = names[:n_types]
+        self.types = {name: i for i, name in enumerate(self.type_names)}
+        self.properties = {name: i for i, name in enumerate(names[n_types:n_types + n_props])}
+        self.superseded = dict(line.split("\t") for line in names[n_types + n_props:] if n_superseded)
+        self._rules = {}
+
+    def isa(self, type_name, ancestor):
+        """Whether type_name is ancestor or one of its subtypes."""
+        t, a = self.types.get(type_name), self.types.get(ancestor)
+        if t is None or a is None:
+            return False
+        return bool(self._buf[self._isa_at + t * self._type_row + (a >> 3)] >> (a & 7) & 1)
+
+    def rules_for(self, types):
+        """(required, recommended) from every RULES entry the types fall
+        under, memoised per type combination."""
+        if types not in self._rules:
+            required, recommended = [], []
+            for rule_type, (req, rec) in RULES.items():
+                if any(self.isa(t, rule_type) for t in types):
+                    required += [r for r in req if r not in required]
+                    recommended += [r for r in rec if r not in recommended]
+            self._rules[types] = (required, recommended)
+        return self._rules[types]
+
+    def allows(self, type_name, prop):
+        """Whether prop applies to type_name (directly or through a parent)."""
+        t, p = self.types.get(type_name), self.properties.get(prop)
+        if t is None or p is None:
+            return False
+        return bool(self._buf[self._allows_at + t * self._prop_row + (p >> 3)] >> (p & 7) & 1)
+
+
+_INDEX = None
+
+
+def load_index(vocab_path=VOCAB_PATH, index_path=None):
+    """The SchemaIndex for a vocabulary, compiled on first use and cached
+    (memory-mapped) in the temp directory. Falls back to an in-memory index
+    when the cache cannot be written."""
+    global _INDEX
+    if _INDEX is not None and vocab_path == VOCAB_PATH and index_path is None:
+        return _INDEX
+    with open(vocab_path, "rb") as f:
+        vocab_bytes = f.read()
+    digest = hashlib.sha256(vocab_bytes).hexdigest()
+    index_path = index_path or os.path.join(tempfile.gettempdir(), f"geo-schema-{digest[:16]}.idx")
+    index = None
+    if os.path.exists(index_path):
+        with open(index_path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            index = SchemaIndex(mapped)
+        except (ValueError, struct.error):
+            index = None
+        if index is not None and index.digest.hex() != digest:
+            index = None
+    if index is None:
+        data = compile_index(vocab_bytes)
+        try:
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(index_path) or ".", suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, index_path)
+            with open(index_path, "rb") as f:
+                index = SchemaIndex(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except OSError:
+            index = SchemaIndex(data)
+    if vocab_path == VOCAB_PATH:
+        _INDEX = index
+    return index
+
+
+# ============================================================
+# VALIDATION
+# ============================================================
+
+def iter_nodes(blocks):
+    """Every typed JSON-LD node in a page's blocks, nested ones included."""
+    stack = list(reversed(blocks))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict) and "@error" not in node:
+            if "@type" in node:
+                yield node
+            for key, value in node.items():
+                if isinstance(value, (dict, list)) and key != "@context":
+                    stack.append(value)
+
+
+def validate_node(node, index=None):
+    """[[severity, message], ...] for one JSON-LD node."""
+    index = index or load_index()
+    raw_types = node.get("@type")
+    types = [_local(t) for t in (raw_types if isinstance(raw_types, list) else [raw_types])
+             if isinstance(t, str)]
+    known = [t for t in types if t in index.types]
+    findings = [["Medium", f"Unknown schema.org type '{t}'"] for t in types if t not in index.types]
+    if not known:
+        return findings
+    label = "/".join(known)
+    present = {_local(k) for k, v in node.items() if not k.startswith("@") and v not in (None, "", [])}
+
+    for prop in sorted(present):
+        if prop in index.superseded:
+            findings.append(["Low", f"{label}: '{prop}' is superseded by '{index.superseded[prop]}'"])
+        elif prop not in index.properties:
+            findings.append(["Low", f"{label}: '{prop}' is not a schema.org property"])
+        elif not any(index.allows(t, prop) for t in known):
+            findings.append(["Low", f"{label}: '{prop}' does not apply to this type"])
+
+    required, recommended = index.rules_for(tuple(known))
+    for rule in required:
+        options = rule if isinstance(rule, tuple) else (rule,)
+        if not present.intersection(options):
+            findings.append(["High", f"{label}: missing required {' or '.join(options)}"])
+    missing = [r for r in recommended if r not in present]
+    if missing:
+        findings.append(["Low", f"{label}: missing recommended {', '.join(missing)}"])
+    return findings
+
+
+def validate_blocks(blocks, index=None):
+    """Validate a page's json_ld list: [(types, findings), ...] per node."""
+    index = index or load_index()
+    return [(node.get("@type"), validate_node(node, index)) for node in iter_nodes(blocks)]
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Validate a crawl's JSON-LD against schema.org, offline.")
+    parser.add_argument("crawl", nargs="?", help="Crawl JSON written by geo_crawler.py")
+    parser.add_argument("--vocab-from", metavar="RELEASE",
+                        help="Rebuild geo_schema_vocab.json from a schema.org release .jsonld file")
+    args = parser.parse_args()
+
+    if args.vocab_from:
+        n_types, n_props = build_vocab(args.vocab_from)
+        print(f"Wrote {VOCAB_PATH}: {n_types} types, {n_props} properties")
+        return
+    if not args.crawl:
+        parser.error("a crawl file is required")
+    with open(args.crawl, encoding="utf-8") as f:
+        crawl = json.load(f)
+    index = load_index()
+    problems = 0
+    for page in crawl["pages"]:
+        for types, findings in validate_blocks(page.get("json_ld", []), index):
+            for severity, message in findings:
+                problems += severity != "Low"
+                print(f"  {severity:8s} {message}  ({page['url']})")
+    print(f"{problems} problem(s) above Low severity")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+GEO Composite Scoring.
+
+The single source for the numbers both PDF generators print: category
+weights, weighted composites, deltas, weighted deltas and score labels.
+
+    GEO_Score = sum(category_score x weight) / 100     (weights in percent)
+
+Composites are rounded half-up with integer arithmetic, so 66.65 always
+reports as 67 regardless of float representation.
+
+score_comparison() scores one before/after audit for a report;
+score_batch() scores thousands at once with NumPy (pip install numpy),
+falling back to plain Python when NumPy is not installed.
+"""
+
+# Category, weight (%), short name used in the formula
+CATEGORY_WEIGHTS = [
+    ("AI Citability", 25, "Citability"),
+    ("Brand Authority", 20, "Brand"),
+    ("Content E-E-A-T", 20, "E-E-A-T"),
+    ("Technical GEO", 15, "Technical"),
+    ("Schema & Structured Data", 10, "Schema"),
+    ("Platform Optimization", 10, "Platform"),
+]
+
+# Category scores of the Wix -> Next.js case study both documents cite,
+# (before, after) per category
+CASE_STUDY_SCORES = {
+    "AI Citability": (38, 77),
+    "Brand Authority": (42, 42),
+    "Content E-E-A-T": (45, 74),
+    "Technical GEO": (18, 90),
+    "Schema & Structured Data": (12, 65),
+    "Platform Optimization": (42, 42),
+}
+
+# The same as (category, before, after, weight) rows, weighted by CATEGORY_WEIGHTS
+CASE_STUDY_CATEGORIES = [(name, *CASE_STUDY_SCORES[name], weight) for name, weight, _ in CATEGORY_WEIGHTS]
+
+SCORE_LABELS = [(90, "Excellent"), (75, "Good"), (60, "Fair"), (40, "Poor"), (0, "Critical")]
+
+
+def score_label(score):
+    for floor, label in SCORE_LABELS:
+        if score >= floor:
+            return label
+    return SCORE_LABELS[-1][1]
+
+
+def formula_text(bold_name="GEO Score"):
+    """The composite formula as printed in the guides, built from CATEGORY_WEIGHTS."""
+    terms = [f"({short} x {weight / 100:.2f})" for _, weight, short in CATEGORY_WEIGHTS]
+    return f"<b>{bold_name}</b> = " + " + ".join(terms)
+
+
+def weighted_points(score, weight):
+    """A category's contribution to the composite, to one decimal as printed."""
+    return round(score * weight / 100, 1)
+
+
+def composite(scores, weights):
+    """Weighted composite of 0-100 category scores, rounded half-up."""
+    return (sum(s * w for s, w in zip(scores, weights)) + 50) // 100
+
+
+def partial_composite(category_scores):
+    """Composite from whichever categories were scored, {name: score or None}.
+
+    Missing categories are left out and the remaining weights renormalised.
+    Returns (composite or None, coverage), coverage being the share of the
+    total weight (0-100) that was actually scored.
+    """
+    pairs = [(category_scores[name], weight) for name, weight, _ in CATEGORY_WEIGHTS
+             if category_scores.get(name) is not None]
+    covered = sum(w for _, w in pairs)
+    if not covered:
+        return None, 0
+    total = sum(s * w for s, w in pairs)
+    return (total * 2 + covered) // (covered * 2), covered
+
+
+def pct_change(before, after):
+    """Whole-percent change from before to after (0 when before is 0)."""
+    return round((after - before) / before * 100) if before > 0 else 0
+
+
+def score_comparison(categories):
+    """Score a before/after audit given [(name, before, after, weight), ...].
+
+    Returns a dict with the per-category rows (delta, weighted points and
+    weighted delta), both exact weighted totals, the rounded composites,
+    their delta and percent improvement.
+    """
+    weights = [c[3] for c in categories]
+    before = [c[1] for c in categories]
+    after = [c[2] for c in categories]
+    rows = []
+    for name, b, a, weight in categories:
+        b_wtd, a_wtd = weighted_points(b, weight), weighted_points(a, weight)
+        rows.append({
+            "name": name, "before": b, "after": a, "weight": weight, "delta": a - b,
+            "before_weighted": b_wtd, "after_weighted": a_wtd,
+            "weighted_delta": round(a_wtd - b_wtd, 1),
+            "impact": round((a - b) * weight / 100, 1),
+        })
+    before_composite = composite(before, weights)
+    after_composite = composite(after, weights)
+    return {
+        "rows": rows,
+        "before_total": sum(b * w for b, w in zip(before, weights)) / 100,
+        "after_total": sum(a * w for a, w in zip(after, weights)) / 100,
+        "before_composite": before_composite,
+        "after_composite": after_composite,
+        "delta": after_composite - before_composite,
+        "pct_improvement": pct_change(before_composite, after_composite),
+    }
+
+
+def score_batch(before, after, weights=None):
+    """Score many audits at once.
+
+    before, after: sequences of per-audit category scores (n_audits x
+    n_categories, in CATEGORY_WEIGHTS order unless `weights` is given).
+    Returns a dict of per-audit sequences: before_composite,
+    after_composite, delta and pct_improvement (NumPy arrays when NumPy is
+    available, lists otherwise).
+    """
+    if weights is None:
+        weights = [w for _, w, _ in CATEGORY_WEIGHTS]
+    try:
+        import numpy as np
+    except ImportError:
+        b = [composite(row, weights) for row in before]
+        a = [composite(row, weights) for row in after]
+        return {
+            "before_composite": b,
+            "after_composite": a,
+            "delta": [y - x for x, y in zip(b, a)],
+            "pct_improvement": [pct_change(x, y) for x, y in zip(b, a)],
+        }
+
+    w = np.asarray(weights, dtype=np.int64)
+    b = (np.asarray(before, dtype=np.int64) @ w + 50) // 100
+    a = (np.asarray(after, dtype=np.int64) @ w + 50) // 100
+    delta = a - b
+    safe = np.where(b > 0, b, 1)
+    pct = np.where(b > 0, np.round(delta / safe * 100), 0).astype(np.int64)
+    return {"before_composite": b, "after_composite": a, "delta": delta, "pct_improvement": pct}
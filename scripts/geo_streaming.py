@@ -0,0 +1,127 @@
+"""
+Bounded-Memory Streaming Builds for the GEO PDF generators.
+
+SimpleDocTemplate.build() wants the whole story as a list, and the canvas
+keeps every finished page in memory until save(). StreamingDocTemplate
+accepts any iterable of flowables (typically a generator) and pulls it
+lazily, holding only a small lookahead window. Finished pages are written
+out as part files every `pages_per_part` pages by switching the document
+onto a fresh canvas; at the end the parts are concatenated into the final
+PDF one at a time (geo_chapters.concat_pdfs), so no step holds the whole
+document. A document that fits in one part is written exactly as
+SimpleDocTemplate would write it.
+
+Merging several parts needs pypdf (pip install pypdf), as for chapter builds.
+"""
+
+import os
+import shutil
+import tempfile
+
+from reportlab.pdfgen import canvas as pdfcanvas
+from reportlab.platypus import SimpleDocTemplate
+from reportlab.platypus.doctemplate import _doNothing
+
+from geo_chapters import concat_pdfs
+
+PAGES_PER_PART = 200
+LOOKAHEAD = 32
+
+
+class FlowableStream:
+    """The subset of list behaviour the platypus layout loop uses, backed by
+    an iterator. Flowables are pulled on demand and dropped once laid out."""
+
+    def __init__(self, flowables, lookahead=LOOKAHEAD):
+        self._source = iter(flowables)
+        self._buffer = []
+        self._lookahead = lookahead
+        self._exhausted = False
+
+    def _fill(self, n):
+        """Buffer at least n flowables, plus any keepWithNext chain at the tail
+        (platypus groups such a chain before it lays out its first member)."""
+        buf = self._buffer
+        while not self._exhausted and (
+                len(buf) < n or (buf and getattr(buf[-1], "getKeepWithNext", lambda: 0)())):
+            try:
+                buf.append(next(self._source))
+            except StopIteration:
+                self._exhausted = True
+
+    def __len__(self):
+        self._fill(self._lookahead)
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop if index.stop is not None else self._lookahead)
+        else:
+            self._fill(index + 1)
+        return self._buffer[index]
+
+    def __setitem__(self, index, value):
+        self._buffer[index] = value
+
+    def __delitem__(self, index):
+        del self._buffer[index]
+
+    def insert(self, index, flowable):
+        self._buffer.insert(index, flowable)
+
+
+class StreamingDocTemplate(SimpleDocTemplate):
+    """SimpleDocTemplate that lays out an iterable of flowables and flushes
+    finished pages to disk every `pages_per_part` pages."""
+
+    def __init__(self, filename, pages_per_part=PAGES_PER_PART, **kw):
+        SimpleDocTemplate.__init__(self, filename, **kw)
+        self.pages_per_part = pages_per_part
+
+    def build(self, flowables, onFirstPage=_doNothing, onLaterPages=_doNothing,
+              canvasmaker=pdfcanvas.Canvas):
+        if not isinstance(self.filename, str):  # file-like target: nothing to rotate
+            self.pages_per_part = None
+        self._canvasmaker = canvasmaker
+        self._parts = []
+        self._part_dir = None
+        try:
+            SimpleDocTemplate.build(self, FlowableStream(flowables), onFirstPage=onFirstPage,
+                                    onLaterPages=onLaterPages, canvasmaker=canvasmaker)
+            if len(self._parts) == 1:
+                os.replace(self._parts[0], self.filename)
+            elif self._parts:
+                concat_pdfs(self._parts, self.filename)
+        finally:
+            if self._part_dir:
+                shutil.rmtree(self._part_dir, ignore_errors=True)
+
+    def _next_part(self):
+        if self.pages_per_part is None:
+            return None
+        if self._part_dir is None:
+            self._part_dir = tempfile.mkdtemp(prefix=".stream-",
+                                              dir=os.path.dirname(self.filename) or ".")
+        path = os.path.join(self._part_dir, f"part-{len(self._parts):05d}.pdf")
+        self._parts.append(path)
+        return path
+
+    def _startBuild(self, filename=None, canvasmaker=pdfcanvas.Canvas):
+        self._part_pages = 0
+        SimpleDocTemplate._startBuild(self, self._next_part() or filename, canvasmaker)
+
+    def handle_pageBegin(self):
+        if self.pages_per_part and self._part_pages >= self.pages_per_part:
+            self._rotate_canvas()
+        self._part_pages += 1
+        SimpleDocTemplate.handle_pageBegin(self)
+
+    def _rotate_canvas(self):
+        """Save the finished pages and carry on laying out onto a new canvas."""
+        old, seq = self.canv, self.seq
+        old.save()
+        self.canv = self._makeCanvas(filename=self._next_part(), canvasmaker=self._canvasmaker)
+        self.seq = seq  # _makeCanvas starts a new sequencer; keep the numbering going
+        self.canv._doctemplate = self
+        self.canv._pageNumber = old.getPageNumber()
+        self._part_pages = 0
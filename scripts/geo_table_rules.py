@@ -0,0 +1,83 @@
+"""
+Column-Level Conditional Formatting for report tables.
+
+Instead of walking table rows and parsing the rendered cell strings
+("+12", "—") to decide colors, a table declares rules over its typed
+column values:
+
+    apply_rules(ts, [
+        text_color_rule(1, wix_scores, score_color),
+        delta_rule(3, deltas, positive=DELTA_COLOR, zero=TEXT_SECONDARY),
+    ])
+
+Each rule maps a value to a tuple of (command, argument) pairs, evaluated
+once per distinct value. Consecutive rows that come out the same are
+emitted as one TableStyle range command, so a 10,000-row table with a few
+score bands gets a handful of commands rather than one or two per cell.
+That matters beyond building the style: every Table split across pages
+re-filters the full command list.
+"""
+
+
+class ColumnRule:
+    """Style column `col` (an index, or a (first, last) pair of indices) from
+    `values`, which line up with table rows first_row, first_row + 1, ...
+
+    style(value) returns a tuple of (command, argument) pairs such as
+    (('TEXTCOLOR', SUCCESS), ('FONTNAME', 'Helvetica-Bold')), or () to leave
+    the cell alone.
+    """
+
+    def __init__(self, col, values, style, first_row=1):
+        self.cols = col if isinstance(col, tuple) else (col, col)
+        self.values = values
+        self.style = style
+        self.first_row = first_row
+
+    def runs(self):
+        """Yield (start_row, end_row, commands) for each run of equally styled rows."""
+        memo = {}
+        start, current = None, ()
+        row = self.first_row - 1
+        for row, value in enumerate(self.values, self.first_row):
+            commands = memo.get(value)
+            if commands is None:
+                commands = memo[value] = tuple(self.style(value))
+            if commands != current:
+                if current:
+                    yield start, row - 1, current
+                start, current = row, commands
+        if current:
+            yield start, row, current
+
+
+def apply_rules(ts, rules):
+    """Add every rule's commands to TableStyle ts, one command per run."""
+    for rule in rules:
+        c0, c1 = rule.cols
+        for start, end, commands in rule.runs():
+            for command, arg in commands:
+                ts.add(command, (c0, start), (c1, end), arg)
+    return ts
+
+
+def text_color_rule(col, values, color_fn, first_row=1):
+    """TEXTCOLOR from color_fn(value), e.g. score_color."""
+    return ColumnRule(col, values, lambda v: (('TEXTCOLOR', color_fn(v)),), first_row)
+
+
+def background_rule(col, values, color_fn, first_row=1):
+    """BACKGROUND from color_fn(value), e.g. score_bg."""
+    return ColumnRule(col, values, lambda v: (('BACKGROUND', color_fn(v)),), first_row)
+
+
+def delta_rule(col, values, positive, zero=None, negative=None, bold_positive=False, first_row=1):
+    """Color signed changes: gains in `positive` (optionally bold), no change in
+    `zero`, losses in `negative`. A color left as None leaves those cells alone."""
+    def style(delta):
+        if delta > 0:
+            bold = (('FONTNAME', 'Helvetica-Bold'),) if bold_positive else ()
+            return (('TEXTCOLOR', positive),) + bold
+        color = zero if delta == 0 else negative
+        return (('TEXTCOLOR', color),) if color is not None else ()
+    return ColumnRule(col, values, style, first_row)
@@ -0,0 +1,81 @@
+"""
+Table of Contents with Cached Pagination.
+
+A contents page with page numbers normally costs a second full layout pass
+(multiBuild): the numbers are only known once the document has been laid
+out. Instead, the heading -> page map of the previous build is kept next to
+the PDF and used to render the contents on the first pass. The headings are
+recorded while that pass lays out; if they landed where the cached map said,
+the document is done. Only when headings moved (or on the very first build)
+is the document laid out again with the recorded map.
+
+Map files are JSON lists of [title, page] pairs:
+    <output_dir>/.GEO-Methodology-Guide.toc.json
+"""
+
+import json
+import os
+
+from reportlab.platypus import Paragraph
+
+MAX_PASSES = 4
+
+
+def toc_map_path(pdf_path):
+    """Sidecar file holding the heading -> page map of pdf_path's last build."""
+    folder, name = os.path.split(pdf_path)
+    return os.path.join(folder, f".{os.path.splitext(name)[0]}.toc.json")
+
+
+def load_toc_map(path):
+    """[(title, page), ...] from the last build, or None if there is none."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [(title, page) for title, page in json.load(f)]
+    except (FileNotFoundError, ValueError, TypeError):
+        return None
+
+
+def save_toc_map(path, entries):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=1)
+    os.replace(tmp, path)
+
+
+def record_headings(doc, heading_style="SectionHead", after="Contents"):
+    """Hook doc.afterFlowable to collect (title, page) for every heading laid
+    out after the `after` heading. Returns the (initially empty) list."""
+    entries = []
+    seen_start = [after is None]
+
+    def after_flowable(flowable):
+        style = getattr(flowable, "style", None)
+        if not isinstance(flowable, Paragraph) or style is None or style.name != heading_style:
+            return
+        title = flowable.getPlainText()
+        if seen_start[0]:
+            entries.append((title, doc.page))
+        elif title == after:
+            seen_start[0] = True
+
+    doc.afterFlowable = after_flowable
+    return entries
+
+
+def build_with_toc(render, map_path, max_passes=MAX_PASSES):
+    """Lay out a document whose contents page lists heading page numbers.
+
+    render(entries) builds the PDF once, with entries=None meaning "no page
+    numbers known yet", and returns the (title, page) list it recorded.
+    Returns the number of layout passes used: 1 whenever the cached map
+    from the previous build still holds.
+    """
+    entries = load_toc_map(map_path)
+    for passes in range(1, max_passes + 1):
+        recorded = render(entries)
+        if recorded == entries:
+            save_toc_map(map_path, recorded)
+            return passes
+        entries = recorded
+    raise RuntimeError(f"contents page numbers did not settle after {max_passes} passes")
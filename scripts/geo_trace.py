@@ -0,0 +1,296 @@
+#!/home/claude-runner/.claude/skills/geo/venv/bin/python3
+"""
+GEO Build Tracing — where a report build spends its time, per section and
+per flowable type.
+
+Opt-in: nothing is instrumented unless a BuildTrace is active. While one
+is, the wrap/split/draw methods of every Flowable class (Paragraph, Table,
+Drawing, AppendixTable, ...), Paragraph markup parsing, doc.build's layout
+pass and the canvas save are timed, and put back untouched afterwards. The
+story is not changed, so a traced build writes the same PDF.
+
+Time is attributed twice over:
+  * story spans: from one section()/section_header() call to the next, the
+    cost of building that section's flowables (Paragraph parsing, charts)
+  * layout spans: from one section heading being drawn to the next, the
+    wrap/split/draw time of that section inside doc.build, broken down by
+    flowable type
+Per flowable type the trace also keeps calls, total and self time (time
+not spent in nested flowables, e.g. a table's cell paragraphs) for each
+of parse/wrap/split/draw.
+
+The generators take --trace DIR, which writes one <document>.trace.json
+per document rendered (in worker processes too, via GEO_TRACE_DIR).
+
+    with BuildTrace("report.trace.json", "report"):
+        generate_report("report.pdf")
+
+Usage:
+    python3 geo_trace.py trace.json [trace2.json ...] [--top 10]
+"""
+
+import argparse
+import contextlib
+import functools
+import json
+import os
+import time
+
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Paragraph
+from reportlab.platypus.doctemplate import BaseDocTemplate
+from reportlab.platypus.flowables import Flowable
+
+TRACE_ENV = "GEO_TRACE_DIR"
+# Heading styles that open a section: SectionHead (system suite),
+# SectionHeader (comparison report)
+HEADING_STYLES = ("SectionHead", "SectionHeader")
+FRONT_MATTER = "(front matter)"
+OPS = ("wrap", "split", "draw")
+
+ACTIVE = None  # the BuildTrace recording in this process, if any
+
+
+def _flowable_classes():
+    classes, todo = [], [Flowable]
+    while todo:
+        cls = todo.pop()
+        if cls not in classes:
+            classes.append(cls)
+            todo.extend(cls.__subclasses__())
+    return classes
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+# ============================================================
+# TRACE
+# ============================================================
+
+class BuildTrace:
+    """Context manager recording one document build; the JSON trace is
+    written to `path` on exit."""
+
+    def __init__(self, path, name=None):
+        self.path = path
+        self.name = name or os.path.basename(path)
+        self.spans = []
+        self.flowables = {}    # type -> op -> [calls, total s, self s]
+        self._stack = []       # [object, op, start, child seconds]
+        self._patched = []
+        self._story = None
+        self._layout = None
+        self._builds = 0
+
+    # -- spans ------------------------------------------------------------
+
+    def _open(self, cat, name):
+        span = {"name": name, "cat": cat, "start": time.perf_counter() - self._start, "ms": None,
+                "pass": self._builds + (cat == "story")}
+        if cat == "layout":
+            span["paused"] = 0.0   # canvas saves inside the span, reported as their own spans
+            span["flowables"] = 0
+            span["types"] = {}
+        self.spans.append(span)
+        return span
+
+    def _close(self, span):
+        if span is not None and span["ms"] is None:
+            span["ms"] = _ms(time.perf_counter() - self._start - span["start"] - span.pop("paused", 0.0))
+
+    def story_section(self, title):
+        """A section()/section_header() call: the next story span begins."""
+        self._close(self._story)
+        self._story = self._open("story", title)
+
+    def _layout_section(self, title):
+        self._close(self._layout)
+        self._layout = self._open("layout", title)
+
+    # -- instrumentation --------------------------------------------------
+
+    def _timed(self, func, op):
+        trace = self
+
+        @functools.wraps(func)
+        def timed(obj, *args, **kwargs):
+            stack = trace._stack
+            if stack and stack[-1][0] is obj and stack[-1][1] == op:
+                return func(obj, *args, **kwargs)  # a subclass calling up to its base class
+            if (op == "draw" and isinstance(obj, Paragraph)
+                    and getattr(obj.style, "name", None) in HEADING_STYLES):
+                trace._layout_section(obj.getPlainText())
+            frame = [obj, op, time.perf_counter(), 0.0]
+            stack.append(frame)
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                stack.pop()
+                elapsed = time.perf_counter() - frame[2]
+                if stack:
+                    stack[-1][3] += elapsed
+                trace._count(type(obj).__name__, op, elapsed, elapsed - frame[3])
+        return timed
+
+    def _count(self, kind, op, total, own):
+        stats = self.flowables.setdefault(kind, {}).setdefault(op, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += total
+        stats[2] += own
+        if self._layout is not None:
+            types = self._layout["types"]
+            types[kind] = types.get(kind, 0.0) + own
+            if op == "draw" and len(self._stack) == 0:
+                self._layout["flowables"] += 1
+
+    def _build(self, func):
+        trace = self
+
+        @functools.wraps(func)
+        def build(doc, *args, **kwargs):
+            trace._close(trace._story)
+            trace._builds += 1
+            span = trace._open("build", f"doc.build #{trace._builds}")
+            trace._layout_section(FRONT_MATTER)
+            try:
+                return func(doc, *args, **kwargs)
+            finally:
+                trace._close(trace._layout)
+                trace._layout = None
+                trace._close(span)
+        return build
+
+    def _save(self, func):
+        trace = self
+
+        @functools.wraps(func)
+        def save(canvas, *args, **kwargs):
+            span = trace._open("save", "canvas.save")
+            try:
+                return func(canvas, *args, **kwargs)
+            finally:
+                trace._close(span)
+                if trace._layout is not None:
+                    trace._layout["paused"] += span["ms"] / 1000
+        return save
+
+    def _patch(self, cls, attr, wrapper):
+        original = cls.__dict__[attr]
+        self._patched.append((cls, attr, original))
+        setattr(cls, attr, wrapper(original))
+
+    # -- context manager --------------------------------------------------
+
+    def __enter__(self):
+        global ACTIVE
+        if ACTIVE is not None:
+            raise RuntimeError("a BuildTrace is already recording in this process")
+        ACTIVE = self
+        self._start = time.perf_counter()
+        for cls in _flowable_classes():
+            for op in OPS:
+                if op in cls.__dict__:
+                    self._patch(cls, op, lambda f, op=op: self._timed(f, op))
+        self._patch(Paragraph, "_setup", lambda f: self._timed(f, "parse"))
+        self._patch(BaseDocTemplate, "build", self._build)
+        self._patch(Canvas, "save", self._save)
+        self._story = self._open("story", FRONT_MATTER)
+        return self
+
+    def __exit__(self, *exc):
+        global ACTIVE
+        for cls, attr, original in reversed(self._patched):
+            setattr(cls, attr, original)
+        self._patched = []
+        ACTIVE = None
+        self._close(self._story)
+        self._close(self._layout)
+        self.write()
+
+    def record(self):
+        """The trace as a JSON-ready dict."""
+        spans = [dict(span, start=_ms(span["start"])) for span in self.spans if span["ms"] is not None]
+        for span in spans:
+            if "types" in span:
+                span["types"] = {k: _ms(v) for k, v in sorted(span["types"].items(), key=lambda kv: -kv[1])}
+        flowables = {
+            kind: {op: {"calls": n, "ms": _ms(total), "self_ms": _ms(own)} for op, (n, total, own) in ops.items()}
+            for kind, ops in sorted(self.flowables.items(), key=lambda kv: -sum(s[2] for s in kv[1].values()))
+        }
+        return {"document": self.name, "ms": _ms(time.perf_counter() - self._start),
+                "spans": spans, "flowables": flowables}
+
+    def write(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.record(), f, indent=1)
+
+
+def _forget_in_child():
+    """A forked pool worker must not go on recording into its parent's trace."""
+    global ACTIVE
+    if ACTIVE is not None:
+        for cls, attr, original in reversed(ACTIVE._patched):
+            setattr(cls, attr, original)
+        ACTIVE = None
+
+
+os.register_at_fork(after_in_child=_forget_in_child)
+
+
+def section_mark(title):
+    """Called by the generators' section helpers; a no-op unless tracing."""
+    if ACTIVE is not None:
+        ACTIVE.story_section(title)
+
+
+def trace_document(name):
+    """A BuildTrace writing <GEO_TRACE_DIR>/<name>.trace.json when tracing
+    is switched on (--trace), otherwise a do-nothing context."""
+    trace_dir = os.environ.get(TRACE_ENV)
+    if not trace_dir or ACTIVE is not None:
+        return contextlib.nullcontext()
+    return BuildTrace(os.path.join(trace_dir, f"{name}.trace.json"), name)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def summarize(trace, top=10):
+    """Printable lines: hottest story and layout sections, then flowable
+    type/operation pairs by self time."""
+    lines = [f"{trace['document']}  {trace['ms']:.0f} ms"]
+    passes = sum(1 for s in trace["spans"] if s["cat"] == "build")
+    for cat in ("story", "layout", "build", "save"):
+        spans = sorted((s for s in trace["spans"] if s["cat"] == cat), key=lambda s: -s["ms"])
+        if not spans:
+            continue
+        lines.append(f"  {cat}: {sum(s['ms'] for s in spans):.0f} ms in {len(spans)} span(s)")
+        for span in spans[:top] if cat in ("story", "layout") else []:
+            hot = ", ".join(f"{k} {v:.0f} ms" for k, v in list(span.get("types", {}).items())[:3])
+            label = f"{span['name'][:48]}" + (f" [pass {span['pass']}]" if passes > 1 else "")
+            lines.append(f"    {span['ms']:9.1f} ms  {label}" + (f"  ({hot})" if hot else ""))
+    ops = sorted(((kind, op, s) for kind, by_op in trace["flowables"].items() for op, s in by_op.items()),
+                 key=lambda t: -t[2]["self_ms"])
+    lines.append("  flowables (self time):")
+    for kind, op, s in ops[:top]:
+        lines.append(f"    {s['self_ms']:9.1f} ms  {kind}.{op} x{s['calls']}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize GEO build traces.")
+    parser.add_argument("traces", nargs="+", help="Trace JSON files written with --trace")
+    parser.add_argument("--top", type=int, default=10, help="Rows per listing (default: 10)")
+    args = parser.parse_args()
+
+    for path in args.traces:
+        with open(path, encoding="utf-8") as f:
+            print("\n".join(summarize(json.load(f), args.top)))
+        print()
+
+
+if __name__ == "__main__":
+    main()